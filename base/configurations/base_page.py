@@ -1,16 +1,42 @@
 from base.configurations.element import Element
 from base.configurations.interactions import Interactions
 from base.configurations.waits import Waits
-from base.configurations.exception import HomePageNotLoadedException
+from base.configurations.http_interactions import HttpInteractions
+from base.configurations.exception import HomePageNotLoadedException, PageNotLoadedException, CustomException
+from base.configurations.routes import get_route
 
 class BasePage:
 
+    # capability flag: True if page is server-rendered and can be tested with HttpSession (without browser)
+    browserless = False
+
     def __init__(self, session):
         self.session = session
-        self.driver = session.driver
         self.logger = session.logger
-        self.action = Interactions(self.session)
-        self.waits = Waits(self.session)
+        if getattr(session, 'is_http', False):
+            if not self.browserless:
+                raise CustomException("Page object '{}' requires browser session".format(type(self).__name__))
+            self.action = HttpInteractions(self.session)
+            self.waits = None
+        else:
+            # page objects are safe points: bloated browser is recycled before the page is used
+            safe_point = getattr(session, 'safe_point', None)
+            if safe_point:
+                safe_point(keep_page=True)
+            self.action = Interactions(self.session)
+            self.waits = Waits(self.session)
+            self.mark_step(type(self).__name__)
+
+    @property
+    def driver(self):
+        # read on every access: session driver is replaced, when browser is recycled (see SeleniumSession.safe_point)
+        return self.session.driver
+
+    def mark_step(self, name):
+        """Mark start of page object step in session (see SeleniumSession.mark_step)."""
+        mark_step = getattr(self.session, 'mark_step', None)
+        if mark_step:
+            mark_step(name)
 
     def navigate_to_home_page_from_content(self):
         if not self.action.is_element_displayed(self.events_search_form):
@@ -19,6 +45,35 @@ class BasePage:
                 raise HomePageNotLoadedException('Failed to navigate to home page from content.')
         self.logger.info("Home page successfully loaded.")
 
+    def goto(self, page_class, timeout=None, **url_params):
+        """Navigate directly to page object by its route (single driver.get instead of menu click-through).
+        :param page_class - page object class registered in route table (see base.configurations.routes)
+        :param timeout (int) - seconds to wait for route sentinel. If None - timeout of the route is used.
+        :param url_params - values for format fields of route url template.
+        """
+        page_route = get_route(page_class)
+        url = page_route.build_url(self.session.url, **url_params)
+        timeout = timeout or page_route.timeout
+        self.logger.info("navigating to '{}' by address: {}".format(page_class.__name__, url))
+        if getattr(self.session, 'is_http', False):
+            self.session.get(url)
+        else:
+            self.mark_step(page_class.__name__)
+            self.driver.get(url)
+            self.action.reset_locator_context()
+        if not self.action.is_elements_present(page_route.sentinel, timeout=timeout):
+            raise PageNotLoadedException("Page '{}' was not loaded by address: {}. Waited for {} seconds"
+                                         .format(page_class.__name__, url, timeout))
+        self.collect_performance(page_class, url)
+
+    def collect_performance(self, page=None, url=None):
+        """Attach performance metrics of loaded document to session (see base.configurations.performance).
+        :param page - page object class or name, metrics belong to. If None - class of this page object.
+        """
+        performance = getattr(self.session, 'performance', None)
+        if performance:
+            return performance.collect(page or type(self), url)
+
     @property
     def booking_home_logo(self): return Element(self.session, ("CSS_SELECTOR", "#top #logo_no_globe_new_logo"))
     @property
@@ -9,9 +9,23 @@ class BaseTest:
 
         self.session = SeleniumSession(config_section=config_section, logger=LOGGER,
                                        browser=browser, url=url, credentials=credentials)
+        # pre-spawned driver could cross memory threshold, while it waited for the test
+        self.session.safe_point()
+
+    def init_http_session(self, url=None, credentials=None, config_section="BOOKING CONFIG", from_session=None):
+        """Init browserless session for page objects with browserless capability.
+        :param from_session - selenium session to take cookies from (to fetch authenticated pages)
+        """
+        from base.session.http_session import HttpSession
+
+        if from_session:
+            self.session = HttpSession.from_selenium_session(from_session, config_section=config_section)
+        else:
+            self.session = HttpSession(config_section=config_section, logger=LOGGER, url=url,
+                                       credentials=credentials)
 
     def cleanup_session(self):
         if self.session:
-            LOGGER.info("Stopping selenium session")
-            self.session.driver.quit()
+            LOGGER.info("Stopping {}".format(type(self.session).__name__))
+            self.session.close()
             delattr(self, 'session')
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Locator contexts: frames and shadow roots.
+
+Element may carry context path - chain of frames and/or shadow hosts, that have to be entered
+before element is searched:
+
+    Element(self.session, ("CSS_SELECTOR", "input#card-number"),
+            context=(frame(("CSS_SELECTOR", "iframe.payment-widget")), shadow(("CSS_SELECTOR", "card-form"))))
+
+LocatorContext of the session remembers frame chain browser is switched to, and caches frame
+and shadow root handles, so consecutive interactions in the same context switch (or pierce) once.
+Handles, that went stale, are re-resolved from top document.
+Browser is switched back to top document only when the next locator needs a different context.
+"""
+from selenium.common.exceptions import StaleElementReferenceException, NoSuchFrameException, \
+    NoSuchElementException
+
+from base.configurations.exception import ElementNotFoundExcepiton, CustomException
+
+FRAME = 'FRAME'
+SHADOW = 'SHADOW'
+
+IS_INSIDE_FRAME_SCRIPT = "return window.self !== window.top;"
+SHADOW_ROOT_SCRIPT = "return arguments[0].shadowRoot;"
+
+
+def frame(locator):
+    """Context step: enter frame, located by locator tuple."""
+    return FRAME, tuple(locator)
+
+
+def shadow(locator):
+    """Context step: search inside shadow root of host element, located by locator tuple (CSS only)."""
+    return SHADOW, tuple(locator)
+
+
+def frames_prefix(context):
+    """Return part of context path up to (and including) the last frame step."""
+    frame_indexes = [index for index, (kind, _) in enumerate(context) if kind == FRAME]
+    return tuple(context[:frame_indexes[-1] + 1]) if frame_indexes else ()
+
+
+class LocatorContext:
+    """Frame chain, browser is switched to, with cached frame and shadow root handles."""
+
+    def __init__(self, session):
+        self.session = session
+        self.current_frames = ()
+        self.handles = {}
+
+    @property
+    def driver(self):
+        return self.session.driver
+
+    def reset(self):
+        """Forget current frame chain and cached handles (e.g. after navigation)."""
+        self.current_frames = ()
+        self.handles.clear()
+
+    def search_root(self, context=()):
+        """Switch browser to frames of context (if not switched already) and return object to search
+        element in: web driver, or shadow root if context ends with shadow hosts.
+        """
+        try:
+            return self.enter(tuple(context))
+        except (StaleElementReferenceException, NoSuchFrameException):
+            # cached handles are outdated (page was reloaded) - search context from top document
+            self.reset()
+            self.driver.switch_to.default_content()
+            return self.enter(tuple(context))
+
+    def lookup(self, context, find):
+        """Return find(search root of context). If cached frame or shadow root handle goes stale during
+        the lookup itself (e.g. shadow host was re-rendered), handles are re-resolved from top document
+        and lookup is repeated once.
+        """
+        try:
+            return find(self.search_root(context))
+        except (StaleElementReferenceException, NoSuchFrameException):
+            if not context:
+                raise
+            self.reset()
+            self.driver.switch_to.default_content()
+            return find(self.enter(tuple(context)))
+
+    def enter(self, context):
+        frames = frames_prefix(context)
+
+        if frames and self.current_frames == frames:
+            # navigation returns browser to top document, verify it is still inside of frame
+            if not self.driver.execute_script(IS_INSIDE_FRAME_SCRIPT):
+                self.reset()
+
+        if self.current_frames != frames:
+            self.driver.switch_to.default_content()
+            self.current_frames = ()
+            root = self.driver
+            for index in range(len(frames)):
+                root = self.step_into(root, frames[:index + 1])
+            self.current_frames = frames
+
+        root = self.driver
+        for index in range(len(frames), len(context)):
+            root = self.step_into(root, context[:index + 1])
+        return root
+
+    def step_into(self, root, path):
+        """Enter the last step of path from root. Return new root."""
+        kind, locator = path[-1]
+        handle_key = (kind, path)
+        if handle_key not in self.handles:
+            self.handles[handle_key] = self.find(root, locator)
+        if kind == FRAME:
+            self.driver.switch_to.frame(self.handles[handle_key])
+            return self.driver
+
+        shadow_root_key = ('ROOT', path)
+        if shadow_root_key not in self.handles:
+            shadow_root = self.driver.execute_script(SHADOW_ROOT_SCRIPT, self.handles[handle_key])
+            if shadow_root is None:
+                raise ElementNotFoundExcepiton("Element by locator '{}' has no open shadow root".format(locator))
+            self.handles[shadow_root_key] = shadow_root
+        return self.handles[shadow_root_key]
+
+    @staticmethod
+    def find(root, locator):
+        from base.configurations.element import Element
+
+        by_class_object = Element.get_by_object(locator[0])
+        try:
+            elements = root.find_elements(by_class_object, locator[1])
+        except NoSuchElementException:
+            elements = []
+        if not elements:
+            raise ElementNotFoundExcepiton("Context element by locator : '{}' not found".format(locator))
+        return elements[0]
+
+    @staticmethod
+    def validate(locator, context):
+        if context and context[-1][0] == SHADOW and 'xpath' in locator[0].lower():
+            raise CustomException("XPath locator '{}' can not be used inside of shadow root. "
+                                  "Use CSS selector instead".format(locator))
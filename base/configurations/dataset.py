@@ -0,0 +1,141 @@
+"""Data-driven flows over large datasets.
+
+Dataset rows (CSV with header, or JSON lines) are read lazily and split into shards by row number,
+so the same shard always gets the same rows. Instead of one pytest test per row, test is parametrized
+by shard, and every shard feeds its rows to one long-lived session:
+
+    @pytest.mark.parametrize('shard', range(SHARDS))
+    def test_edit_personal_info(self, shard):
+        self.init_session()
+        page = SettingPage(self.session, make_login=False, navigate=False)
+        dataset = Dataset('projects/booking/data/personal_info.csv', shard=shard, shards=SHARDS)
+        report = DatasetRun(self.session, dataset, 'personal_info', setup=page.open_settings) \\
+            .run(lambda row: page.edit_personal_info(**row))
+
+Outcome of every row is appended to results/datasets/<name>.<shard>.jsonl as soon as row is done.
+If run is interrupted, the next run of the shard skips rows, that already have outcome. When all
+rows are done, summary is written to results/datasets/<name>.<shard>.json and the next run starts over.
+"""
+import csv
+import itertools
+import json
+import os
+import time
+
+from base.configurations.results import results_path
+
+
+class Dataset:
+    """Lazily read rows of one shard of CSV/JSONL file."""
+
+    def __init__(self, path, shard=0, shards=1):
+        """
+        :param path (str) - path to .csv (with header) or .jsonl file
+        :param shard (int) - index of shard to read (0 <= shard < shards)
+        :param shards (int) - total number of shards
+        """
+        if not 0 <= shard < shards:
+            raise ValueError("Shard {} is out of range of {} shards".format(shard, shards))
+        self.path = path
+        self.shard = shard
+        self.shards = shards
+
+    def rows(self):
+        """Generator of (row number, row dict) of the shard."""
+        with open(self.path, newline='', encoding='utf-8') as dataset_file:
+            if self.path.endswith('.csv'):
+                records = csv.DictReader(dataset_file)
+            else:
+                records = (json.loads(line) for line in dataset_file if line.strip())
+            for number, row in enumerate(records):
+                if number % self.shards == self.shard:
+                    yield number, row
+
+    def __iter__(self):
+        return self.rows()
+
+
+class DatasetRun:
+    """Feeds rows of dataset shard to one session, with progress checkpoints and per-row outcomes."""
+
+    def __init__(self, session, dataset, name, setup=None, limit=None):
+        """
+        :param session - session, all rows are executed in
+        :param dataset (Dataset) - rows to execute
+        :param name (str) - name of the run (progress and outcomes files are unique per name and shard)
+        :param setup - function, that brings session to the state, every row starts from (e.g. login and
+                       open settings page). Called before the first row, after failed row and after
+                       browser was recycled by memory governor.
+        :param limit (int) - max number of rows to execute in this run
+        """
+        self.session = session
+        self.dataset = dataset
+        self.name = name
+        self.setup = setup
+        self.limit = limit
+        self.logger = session.logger
+        base_name = '{}.{}'.format(name, dataset.shard)
+        self.progress_path = results_path('datasets', base_name + '.jsonl')
+        self.summary_path = results_path('datasets', base_name + '.json')
+
+    def load_progress(self):
+        """Return outcomes of rows, executed by previous (interrupted) run."""
+        if not os.path.exists(self.progress_path):
+            return {}
+        outcomes = {}
+        with open(self.progress_path) as progress_file:
+            for line in progress_file:
+                try:
+                    outcome = json.loads(line)
+                except ValueError:
+                    continue    # the last line of interrupted run may be incomplete
+                outcomes[outcome['row']] = outcome
+        return outcomes
+
+    def run(self, action):
+        """Execute action(row) for every row of the shard, that has no outcome yet. Return summary."""
+        outcomes = self.load_progress()
+        if outcomes:
+            self.logger.info("Dataset run '{}' is resumed: {} rows are already done".format(self.name, len(outcomes)))
+        needs_setup = True
+        executed = 0
+        start = time.time()
+        with open(self.progress_path, 'a') as progress_file:
+            for number, row in itertools.islice(
+                    ((number, row) for number, row in self.dataset if number not in outcomes), self.limit):
+                if hasattr(self.session, 'safe_point') and self.session.safe_point():
+                    needs_setup = True
+                row_start = time.time()
+                outcome = {'row': number, 'status': 'passed', 'error': None}
+                try:
+                    if needs_setup and self.setup:
+                        self.setup()
+                    needs_setup = False
+                    action(row)
+                except Exception as e:
+                    outcome.update(status='failed', error='{}: {}'.format(type(e).__name__, str(e)))
+                    needs_setup = True
+                    self.logger.warning("Dataset '{}' row {} failed: {}".format(self.name, number, outcome['error']))
+                outcome['duration'] = round(time.time() - row_start, 3)
+                outcomes[number] = outcome
+                progress_file.write(json.dumps(outcome) + '\n')
+                progress_file.flush()
+                executed += 1
+
+        summary = self.summarize(outcomes, executed, time.time() - start)
+        finished = self.limit is None or executed < self.limit
+        if finished:
+            with open(self.summary_path, 'w') as summary_file:
+                json.dump(summary, summary_file, indent=2)
+            os.remove(self.progress_path)
+        self.logger.info("Dataset run '{}' shard {}: {} passed, {} failed, {} executed in this run{}".format(
+            self.name, self.dataset.shard, summary['passed'], summary['failed'], executed,
+            '' if finished else ' (not finished)'))
+        return summary
+
+    def summarize(self, outcomes, executed, duration):
+        failed = [outcome for outcome in outcomes.values() if outcome['status'] == 'failed']
+        return {'name': self.name, 'shard': self.dataset.shard, 'shards': self.dataset.shards,
+                'rows': len(outcomes), 'passed': len(outcomes) - len(failed), 'failed': len(failed),
+                'executed': executed, 'duration': round(duration, 3),
+                'failures': sorted(failed, key=lambda outcome: outcome['row'])}
@@ -3,6 +3,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
 from base.configurations.exception import ElementNotFoundExcepiton, CustomException
+from base.configurations.context import LocatorContext
 
 IMPLICITLY_TIMEOUT = 60
 
@@ -11,19 +12,24 @@ class Element:
     """Class describes Element class.
     """
 
-    def __init__(self, session, locator=None):
+    def __init__(self, session, locator=None, context=()):
         """
         Initialize object of class Element.
         :param session (obj) - instance of the session class
         :param locator of element that is of tuple type :
                       e.g. ("CSS_SELECTOR", ".locator");
                       e.g. ("XPATH", "//*[@class ='class']"
+        :param context (tuple) - frames and shadow hosts to enter before searching element
+                      (see base.configurations.context), e.g. (frame(("CSS_SELECTOR", "iframe.payment")), )
         """
         self.session = session
         self.locator = locator
-        self.driver = session.driver
+        self.context = tuple(context)
         self.logger = session.logger
 
+    @property
+    def driver(self):
+        return self.session.driver
 
     def __call__(self, multiple=False, implicitly_timeout=IMPLICITLY_TIMEOUT):
         """ Returns either a selenium webdriver object or list of selenium webdriver objects
@@ -34,16 +40,35 @@ class Element:
         """
         self.driver.implicitly_wait(implicitly_timeout)
         by_class_object = self.get_by_object(self.locator[0])
+        elements = self.lookup(lambda search_root: search_root.find_elements(by_class_object, self.locator[1]))
 
         if multiple:
-            return self.driver.find_elements(by_class_object, self.locator[1])
+            return elements
         else:
-            if not self.driver.find_elements(by_class_object, self.locator[1]):
+            if not elements:
                 raise ElementNotFoundExcepiton(
                     "Element by locator : '{}' not found. Waited for : '{} seconds'"
                     .format(self.locator, implicitly_timeout))
             else:
-                return self.driver.find_elements(by_class_object, self.locator[1])[0]
+                return elements[0]
+
+    def lookup(self, find):
+        """Return find(search root of element). Stale context handles are re-resolved (see LocatorContext.lookup)."""
+        locator_context = getattr(self.session, 'locator_context', None)
+        if locator_context is None:
+            return find(self.search_root())
+        LocatorContext.validate(self.locator, self.context)
+        return locator_context.lookup(self.context, find)
+
+    def search_root(self):
+        """Return driver (switched to frames of element context) or shadow root to search element in."""
+        locator_context = getattr(self.session, 'locator_context', None)
+        if locator_context is None:
+            if self.context:
+                raise CustomException("Session does not support locator contexts")
+            return self.driver
+        LocatorContext.validate(self.locator, self.context)
+        return locator_context.search_root(self.context)
 
     @staticmethod
     def get_by_object(string_strategy):
@@ -52,3 +52,19 @@ class ElementNotAvailableException(CustomException):
 class AttributeNotFoundException(CustomException):
     """Raise if element is disabled"""
     pass
+
+class RouteNotFoundException(CustomException):
+    """Raise if page object has no registered route"""
+    pass
+
+class CredentialsPoolException(CustomException):
+    """Raise if account can not be leased from credentials pool"""
+    pass
+
+class ReplayMismatchException(CustomException):
+    """Raise if replayed webdriver command differs from the recorded one"""
+    pass
+
+class PerformanceBudgetException(CustomException):
+    """Raise if page performance metrics exceed declared budget"""
+    pass
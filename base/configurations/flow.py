@@ -0,0 +1,198 @@
+"""Checkpointed flows.
+
+Multi-step page object flow declares checkpoints - steps, after which browser state is durable
+(e.g. user is logged in, settings page is opened). At each checkpoint url, local/session storage and
+step index are saved to results/checkpoints; cookies (auth) are never written to results - they are saved
+next to it in COOKIES_DIR (temp directory, file is readable by owner only). If later step fails, flow is
+resumed from the last good checkpoint instead of starting from scratch, in the same run or in a rerun
+(checkpoint without its cookies is ignored):
+
+    CheckpointedFlow(session, 'edit_personal_info') \\
+        .step('login', page.login_to_booking, checkpoint=True) \\
+        .step('navigate to settings', page.navigate_to_settings, checkpoint=True) \\
+        .step('edit personal info', lambda: page.edit_personal_info('Name')) \\
+        .run()
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from base.configurations.results import results_path, current_test_name
+
+RETRIES = 1
+CHECKPOINT_MAX_AGE = 3600
+
+COOKIES_DIR = os.path.join(tempfile.gettempdir(), 'checkpoint_cookies')
+
+SNAPSHOT_STORAGE_SCRIPT = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) { items[storage.key(i)] = storage.getItem(storage.key(i)); }
+    return items;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+RESTORE_STORAGE_SCRIPT = """
+var storage = arguments[0];
+Object.keys(storage.local).forEach(function (key) { window.localStorage.setItem(key, storage.local[key]); });
+Object.keys(storage.session).forEach(function (key) { window.sessionStorage.setItem(key, storage.session[key]); });
+"""
+
+
+class FlowStep:
+    """Single step of the flow."""
+
+    def __init__(self, name, action, checkpoint=False):
+        self.name = name
+        self.action = action
+        self.checkpoint = checkpoint
+
+
+class CheckpointedFlow:
+    """Class describes flow of steps, resumable from the last checkpoint."""
+
+    def __init__(self, session, name, retries=RETRIES, max_age=CHECKPOINT_MAX_AGE):
+        """
+        :param session (SeleniumSession) - session to execute flow in
+        :param name (str) - name of the flow. Checkpoint file is unique per test and flow name.
+        :param retries (int) - number of resumes from the last checkpoint in the same run
+        :param max_age (int) - seconds, after which saved checkpoint is considered outdated (e.g. expired login)
+        """
+        self.session = session
+        self.logger = session.logger
+        self.name = name
+        self.retries = retries
+        self.max_age = max_age
+        self.steps = []
+        self.checkpoint_path = results_path('checkpoints', '{}.{}.json'.format(current_test_name(), name))
+        self.cookies_path = os.path.join(
+            COOKIES_DIR, hashlib.sha1(os.path.abspath(self.checkpoint_path).encode()).hexdigest() + '.json')
+
+    @property
+    def driver(self):
+        return self.session.driver
+
+    def step(self, name, action, checkpoint=False):
+        """Add step to the flow.
+        :param action - function without arguments, that performs the step
+        :param checkpoint (bool) - if True - browser state is saved after step succeeded
+        """
+        self.steps.append(FlowStep(name, action, checkpoint))
+        return self
+
+    def run(self):
+        """Execute flow. Steps before the last saved checkpoint are skipped."""
+        checkpoint = self.load_checkpoint()
+        index = 0
+        if checkpoint:
+            self.restore(checkpoint)
+            index = checkpoint['step_index'] + 1
+
+        retries = self.retries
+        while index < len(self.steps):
+            step = self.steps[index]
+            start = time.time()
+            try:
+                self.logger.info("Flow '{}': executing step {} '{}'".format(self.name, index, step.name))
+                if hasattr(self.session, 'mark_step'):
+                    self.session.mark_step('{}: {}'.format(self.name, step.name))
+                step.action()
+            except Exception as e:
+                self.record_timing(step, start, 'failed')
+                checkpoint = self.load_checkpoint()
+                if not retries or not checkpoint:
+                    self.logger.error("Flow '{}': step '{}' failed with '{}'".format(self.name, step.name, str(e)))
+                    raise
+                retries -= 1
+                self.logger.warning("Flow '{}': step '{}' failed with '{}'. Resuming from checkpoint after step '{}'"
+                                    .format(self.name, step.name, str(e), self.steps[checkpoint['step_index']].name))
+                self.restore(checkpoint)
+                index = checkpoint['step_index'] + 1
+                continue
+
+            self.record_timing(step, start, 'passed')
+            if step.checkpoint:
+                self.save_checkpoint(index)
+            index += 1
+
+        self.clear_checkpoint()
+
+    def record_timing(self, step, start, status):
+        self.session.step_timings.append({'flow': self.name, 'step': step.name, 'status': status,
+                                          'duration': round(time.time() - start, 3)})
+
+    # checkpoints
+
+    def save_checkpoint(self, step_index):
+        checkpoint = {
+            'flow': self.name,
+            'steps': [step.name for step in self.steps],
+            'step_index': step_index,
+            'saved_at': time.time(),
+            'url': self.driver.current_url,
+            'storage': self.driver.execute_script(SNAPSHOT_STORAGE_SCRIPT),
+        }
+        os.makedirs(COOKIES_DIR, mode=0o700, exist_ok=True)
+        if os.path.exists(self.cookies_path):
+            os.remove(self.cookies_path)
+        with os.fdopen(os.open(self.cookies_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'w') as cookies_file:
+            json.dump({'saved_at': checkpoint['saved_at'], 'cookies': self.driver.get_cookies()}, cookies_file)
+        with open(self.checkpoint_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        self.logger.info("Flow '{}': saved checkpoint after step '{}'".format(self.name, self.steps[step_index].name))
+
+    def load_checkpoint(self):
+        """Return saved checkpoint or None if there is no valid checkpoint for this flow."""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if checkpoint['steps'] != [step.name for step in self.steps] or \
+                time.time() - checkpoint['saved_at'] > self.max_age:
+            self.logger.info("Flow '{}': saved checkpoint is outdated and ignored".format(self.name))
+            self.clear_checkpoint()
+            return None
+        cookies = {}
+        if os.path.exists(self.cookies_path):
+            with open(self.cookies_path) as cookies_file:
+                cookies = json.load(cookies_file)
+        if cookies.get('saved_at') != checkpoint['saved_at']:
+            self.logger.info("Flow '{}': cookies of saved checkpoint are not available, checkpoint is ignored"
+                             .format(self.name))
+            self.clear_checkpoint()
+            return None
+        checkpoint['cookies'] = cookies['cookies']
+        return checkpoint
+
+    def clear_checkpoint(self):
+        for path in (self.checkpoint_path, self.cookies_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def restore(self, checkpoint):
+        """Restore browser state (cookies, storage and url) of checkpoint."""
+        self.logger.info("Flow '{}': restoring browser state after step '{}'"
+                         .format(self.name, self.steps[checkpoint['step_index']].name))
+        url = urlsplit(checkpoint['url'])
+
+        # cookie can be added only on page of its domain
+        self.driver.delete_all_cookies()
+        cookies_by_domain = {}
+        for cookie in checkpoint['cookies']:
+            cookies_by_domain.setdefault(cookie.get('domain', url.hostname).lstrip('.'), []).append(cookie)
+        for domain, cookies in cookies_by_domain.items():
+            self.driver.get('{}://{}/'.format(url.scheme, domain))
+            for cookie in cookies:
+                cookie = dict(cookie)
+                if 'expiry' in cookie:
+                    cookie['expiry'] = int(cookie['expiry'])
+                cookie.pop('sameSite', None)
+                self.driver.add_cookie(cookie)
+
+        self.driver.get('{}://{}/'.format(url.scheme, url.netloc))
+        self.driver.execute_script(RESTORE_STORAGE_SCRIPT, checkpoint['storage'])
+        self.driver.get(checkpoint['url'])
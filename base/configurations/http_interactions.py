@@ -0,0 +1,79 @@
+"""Http interactions module. Read-only subset of Interactions for browserless page objects
+(pages, that are tested with HttpSession instead of SeleniumSession).
+
+:param element :
+                - or locator of element that is of tuple type :
+                      e.g. ("CSS_SELECTOR", ".locator");
+                      e.g. ("XPATH", "//*[@class ='class']"
+                - or instance of class Element :
+                      e.g. Element(self.session, ("CSS_SELECTOR", ".locator"))
+"""
+from base.configurations.element import Element
+from base.configurations.exception import ElementNotFoundExcepiton, AttributeNotFoundException, CustomException
+
+
+class HttpInteractions:
+    """ Class that describes read-only interactions with elements of fetched page.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.logger = session.logger
+
+    @staticmethod
+    def get_locator(element):
+        """Return locator tuple of element."""
+        if isinstance(element, Element):
+            return element.locator
+        if isinstance(element, tuple):
+            return element
+        raise CustomException('Passed element is invalid for http session: {}'.format(element))
+
+    def is_elements_present(self, element, timeout=0):
+        """Check if element is present on fetched page.
+        :param timeout - not used, page is already fetched. Kept for compatibility with Interactions.
+        """
+        locator = self.get_locator(element)
+        self.logger.info("Start checking if element present {}".format(locator))
+        return bool(self.session.find(locator, multiple=True))
+
+    def is_element_displayed(self, element, el_description='', timeout=0):
+        """Check if element is present and not hidden by markup (hidden attribute or inline display:none).
+        Styles from css files are not applied, so it is an approximation of Interactions.is_element_displayed.
+        """
+        locator = self.get_locator(element)
+        try:
+            web_element = self.session.find(locator)
+        except ElementNotFoundExcepiton:
+            self.logger.info('Element by locator "{}" not found.'.format(locator))
+            return False
+        for node in [web_element] + list(web_element.iterancestors()):
+            style = (node.get('style') or '').replace(' ', '').lower()
+            if node.get('hidden') is not None or 'display:none' in style:
+                return False
+        return True
+
+    def get_text(self, element, el_description=''):
+        """get inner text of element"""
+        locator = self.get_locator(element)
+        self.logger.info("Getting text from element '{}'".format(locator))
+        return self.session.find(locator).text_content().strip()
+
+    def get_attribute(self, element, el_description='', attribute='value'):
+        """get specified attribute from element"""
+        locator = self.get_locator(element)
+        self.logger.info("Getting attribute: '{}' from element '{}'".format(attribute, locator))
+        value = self.session.find(locator).get(attribute)
+        if value is None:
+            raise AttributeNotFoundException("Following element: '{}' has no attribute '{}'"
+                                             .format(locator, attribute))
+        return value.lower()
+
+    def get_title(self):
+        """get title of fetched page"""
+        return self.session.title
+
+    def get_meta_content(self, name):
+        """get content of <meta name="..."> or <meta property="..."> tag"""
+        locator = ("XPATH", "//meta[@name='{0}' or @property='{0}']".format(name))
+        return self.get_attribute(locator, attribute='content')
@@ -15,12 +15,123 @@ Common arguments, present in class methods of this module:
 import time
 
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.common.exceptions import *
 from base.configurations.element import Element
 from base.configurations.waits import Waits
 from base.configurations.exception import *
+from base.configurations.retry import RetryPolicy
 
 IMPLICITLY_TIMEOUT = 60
+DROPDOWN_LOAD_TIMEOUT = 3
+EXTRACT_CHUNK_SIZE = 200
+
+SCROLL_POLL_FREQUENCY = 0.25
+
+# common part of item scripts: find rows by locator in root, read fields of a row.
+# XPath is evaluated with search root as context node: relative locators (".//li") are found inside of it only,
+# absolute ones ("//li") - in the whole document.
+ROWS_SCRIPT = """
+function findRows(root, strategy, locator) {
+    if (strategy !== 'XPATH') { return Array.prototype.slice.call(root.querySelectorAll(locator)); }
+    var snapshot = (root.ownerDocument || root).evaluate(locator, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null),
+        rows = [];
+    for (var i = 0; i < snapshot.snapshotLength; i++) { rows.push(snapshot.snapshotItem(i)); }
+    return rows;
+}
+function readFields(row, fields) {
+    var item = {};
+    fields.forEach(function (field) {
+        var node = field[1] === null ? row : row.querySelector(field[1]);
+        if (!node) { item[field[0]] = null; }
+        else if (field[2] === null) { item[field[0]] = (node.innerText || node.textContent || '').trim(); }
+        else { item[field[0]] = node.getAttribute(field[2]); }
+    });
+    return item;
+}
+"""
+
+# arguments: search root (shadow root or null for document), row locator strategy, row locator,
+# fields [[name, css sub-selector or null for row itself, attribute name or null for text]], offset, limit
+EXTRACT_SCRIPT = ROWS_SCRIPT + """
+var rows = findRows(arguments[0] || document, arguments[1], arguments[2]),
+    fields = arguments[3], offset = arguments[4], limit = arguments[5];
+var items = rows.slice(offset, limit === null ? rows.length : offset + limit).map(function (row) {
+    return readFields(row, fields);
+});
+return {total: rows.length, items: items};
+"""
+
+# arguments: search root, row locator strategy, row locator, fields (or null to return rows themselves),
+# attribute, that marks rows as already streamed.
+# Returns rows, that were not streamed yet, and marks them.
+STREAM_SCRIPT = ROWS_SCRIPT + """
+var fields = arguments[3], mark = arguments[4];
+return findRows(arguments[0] || document, arguments[1], arguments[2]).filter(function (row) {
+    return !row.hasAttribute(mark);
+}).map(function (row) {
+    row.setAttribute(mark, '');
+    return fields === null ? row : readFields(row, fields);
+});
+"""
+
+# arguments: fields [[search root or null, locator strategy, locator, value]].
+# Sets value of text inputs / textareas (with native setter, so frameworks notice the change), selects option
+# of select by its value or text, checks/unchecks checkbox or radio. Dispatches input and change events.
+# Returns list of [field index, error message] for fields, that could not be filled.
+FILL_FORM_SCRIPT = ROWS_SCRIPT + """
+var errors = [];
+function fire(element, type) { element.dispatchEvent(new Event(type, {bubbles: true})); }
+function setNativeValue(element, value) {
+    var prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+}
+arguments[0].forEach(function (field, index) {
+    var element = findRows(field[0] || document, field[1], field[2])[0], value = field[3];
+    if (!element) { errors.push([index, 'element not found']); return; }   // see FIELD_NOT_FOUND
+    if (element.disabled) { errors.push([index, 'element is disabled']); return; }
+    var tag = element.tagName.toLowerCase(), type = (element.type || '').toLowerCase();
+    element.focus();
+    if (tag === 'select') {
+        var text = String(value).toLowerCase(), options = Array.prototype.slice.call(element.options);
+        var option = options.filter(function (o) { return o.value === String(value); })[0]
+            || options.filter(function (o) { return o.text.trim().toLowerCase() === text; })[0]
+            || options.filter(function (o) { return o.text.toLowerCase().indexOf(text) !== -1; })[0];
+        if (!option) { errors.push([index, 'no option with value or text: ' + value]); return; }
+        element.value = option.value;
+    } else if (type === 'checkbox' || type === 'radio') {
+        if (element.checked !== Boolean(value)) { element.click(); }
+    } else if (tag === 'input' || tag === 'textarea') {
+        setNativeValue(element, String(value));
+    } else if (element.isContentEditable) {
+        element.textContent = String(value);
+    } else {
+        errors.push([index, 'element is not a form field: ' + tag]); return;
+    }
+    fire(element, 'input');
+    fire(element, 'change');
+    element.blur();
+});
+return errors;
+"""
+
+SCROLL_STEP_SCRIPT = """
+var scroller = document.scrollingElement || document.documentElement;
+var before = scroller.scrollTop;
+window.scrollBy(0, arguments[0] || window.innerHeight);
+return {moved: scroller.scrollTop !== before, height: scroller.scrollHeight};
+"""
+
+FIELD_NOT_FOUND = 'element not found'
+
+
+class Typed:
+    """Value of fill_form field, that has to be typed with real keystrokes (for fields, which listen to
+    key events, e.g. autocomplete)."""
+
+    def __init__(self, text):
+        self.text = text
+
 
 class Interactions:
     """ Class that describes interaction with elements.
@@ -28,9 +139,50 @@ class Interactions:
 
     def __init__(self, session):
         self.session = session
-        self.driver = session.driver
         self.waits = Waits(session)
         self.logger = session.logger
+        self.retry_policy = getattr(session, 'retry_policy', None) or RetryPolicy()
+        self.interstitials = getattr(session, 'interstitials', None)
+
+    @property
+    def driver(self):
+        return self.session.driver
+
+    # Steps
+
+    def retry_step(self, element, el_description, step):
+        """Resolve element and execute step(web_element, description) with it.
+        Transient failures (see base.configurations.retry) are retried with backoff, element is
+        re-resolved from its locator before every retry. Fatal exceptions are raised as is.
+        Registered interstitials (see base.configurations.interstitials) are dismissed before step
+        (throttled check) and before every retry (forced check: popup may be what intercepted the step).
+        :param element : watch in description to this module
+        :param el_description (str) description of the element
+        :param step - function that takes WebElement and its description
+        """
+        attempt = 0
+        while True:
+            if self.interstitials:
+                self.interstitials.check(force=attempt > 0)
+            web_element, description = Element(self.session).initialize_webelement(element, el_description)
+            try:
+                return step(web_element, description)
+            except Exception as exception:
+                if not self.retry_policy.should_retry(exception, attempt,
+                                                      reresolvable=not isinstance(element, WebElement)):
+                    if self.retry_policy.is_transient(exception):
+                        self.logger.error("Giving up step with element '{}' after {} attempts: {}"
+                                          .format(description, attempt + 1, type(exception).__name__))
+                        raise ElementNotAvailableException(
+                            'Step with following element "{}" failed after {} attempts. Got following error: "{}".'
+                            .format(description, attempt + 1, str(exception)))
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                self.retry_policy.record(description)
+                self.logger.warning("Retrying step with element '{}' in {} seconds due to transient error: {}"
+                                    .format(description, delay, type(exception).__name__))
+                time.sleep(delay)
+                attempt += 1
 
     # Get info about element
 
@@ -117,6 +269,114 @@ class Interactions:
             raise AttributeNotFoundException("Following element: '{}' has no attribute '{}'"
                                              .format(description, attribute))
 
+    def extract(self, container_element, field_map, chunk_size=EXTRACT_CHUNK_SIZE):
+        """Extract fields of repeated items (result cards, table rows, calendar dates) with one script
+        call per chunk of items, instead of reading text and attributes item by item.
+        :param container_element : locator or Element of repeated item (row). See description to this module
+        :param field_map (dict) - name of field : how to get it from row. Value is either:
+                                    - css sub-selector (str) - text of matched child element;
+                                    - tuple (css sub-selector, attribute name) - attribute of child element;
+                                    - tuple (None, attribute name) - attribute of the row itself;
+                                    - None - text of the row itself.
+                                  Missing child elements or attributes give None.
+                                  e.g. {'name': '[data-testid="title"]', 'link': ('a', 'href'), 'id': (None, 'data-id')}
+        :param chunk_size (int) max number of rows, returned by one script call. None - all rows at once
+        :return list of dicts (one per row, in document order)
+        """
+        container_element = self._items_element(container_element)
+        self.logger.info("Extracting fields {} of items '{}'".format(list(field_map), container_element.locator))
+        arguments = self._items_arguments(container_element, field_map)
+        items, offset, total = [], 0, None
+        while total is None or offset < total:
+            try:
+                chunk = self.driver.execute_script(EXTRACT_SCRIPT, *arguments, offset, chunk_size)
+            except Exception as e:
+                raise JavascriptException("Failed to extract items by locator '{}'. Got following exception: '{}'"
+                                          .format(container_element.locator, str(e)))
+            total = chunk['total']
+            items.extend(chunk['items'])
+            if not chunk['items']:
+                break
+            offset += len(chunk['items'])
+        return items
+
+    def stream_items(self, item_element, field_map=None, key=None, limit=None, timeout=300, idle_timeout=10,
+                     scroll_step=None):
+        """Generator, that walks lazily loaded (infinite scroll) list: scrolls page step by step, waits for
+        new items to load and yields every item once, as soon as it appears.
+        Only new items are transferred from browser (streamed items are marked in DOM), so thousands of
+        results can be processed without holding all of them in memory.
+        :param item_element : locator or Element of list item. See description to this module
+        :param field_map (dict) - fields to yield for every item as dict (see extract).
+                                  None - yield WebElement of item
+        :param key (str) - attribute of item, that identifies it (e.g. 'data-hotelid'). Items with already
+                           seen key (list re-rendered them) are skipped. Items without the attribute are
+                           identified by their element only (every element is streamed once). Requires field_map
+        :param limit (int) - stop after that many items
+        :param timeout (int) - stop after that many seconds
+        :param idle_timeout (int) - stop, when no new items appeared that many seconds after scroll
+        :param scroll_step (int) - pixels to scroll per step. None - height of the window
+        """
+        item_element = self._items_element(item_element)
+        if key and field_map is None:
+            raise CustomException('Deduplication by key attribute requires field_map')
+        field_map = dict(field_map, __key=(None, key)) if key else field_map
+        arguments = self._items_arguments(item_element, field_map)
+        mark = 'data-streamed-{}'.format(int(time.time() * 1000))
+        self.logger.info("Streaming items '{}' (limit: {}, timeout: {} seconds)"
+                         .format(item_element.locator, limit, timeout))
+
+        seen_keys, streamed = set(), 0
+        deadline = time.time() + timeout
+        idle_since = time.time()
+        while time.time() < deadline:
+            try:
+                new_items = self.driver.execute_script(STREAM_SCRIPT, *arguments, mark)
+            except Exception as e:
+                raise JavascriptException("Failed to stream items by locator '{}'. Got following exception: '{}'"
+                                          .format(item_element.locator, str(e)))
+            for item in new_items:
+                if key:
+                    item_key = item.pop('__key')
+                    if item_key is not None:
+                        if item_key in seen_keys:
+                            continue
+                        seen_keys.add(item_key)
+                streamed += 1
+                yield item
+                if limit and streamed >= limit:
+                    self.logger.info("Streamed {} items: limit reached".format(streamed))
+                    return
+
+            if new_items:
+                idle_since = time.time()
+            elif time.time() - idle_since > idle_timeout:
+                self.logger.info("Streamed {} items: no new items for {} seconds".format(streamed, idle_timeout))
+                return
+            self.driver.execute_script(SCROLL_STEP_SCRIPT, scroll_step)
+            if not new_items:
+                time.sleep(SCROLL_POLL_FREQUENCY)
+        self.logger.info("Streamed {} items: timeout of {} seconds reached".format(streamed, timeout))
+
+    def _items_element(self, element):
+        if isinstance(element, tuple):
+            element = Element(self.session, element)
+        if not isinstance(element, Element):
+            raise CustomException('Locator or Element of repeated items is expected, got: {}'.format(element))
+        return element
+
+    def _items_arguments(self, element, field_map):
+        """Return arguments of item scripts: search root, row locator strategy, row locator, fields."""
+        strategy = 'XPATH' if 'xpath' in element.locator[0].lower() else 'CSS_SELECTOR'
+        fields = None
+        if field_map is not None:
+            fields = []
+            for name, field in field_map.items():
+                selector, attribute = field if isinstance(field, tuple) else (field, None)
+                fields.append([name, selector, attribute])
+        search_root = element.search_root()
+        return None if search_root is self.driver else search_root, strategy, element.locator[1], fields
+
     # Scrolls:
 
     def scroll_in_to_view(self, element, el_description=''):
@@ -144,7 +404,8 @@ class Interactions:
         Scrolling to bottom of page
         """
         self.logger.info("Scrolling to bottom")
-        self.driver.execute_script("window.scrollTo(0, 2000)")
+        self.driver.execute_script("window.scrollTo(0, (document.scrollingElement || document.documentElement)"
+                                   ".scrollHeight)")
 
     # Click
 
@@ -158,21 +419,24 @@ class Interactions:
        :param el_description (str) description of the element
        :param wait_to_be_enabled: (bool) if true - then wait for element to be enabled before entering keys.
         """
-        web_element, description = Element(self.session).initialize_webelement(element, el_description)
-        self.logger.info("Clicking on following element '{}'".format(description))
+        def perform_click(web_element, description):
+            try:
+                self.logger.info("Clicking on following element '{}'".format(description))
+                web_element.click()
 
-        try:
-            self.logger.info("Clicking on following element '{}'".format(description))
-            web_element.click()
+            except Exception as exception:
 
-        except Exception as exception:
+                if self.retry_policy.is_transient(exception):
+                    raise
 
-            if not web_element.is_enabled():
-                raise ElementIsDisabledException('Following element "{}" is disabled. '.format(description))
+                if not web_element.is_enabled():
+                    raise ElementIsDisabledException('Following element "{}" is disabled. '.format(description))
 
-            raise ElementNotAvailableException(
-                'Failed to click to following elelement: "{}". Got following errror: "{}".'
-                .format(description, str(exception)))
+                raise ElementNotAvailableException(
+                    'Failed to click to following elelement: "{}". Got following errror: "{}".'
+                    .format(description, str(exception)))
+
+        self.retry_step(element, el_description, perform_click)
 
     def click_element_with_js(self, element, el_description=''):
         """
@@ -228,28 +492,89 @@ class Interactions:
         :param el_description: watch in description to this module
         :param text_to_send: (str) text to set in a text field.
         :param clear (bool) if true - then clear filed before entering data.
-        :param wait_to_be_enabled: (bool) if true - then wait for element to be enabled before entering keys.
-        :param attempt (int) - not editable param.
+        :param click (bool) if true - then click on field before entering data.
         """
-        web_element, description = Element(self.session).initialize_webelement(element, el_description)
-        if click:
-            self.click(element, el_description)
+        def perform_send_keys(web_element, description):
+            try:
+                if click:
+                    self.logger.info("Clicking on following element '{}'".format(description))
+                    web_element.click()
+
+                if clear:
+                    self.logger.info("Clearing following element '{}'".format(description))
+                    web_element.clear()
+
+                if text_to_send:
+                    self.logger.info("Sending keys: '{}' on to following element '{}'".format(text_to_send, description))
+                    web_element.send_keys(text_to_send)
+
+            except Exception as e:
+
+                if self.retry_policy.is_transient(e):
+                    raise
+
+                if not web_element.is_enabled():
+                    raise ElementIsDisabledException('Following element "{}" is disabled. '.format(description))
+
+                raise ElementNotAvailableException('Failed to send keys to following element: "{}" due to caught exception: "{}"'
+                                                   .format(description, str(e)))
+
+        self.retry_step(element, el_description, perform_send_keys)
+
+    def fill_form(self, fields, timeout=IMPLICITLY_TIMEOUT):
+        """Fill many form fields with one script call: text inputs and textareas get value, selects get option
+        (by value or text), checkboxes and radios get checked/unchecked by bool value. input and change events
+        are dispatched for every field, so frameworks register the change.
+        Fields, that are not in DOM yet, are waited for (implicit wait of driver, as element lookup does)
+        and filled by the second script call.
+        :param fields (dict) - locator or Element of field : value to set. Wrap value into Typed(text) to type it
+                               with real keystrokes instead (see send_keys).
+                               e.g. {("CSS_SELECTOR", "input#nickname"): "Name", ("CSS_SELECTOR", "select#bday"): "3",
+                                     ("CSS_SELECTOR", "input#password"): Typed("secret")}
+        :param timeout (int) time to wait for missing fields to appear
+        """
+        script_fields, elements, descriptions, typed = [], [], [], []
+        for element, value in fields.items():
+            if isinstance(value, Typed):
+                typed.append((element, value.text))
+                continue
+            if isinstance(element, tuple):
+                element = Element(self.session, element)
+            if not isinstance(element, Element):
+                raise CustomException('Form field must be a locator or Element, got: {}'.format(element))
+            search_root, strategy, locator, _ = self._items_arguments(element, None)
+            script_fields.append([search_root, strategy, locator, value])
+            elements.append(element)
+            descriptions.append(str(element.locator))
+
+        if script_fields:
+            self.logger.info("Filling form fields: {}".format(', '.join(descriptions)))
+            errors = self._fill_form_fields(script_fields, descriptions)
+            missing = [index for index, message in errors if message == FIELD_NOT_FOUND]
+            if missing:
+                errors = [error for error in errors if error[0] not in missing]
+                for index in missing:
+                    try:
+                        elements[index](implicitly_timeout=timeout)
+                    except ElementNotFoundExcepiton:
+                        pass
+                retried = self._fill_form_fields([script_fields[index] for index in missing],
+                                                 [descriptions[index] for index in missing])
+                errors += [[missing[index], message] for index, message in retried]
+            if errors:
+                raise ElementNotAvailableException("Failed to fill following form fields: {}".format(
+                    '; '.join("'{}' - {}".format(descriptions[index], message) for index, message in errors)))
+
+        for element, text in typed:
+            self.send_keys(element, text)
+
+    def _fill_form_fields(self, script_fields, descriptions):
+        """Execute fill form script. Return errors: [field index, message]."""
         try:
-            if clear:
-                self.logger.info("Clearing following element '{}'".format(el_description))
-                web_element.clear()
-
-            if text_to_send:
-                self.logger.info("Sending keys: '{}' on to following element '{}'".format(text_to_send, description))
-                web_element.send_keys(text_to_send)
-
+            return self.driver.execute_script(FILL_FORM_SCRIPT, script_fields)
         except Exception as e:
-
-            if not web_element.is_enabled():
-                raise ElementIsDisabledException('Following element "{}" is disabled. '.format(el_description))
-
-            raise ElementNotAvailableException('Failed to send keys to following element: "{}" due to caught exception: "{}"'
-                                               .format(description, str(e)))
+            raise JavascriptException("Failed to fill form fields {}. Got following exception: '{}'"
+                                      .format(descriptions, str(e)))
 
     def js_set_value_to_input(self, css_locator_of_element, keys):
         """"
@@ -261,8 +586,8 @@ class Interactions:
         try:
             self.logger.info("Settings following value: '{}' to element by css selector '{}'"
                              .format(keys, css_locator_of_element))
-            self.driver.execute_script('document.querySelector("{}").value="{}"'
-                                       .format(css_locator_of_element, keys))
+            self.driver.execute_script('document.querySelector(arguments[0]).value = arguments[1];',
+                                       css_locator_of_element, keys)
         except Exception as e:
             raise JavascriptException("Failed to set value of input element, located by css selector: {}."
                                       "Got following exception: '{}'".format(css_locator_of_element, str(e)))
@@ -282,8 +607,10 @@ class Interactions:
         if dropdown_to_expand:
             dd_web_element, dd_description = Element(self.session).initialize_webelement(dropdown_to_expand, el_description)
             self.logger.info("Clicking to open following dropdown '{}'".format(dd_description))
-            self.click(dropdown_to_expand, el_description)
-            time.sleep(3)
+            # options are loaded by requests of the click; page may never become idle (analytics beacons),
+            # so it is waited for at most DROPDOWN_LOAD_TIMEOUT without failing
+            with self.waits.wait_for_triggered_requests(timeout=DROPDOWN_LOAD_TIMEOUT, raise_exception=False):
+                self.click(dropdown_to_expand, el_description)
 
         if not self.is_element_displayed(list_of_options_from_dropdown):
             raise FlowFailedException("No options in dropdown list by locator '{}' found."
@@ -342,6 +669,7 @@ class Interactions:
         self.logger.info("Switching to browser tab on index '{}'".format(str(index)))
         try:
             self.driver.switch_to_window(self.driver.window_handles[index])
+            self.reset_locator_context()
         except (NoSuchWindowException, IndexError) as e:
             raise FlowFailedException(
                 "Caught following exception when trying to switch to window by index \"{0}\"."
@@ -351,8 +679,15 @@ class Interactions:
     def browser_refresh(self):
         """Refreshes browser window. """
         self.logger.info("Refreshing browser...")
+        self.reset_locator_context()
         return self.driver.refresh()
 
+    def reset_locator_context(self):
+        """Forget frame chain and cached frame/shadow root handles of the session (browser is in top document)."""
+        locator_context = getattr(self.session, 'locator_context', None)
+        if locator_context:
+            locator_context.reset()
+
     # def accept_alert(self):
     #     """accept alert by clicking on ok btn in alert window"""
     #     self.logger.info("Accepting alert...")
@@ -0,0 +1,131 @@
+"""Interstitial watchdog: popups, consent banners and prompts, that cover the page.
+
+Projects register known interstitials - css locator of the button, that dismisses it:
+
+    interstitial('welcome modal', ("CSS_SELECTOR", ".modal-mask-closeBtn"))
+
+Watchdog of the session injects MutationObserver into every page (at document start in chrome),
+which clicks dismiss button of registered interstitial the moment it becomes visible. As a fallback,
+Interactions run cheap check (one script call, at most once per CHECK_INTERVAL) before interactions,
+and forced check before retry of intercepted step. Dismissals are counted per interstitial.
+Throttled check depends on wall clock, so it is skipped in record/replay mode (see base.driver.transport):
+replayed session must send exactly the recorded commands.
+"""
+import collections
+import json
+import time
+
+INTERSTITIALS = collections.OrderedDict()
+CHECK_INTERVAL = 1.0
+
+OBSERVER_SCRIPT = """
+(function (registry) {
+    if (window.__interstitials) { window.__interstitials.registry = registry; return; }
+    var watchdog = window.__interstitials = {registry: registry, counts: {}};
+    function visible(element) { return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length); }
+    watchdog.dismiss = function () {
+        Object.keys(watchdog.registry).forEach(function (name) {
+            var button = document.querySelector(watchdog.registry[name]);
+            if (button && visible(button)) {
+                button.click();
+                watchdog.counts[name] = (watchdog.counts[name] || 0) + 1;
+            }
+        });
+    };
+    var scheduled = false;
+    new MutationObserver(function () {
+        // mutations are coalesced: registry is checked once per frame
+        if (scheduled) { return; }
+        scheduled = true;
+        (window.requestAnimationFrame || setTimeout)(function () { scheduled = false; watchdog.dismiss(); });
+    }).observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ['style', 'class', 'hidden']});
+})(%s);
+"""
+
+# installs observer if page has none, dismisses visible interstitials, returns and resets dismissal counts
+CHECK_SCRIPT = OBSERVER_SCRIPT + """
+var watchdog = window.__interstitials, counts = watchdog.counts;
+watchdog.dismiss();
+counts = watchdog.counts;
+watchdog.counts = {};
+return counts;
+"""
+
+
+def interstitial(name, dismiss_locator):
+    """Register interstitial.
+    :param name (str) - name of interstitial in dismissal counts
+    :param dismiss_locator (tuple) - css locator of element, click on which dismisses interstitial
+    """
+    if 'xpath' in dismiss_locator[0].lower():
+        raise ValueError("Interstitial '{}' must be located by CSS selector".format(name))
+    INTERSTITIALS[name] = dismiss_locator[1]
+
+
+def registry_script(script):
+    return script % json.dumps(INTERSTITIALS)
+
+
+class InterstitialWatchdog:
+    """Keeps registered interstitials dismissed in pages of the session and counts dismissals."""
+
+    def __init__(self, session, check_interval=CHECK_INTERVAL):
+        self.session = session
+        self.check_interval = check_interval
+        self.dismissed = collections.Counter()
+        self.last_check = 0.0
+        self.installed_registry = None
+        self.script_identifier = None
+
+    @property
+    def driver(self):
+        return self.session.driver
+
+    def reset(self):
+        """Forget observer injected into recycled browser."""
+        self.installed_registry = None
+        self.script_identifier = None
+        self.last_check = 0.0
+
+    def install_at_document_start(self):
+        """Inject observer into every new document (chrome only). Re-injected if registry was changed."""
+        from base.driver import driver_config
+
+        if self.installed_registry == dict(INTERSTITIALS) or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        if driver_config.TRANSPORT['record'] or driver_config.TRANSPORT['replay']:
+            return
+        try:
+            if self.script_identifier:
+                self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument',
+                                            {'identifier': self.script_identifier})
+            result = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                                 {'source': registry_script(OBSERVER_SCRIPT)})
+            self.script_identifier = result.get('identifier')
+        except Exception as e:
+            self.session.logger.warning("Failed to install interstitial watchdog at document start: {}".format(str(e)))
+        self.installed_registry = dict(INTERSTITIALS)
+
+    def check(self, force=False):
+        """Dismiss visible interstitials (observer is installed in the page if it has none).
+        Without force - executed at most once per check_interval, never in record/replay mode.
+        Return dismissals of this check.
+        """
+        from base.driver import driver_config
+
+        if not INTERSTITIALS:
+            return {}
+        if not force and (driver_config.TRANSPORT['record'] or driver_config.TRANSPORT['replay'] or
+                          time.time() - self.last_check < self.check_interval):
+            return {}
+        self.last_check = time.time()
+        self.install_at_document_start()
+        try:
+            counts = self.driver.execute_script(registry_script(CHECK_SCRIPT)) or {}
+        except Exception as e:
+            self.session.logger.info("Interstitial check failed: {}".format(str(e)))
+            return {}
+        if counts:
+            self.dismissed.update(counts)
+            self.session.logger.info("Dismissed interstitials: {}".format(counts))
+        return counts
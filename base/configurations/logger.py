@@ -1,5 +1,6 @@
 """LOGGER MODULE"""
 import logging
+import os
 
 class Logger:
     """
@@ -13,5 +14,9 @@ class Logger:
         LOGGER = logging.getLogger(name)
         LOGGER.setLevel(logging.DEBUG)
         handler = logging.StreamHandler()
+        worker = os.environ.get('TEST_WORKER')
+        if worker:
+            # lines of parallel workers are distinguishable in combined output
+            handler.setFormatter(logging.Formatter('[{}] %(message)s'.format(worker)))
         LOGGER.addHandler(handler)
         self.logger = LOGGER
@@ -0,0 +1,57 @@
+"""Tracker of in-flight fetch/XHR requests and running animations of the page.
+
+Chrome driver installs tracker at document start of every page (see Driver.install_network_tracker),
+so requests, sent while page loads, are counted too. In other browsers tracker is installed by the
+first wait, that needs it (requests, sent before that, are not tracked).
+Used by Waits.wait_for_network_idle and Waits.wait_for_triggered_requests.
+"""
+
+TRACKER_SCRIPT = """
+(function () {
+    if (window.__networkTracker) { return; }
+    var tracker = window.__networkTracker = {pending: 0, started: 0, lastActivity: performance.now()};
+    function begin() { tracker.pending++; tracker.started++; tracker.lastActivity = performance.now(); }
+    function end() { tracker.pending = Math.max(tracker.pending - 1, 0); tracker.lastActivity = performance.now(); }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { end(); return response; },
+                function (error) { end(); throw error; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end);
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# returns state of tracker (installs it, if page was loaded without it)
+STATE_SCRIPT = TRACKER_SCRIPT + """
+var tracker = window.__networkTracker, animations = 0;
+if (document.getAnimations) {
+    animations = document.getAnimations().filter(function (animation) {
+        var timing = animation.effect && animation.effect.getComputedTiming();
+        return animation.playState === 'running' && timing && timing.endTime !== Infinity;
+    }).length;
+}
+return {pending: tracker.pending, started: tracker.started, animations: animations,
+        idle_ms: performance.now() - tracker.lastActivity};
+"""
+
+
+def tracker_state(driver):
+    """Return state of page: {'pending': in-flight requests, 'started': requests started since page load,
+    'animations': running finite animations, 'idle_ms': milliseconds since the last request started or ended}
+    """
+    return driver.execute_script(STATE_SCRIPT)
+
+
+def is_idle(state, quiet_ms, include_animations=True):
+    return (state['pending'] == 0 and state['idle_ms'] >= quiet_ms
+            and (not include_animations or state['animations'] == 0))
@@ -0,0 +1,138 @@
+"""Page performance metrics.
+
+Every navigation of page object (BasePage.goto, navigate_to_login_page) collects metrics of the loaded
+document with one injected script: Navigation Timing, paint timings, Largest Contentful Paint,
+Cumulative Layout Shift and summary of Resource Timing. Records are kept in session.performance.
+
+Budgets are declared per page (values in milliseconds, CLS is unitless):
+
+    self.session.performance.set_budget('LoginPage', lcp=2500, cls=0.1)
+    ...
+    self.session.performance.assert_budgets()
+
+Records are appended to results/performance/metrics.jsonl on session close, so metrics of every run
+build a time series.
+"""
+import json
+import time
+
+from base.configurations.exception import PerformanceBudgetException
+from base.configurations.results import results_path, current_test_name
+
+# LCP and layout shifts are not available through performance.getEntriesByType - they are read by
+# buffered PerformanceObservers, which deliver entries asynchronously.
+COLLECT_SCRIPT = """
+var done = arguments[arguments.length - 1], result = {lcp: null, cls: 0};
+function observe(type, callback) {
+    try { new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+            .observe({type: type, buffered: true}); } catch (e) {}
+}
+observe('largest-contentful-paint', function (entry) { result.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+observe('layout-shift', function (entry) { if (!entry.hadRecentInput) { result.cls += entry.value; } });
+
+var navigation = performance.getEntriesByType('navigation')[0];
+if (navigation) {
+    result.navigation = {ttfb: navigation.responseStart, dom_interactive: navigation.domInteractive,
+                         dom_content_loaded: navigation.domContentLoadedEventEnd, load: navigation.loadEventEnd,
+                         duration: navigation.duration, transfer_size: navigation.transferSize};
+}
+result.paint = {};
+performance.getEntriesByType('paint').forEach(function (entry) { result.paint[entry.name] = entry.startTime; });
+result.resources = performance.getEntriesByType('resource').map(function (entry) {
+    return [entry.name, entry.initiatorType, entry.duration, entry.transferSize || 0];
+});
+setTimeout(function () { done(result); }, arguments[0]);
+"""
+
+OBSERVER_DELAY_MS = 100
+SLOWEST_RESOURCES = 5
+
+METRICS = ('ttfb', 'dom_content_loaded', 'load', 'first_paint', 'fcp', 'lcp', 'cls',
+           'resources_count', 'resources_size')
+
+
+def summarize_resources(resources):
+    by_type = {}
+    for name, initiator_type, duration, size in resources:
+        summary = by_type.setdefault(initiator_type or 'other', {'count': 0, 'size': 0, 'duration': 0.0})
+        summary['count'] += 1
+        summary['size'] += size
+        summary['duration'] = round(summary['duration'] + duration, 1)
+    slowest = sorted(resources, key=lambda resource: resource[2], reverse=True)[:SLOWEST_RESOURCES]
+    return {'count': len(resources), 'size': sum(resource[3] for resource in resources), 'by_type': by_type,
+            'slowest': [[name, round(duration, 1)] for name, _, duration, _ in slowest]}
+
+
+class PerformanceMetrics:
+    """Collected performance records and budgets of the session."""
+
+    def __init__(self, session):
+        self.session = session
+        self.records = []
+        self.budgets = {}
+        self.violations = []
+
+    def set_budget(self, page, **limits):
+        """Declare budget of page.
+        :param page - page object class or its name
+        :param limits - max values of metrics (see METRICS), e.g. lcp=2500, cls=0.1
+        """
+        unknown = set(limits) - set(METRICS)
+        if unknown:
+            raise PerformanceBudgetException("Unknown metrics in budget: {}. Available: {}"
+                                             .format(sorted(unknown), METRICS))
+        self.budgets.setdefault(getattr(page, '__name__', page), {}).update(limits)
+
+    def collect(self, page, url=None):
+        """Collect metrics of currently loaded document and attach record to session."""
+        page = getattr(page, '__name__', page)
+        try:
+            raw = self.session.driver.execute_async_script(COLLECT_SCRIPT, OBSERVER_DELAY_MS)
+        except Exception as e:
+            self.session.logger.warning("Failed to collect performance metrics of '{}': {}".format(page, str(e)))
+            return None
+
+        navigation = raw.get('navigation') or {}
+        resources = summarize_resources(raw.get('resources') or [])
+        metrics = {'ttfb': navigation.get('ttfb'),
+                   'dom_content_loaded': navigation.get('dom_content_loaded'),
+                   'load': navigation.get('load'),
+                   'first_paint': raw['paint'].get('first-paint'),
+                   'fcp': raw['paint'].get('first-contentful-paint'),
+                   'lcp': raw.get('lcp'),
+                   'cls': round(raw.get('cls') or 0, 4),
+                   'resources_count': resources['count'],
+                   'resources_size': resources['size']}
+        metrics = {name: round(value, 1) if isinstance(value, float) and name != 'cls' else value
+                   for name, value in metrics.items()}
+        record = {'timestamp': round(time.time(), 3), 'test': current_test_name(), 'page': page,
+                  'url': url or self.session.driver.current_url, 'metrics': metrics,
+                  'navigation': navigation, 'resources': resources}
+        record['violations'] = self.check(record)
+        self.records.append(record)
+        self.session.logger.info("Performance of '{}': {}".format(page, metrics))
+        return record
+
+    def check(self, record):
+        violations = []
+        for metric, limit in self.budgets.get(record['page'], {}).items():
+            value = record['metrics'].get(metric)
+            if value is not None and value > limit:
+                violation = "{}: {} = {} exceeds budget {}".format(record['page'], metric, value, limit)
+                self.session.logger.warning("Performance budget violated. " + violation)
+                violations.append(violation)
+        self.violations.extend(violations)
+        return violations
+
+    def assert_budgets(self):
+        """Raise PerformanceBudgetException if any collected record exceeded budget of its page."""
+        if self.violations:
+            raise PerformanceBudgetException("Performance budgets violated:\n" + '\n'.join(self.violations))
+
+    def export(self, path=None):
+        """Append records to json lines file (time series of all runs). Return path of the file."""
+        path = path or results_path('performance', 'metrics.jsonl')
+        with open(path, 'a') as metrics_file:
+            for record in self.records:
+                metrics_file.write(json.dumps(record, sort_keys=True) + '\n')
+        return path
@@ -0,0 +1,31 @@
+"""Module that describes where test artifacts (reports, metrics, curves) are stored."""
+import os
+import re
+
+RESULTS_DIR = os.environ.get('RESULTS_DIR', os.path.join(os.getcwd(), 'results'))
+
+
+def results_path(*parts):
+    """Return path inside results directory. Parent directories are created.
+    e.g. results_path('memory', 'test_login.csv')
+    """
+    path = os.path.join(RESULTS_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def current_test_name(default='session'):
+    """Return name of currently running pytest test, safe to use as file name."""
+    test = os.environ.get('PYTEST_CURRENT_TEST', '').split(' ')[0]
+    return re.sub(r'[^\w.-]+', '_', test.split('::', 1)[-1]).strip('_') or default
+
+
+# reports of sessions, closed during the current test (collected by base.runner.result_stream)
+SESSION_REPORTS = []
+
+
+def report_session(step_timings, retry_counts, artifacts, interstitials=None):
+    """Publish step timings, retry counts, artifact paths and dismissed interstitials of closed session
+    to results of the current test."""
+    SESSION_REPORTS.append({'step_timings': list(step_timings), 'retry_counts': dict(retry_counts),
+                            'artifacts': dict(artifacts), 'interstitials': dict(interstitials or {})})
@@ -0,0 +1,56 @@
+"""Step-level retry policy.
+
+Classifies exceptions of interaction steps as transient (stale element, click intercepted by overlay,
+element not yet interactable) or fatal. Transient failures are retried with bounded backoff after
+element is re-resolved from its locator, so a flaky click costs milliseconds instead of a test rerun.
+"""
+import collections
+
+from selenium.common.exceptions import StaleElementReferenceException, ElementClickInterceptedException, \
+    ElementNotInteractableException, InvalidElementStateException, MoveTargetOutOfBoundsException
+
+TRANSIENT_EXCEPTIONS = (StaleElementReferenceException, ElementClickInterceptedException,
+                        ElementNotInteractableException, InvalidElementStateException,
+                        MoveTargetOutOfBoundsException)
+# exceptions, that can not be fixed by retry with the same WebElement (element must be found again)
+REQUIRE_RERESOLVE = (StaleElementReferenceException, )
+
+MAX_RETRIES = 3
+BACKOFF = 0.1
+MAX_BACKOFF = 1.0
+
+
+class RetryPolicy:
+    """Class describes retry policy of interaction steps and collects retry statistics."""
+
+    def __init__(self, max_retries=MAX_RETRIES, backoff=BACKOFF, max_backoff=MAX_BACKOFF,
+                 transient_exceptions=TRANSIENT_EXCEPTIONS):
+        """
+        :param max_retries (int) - max number of retries of one step
+        :param backoff (float) - seconds to wait before first retry. Doubled for every next retry.
+        :param max_backoff (float) - max seconds to wait before retry
+        :param transient_exceptions (tuple) - exception classes, that are retried
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.transient_exceptions = transient_exceptions
+        self.retry_counts = collections.Counter()
+
+    def is_transient(self, exception):
+        return isinstance(exception, self.transient_exceptions)
+
+    def should_retry(self, exception, attempt, reresolvable=True):
+        """Return True if step, failed with exception on attempt (starts from 0), should be retried.
+        :param reresolvable (bool) - False if element is passed as WebElement and can not be found again.
+        """
+        if attempt >= self.max_retries or not self.is_transient(exception):
+            return False
+        return reresolvable or not isinstance(exception, REQUIRE_RERESOLVE)
+
+    def delay(self, attempt):
+        """Seconds to wait before retry of attempt."""
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
+
+    def record(self, locator):
+        self.retry_counts[locator] += 1
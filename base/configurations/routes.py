@@ -0,0 +1,64 @@
+"""Route table module. Describes direct (deep-link) navigation to page objects.
+
+Page object class is registered in ROUTE_TABLE with @route decorator:
+
+    @route("mysettings.html", sentinel=("CSS_SELECTOR", "input#nickname"))
+    class SettingPage(LoginPage):
+        ...
+
+and then is reachable from any page object in a single driver.get:
+
+    self.goto(SettingPage)
+"""
+from urllib.parse import urljoin
+
+from base.configurations.exception import RouteNotFoundException
+
+ROUTE_TIMEOUT = 30
+
+ROUTE_TABLE = {}
+
+
+class Route:
+    """Class describes single entry of the route table."""
+
+    def __init__(self, url_template, sentinel, timeout=ROUTE_TIMEOUT):
+        """
+        :param url_template (str) - absolute url or url relative to session url. May contain
+                                    format fields, e.g. "hotel/{country}/{hotel_id}.html"
+        :param sentinel - locator of element that is of tuple type, which presence means page is ready:
+                          e.g. ("CSS_SELECTOR", ".locator");
+        :param timeout (int) - seconds to wait for sentinel after navigation
+        """
+        self.url_template = url_template
+        self.sentinel = sentinel
+        self.timeout = timeout
+
+    def build_url(self, base_url, **url_params):
+        """Return absolute url of the route.
+        :param base_url (str) - url of the session, relative templates are joined to it.
+        :param url_params - values for format fields of url template.
+        """
+        try:
+            return urljoin(base_url, self.url_template.format(**url_params))
+        except KeyError as e:
+            raise RouteNotFoundException("Missing url parameter {} for route '{}'"
+                                         .format(str(e), self.url_template))
+
+
+def route(url_template, sentinel, timeout=ROUTE_TIMEOUT):
+    """Class decorator, that registers page object class in ROUTE_TABLE."""
+    def register(page_class):
+        ROUTE_TABLE[page_class] = Route(url_template, sentinel, timeout)
+        return page_class
+    return register
+
+
+def get_route(page_class):
+    """Return Route of page object class (or of the nearest registered parent class).
+    Raise RouteNotFoundException if page object has no route.
+    """
+    for klass in page_class.__mro__:
+        if klass in ROUTE_TABLE:
+            return ROUTE_TABLE[klass]
+    raise RouteNotFoundException("No route registered for page object '{}'".format(page_class.__name__))
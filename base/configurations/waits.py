@@ -4,12 +4,17 @@ Describes all wait methods.
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.support import expected_conditions as ec
+import contextlib
 from base.configurations.exception import *
 from base.configurations.element import Element
+from base.configurations.network_tracker import tracker_state, is_idle
 
 
 TIMEOUT = 30
 POLL_FREQUENCY = 0.5
+NETWORK_POLL_FREQUENCY = 0.1
+QUIET_MS = 500
+REQUEST_START_TIMEOUT = 1
 
 
 class Waits:
@@ -34,7 +39,10 @@ class Waits:
         """
         self.session = session
         self.logger = session.logger
-        self.driver = session.driver
+
+    @property
+    def driver(self):
+        return self.session.driver
 
     def wait_for_web_element_visible(self, element, el_description='',
                                      timeout=TIMEOUT,  poll_frequency=POLL_FREQUENCY,
@@ -295,3 +303,45 @@ class Waits:
                 raise FlowFailedException("Alert is not present. Waited for '{0}' seconds."
                                           .format(timeout))
             return False
+
+    def wait_for_network_idle(self, quiet_ms=QUIET_MS, timeout=TIMEOUT, include_animations=True,
+                              raise_exception=True):
+        """ Wait until page has no in-flight fetch/XHR requests (and no running animations) for quiet_ms.
+            See base.configurations.network_tracker.
+            param: quiet_ms (int): milliseconds without network activity, after which page is idle
+            param: include_animations (bool): if True - running finite animations also keep page busy
+            param: raise_exception (bool): whether to raise an exception when expected condition
+            not met or not.
+        Returns: True - if page is idle.
+        """
+        self.logger.info("Waiting for network idle ({} ms)".format(quiet_ms))
+        try:
+            return WebDriverWait(self.driver, timeout, NETWORK_POLL_FREQUENCY).until(
+                lambda driver: is_idle(tracker_state(driver), quiet_ms, include_animations))
+        except TimeoutException:
+            if raise_exception:
+                raise FlowFailedException("Page is not idle: {}. Waited for '{}' seconds."
+                                          .format(tracker_state(self.driver), timeout))
+            return False
+
+    @contextlib.contextmanager
+    def wait_for_triggered_requests(self, quiet_ms=QUIET_MS, timeout=TIMEOUT, start_timeout=REQUEST_START_TIMEOUT,
+                                    include_animations=True, raise_exception=True):
+        """ Context manager: wait for requests, triggered by actions inside of the block, to finish.
+            If no request was started within start_timeout after the block - waits only for animations.
+            With raise_exception=False page, that never becomes idle (e.g. analytics beacons), is waited for
+            timeout only.
+            e.g.
+                with self.waits.wait_for_triggered_requests():
+                    self.action.click(self.calendar_next)
+            param: start_timeout (float): seconds to wait for the first request to start
+        """
+        started_before = tracker_state(self.driver)['started']
+        yield
+        try:
+            WebDriverWait(self.driver, start_timeout, NETWORK_POLL_FREQUENCY).until(
+                lambda driver: tracker_state(driver)['started'] > started_before)
+        except TimeoutException:
+            quiet_ms = 0
+        self.wait_for_network_idle(quiet_ms=quiet_ms, timeout=timeout, include_animations=include_animations,
+                                   raise_exception=raise_exception)
@@ -1,32 +1,246 @@
 """Module that describes driver"""
+import os
+import time
+
 from selenium import webdriver
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
 from base.driver import driver_config
 
+
+class ServiceChrome(webdriver.Remote):
+    """Chrome session of shared driver service (see base.driver.driver_service) with devtools commands."""
+
+    def __init__(self, service_url, desired_capabilities):
+        super().__init__(command_executor=ChromeRemoteConnection(remote_server_addr=service_url, keep_alive=True),
+                         desired_capabilities=desired_capabilities)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute('executeCdpCommand', {'cmd': cmd, 'params': cmd_args})['value']
+
+
 class Driver:
     """
     Class which represents selenium web driver
     """
 
-    def __init__(self, browser, logger):
+    def __init__(self, browser, logger, user_data_dir=None):
         """
         :param (str) browser: browser type (e.g "Chrome")
-        :param args:
-        :param kwargs:
+        :param (str) user_data_dir: profile directory to start browser with. If None - clone of
+                                    profile template (see base.driver.profile_template) or empty profile.
         """
         self.logger = logger
-        self.init_driver(browser.lower())
+        self.browser = browser.lower()
+        self.governor = None
+        self.user_data_dir = user_data_dir
+        self.profile_clone = None
+        self.service = None
+        self.recording_segment = 0      # recycled browser is recorded to / replayed from the next segment
+        self.startup = {}       # seconds, spent on driver service ('service') and browser launch ('browser')
+        try:
+            self.init_driver(self.browser)
+        except Exception:
+            self.remove_profile_clone()
+            self.release_service()
+            raise
+
+        if driver_config.MEMORY_GOVERNOR['enabled']:
+            self.start_memory_governor()
+
+    def start_memory_governor(self):
+        """Start sampling memory of driver process tree (requires psutil)."""
+        try:
+            from base.driver.memory_governor import MemoryGovernor
+        except ImportError:
+            self.logger.warning("psutil is not installed. Browser memory governor is disabled")
+            return
+        self.governor = MemoryGovernor(self, self.logger)
+        self.governor.start()
 
     def init_driver(self, browser):
         """_"""
-        if 'chrome' in browser:
-            self.driver = webdriver.Chrome(
-                executable_path=driver_config.CONFIG[browser]['path_to_driver'],
-                desired_capabilities=driver_config.CONFIG[browser]['settings'])
+        user_data_dir = self.user_data_dir or self.clone_profile_template()
+        if driver_config.TRANSPORT['replay']:
+            from base.driver.transport import replay_driver, recording_path
+            from base.configurations.results import current_test_name
+            self.driver = replay_driver(recording_path(driver_config.TRANSPORT['replay'], current_test_name(),
+                                                       self.recording_segment))
+            self.logger.info("Selenium web driver replays recorded session")
+
+        elif 'chrome' in browser:
+            capabilities = driver_config.CONFIG[browser]['settings']
+            if driver_config.HEADLESS:
+                capabilities = self.add_arguments(capabilities, 'goog:chromeOptions', '--headless')
+            if user_data_dir:
+                from base.driver.profile_template import FIRST_RUN_ARGS
+                capabilities = self.add_arguments(capabilities, 'goog:chromeOptions',
+                                                  '--user-data-dir={}'.format(user_data_dir), *FIRST_RUN_ARGS['chrome'])
+            if self.network_capture_enabled:
+                from base.driver.network_capture import enable_performance_logging
+                capabilities = enable_performance_logging(capabilities)
+            self.driver = self.launch_browser(browser, 'chrome', capabilities)
         elif 'firefox' in browser:
-            self.driver = webdriver.Firefox(
-                executable_path=driver_config.CONFIG[browser]['path_to_driver'],
-                desired_capabilities=driver_config.CONFIG[browser]['settings'])
+            capabilities = driver_config.CONFIG[browser]['settings']
+            if driver_config.HEADLESS:
+                capabilities = self.add_arguments(capabilities, 'moz:firefoxOptions', '-headless')
+            if user_data_dir:
+                capabilities = self.add_arguments(capabilities, 'moz:firefoxOptions', '-profile', user_data_dir)
+            self.driver = self.launch_browser(browser, 'firefox', capabilities)
+
+        if driver_config.TRANSPORT['record']:
+            from base.driver.transport import RecordingConnection, recording_path
+            from base.configurations.results import current_test_name
+            path = recording_path(driver_config.TRANSPORT['record'], current_test_name(), self.recording_segment)
+            self.driver.command_executor = RecordingConnection(self.driver.command_executor, path, self.driver)
+            self.logger.info("Webdriver commands are recorded to: {}".format(path))
 
+        self.install_network_tracker()
         self.driver.maximize_window()
-        self.logger.info("Selenium web driver was initialized")
+        self.logger.info("Selenium web driver was initialized{}".format(
+            " (driver service: {service:.3f} s, browser: {browser:.3f} s)".format(**self.startup)
+            if self.startup.get('service') is not None else ''))
+
+    def launch_browser(self, browser, browser_type, capabilities):
+        """Start browser session. Return webdriver.
+        With shared driver services - as webdriver.Remote session of running service, otherwise -
+        selenium spawns driver service for this browser only (its time is part of browser launch then).
+        """
+        path_to_driver = driver_config.CONFIG[browser]['path_to_driver']
+        start = time.perf_counter()
+        if not driver_config.DRIVER_SERVICE['enabled']:
+            driver_class = webdriver.Chrome if browser_type == 'chrome' else webdriver.Firefox
+            driver = driver_class(executable_path=path_to_driver, desired_capabilities=capabilities)
+            self.startup = {'service': None, 'browser': time.perf_counter() - start}
+            return driver
+
+        from base.driver.driver_service import DRIVER_SERVICES
+        self.service = DRIVER_SERVICES.acquire(browser_type, path_to_driver, self.logger)
+        service_ready = time.perf_counter()
+        try:
+            if browser_type == 'chrome':
+                driver = ServiceChrome(self.service.url, capabilities)
+            else:
+                driver = webdriver.Remote(command_executor=self.service.url, desired_capabilities=capabilities)
+        except Exception:
+            self.release_service()
+            raise
+        self.startup = {'service': service_ready - start, 'browser': time.perf_counter() - service_ready}
+        return driver
+
+    def release_service(self):
+        if self.service:
+            from base.driver.driver_service import DRIVER_SERVICES
+            DRIVER_SERVICES.release(self.service)
+            self.service = None
+
+    @staticmethod
+    def add_arguments(capabilities, options_key, *arguments):
+        """Return copy of capabilities with arguments added to browser options."""
+        capabilities = dict(capabilities)
+        options = dict(capabilities.get(options_key, {}))
+        options['args'] = list(options.get('args', [])) + list(arguments)
+        capabilities[options_key] = options
+        return capabilities
+
+    def clone_profile_template(self):
+        """Return directory of fresh clone of profile template, or None if templates are disabled."""
+        if driver_config.TRANSPORT['replay']:
+            return None
+        from base.driver.profile_template import get_template
+        template = get_template(self.browser, self.logger)
+        if template:
+            self.profile_clone = template.clone()
+        return self.profile_clone
+
+    def remove_profile_clone(self):
+        if self.profile_clone:
+            from base.driver.profile_template import ProfileTemplate
+            ProfileTemplate.remove_clone(self.profile_clone)
+            self.profile_clone = None
+
+    def navigation_timings(self, urls):
+        """Open urls one by one. Return seconds, spent on every navigation: {url: seconds}."""
+        timings = {}
+        for url in urls:
+            start = time.perf_counter()
+            self.driver.get(url)
+            timings[url] = round(time.perf_counter() - start, 3)
+            self.logger.info("First navigation to '{}' took {} seconds".format(url, timings[url]))
+        return timings
+
+    @property
+    def network_capture_enabled(self):
+        """True if network of this driver can be captured (chrome, not in record/replay mode)."""
+        return bool(driver_config.NETWORK_CAPTURE['enabled'] and 'chrome' in self.browser
+                    and not driver_config.TRANSPORT['record'] and not driver_config.TRANSPORT['replay'])
+
+    def start_network_capture(self):
+        """Start background capture of network events to HAR file of the current test. Return capture or None."""
+        if not self.network_capture_enabled:
+            return None
+        from base.driver.network_capture import NetworkCapture
+        capture = NetworkCapture(self.driver, self.logger, poll_interval=driver_config.NETWORK_CAPTURE['poll_interval'])
+        capture.start()
+        return capture
+
+    def install_network_tracker(self):
+        """Install tracker of fetch/XHR requests at document start of every page (chrome only).
+        In other browsers it is installed by the first network wait (see base.configurations.network_tracker).
+        """
+        if 'chrome' not in self.browser or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        if driver_config.TRANSPORT['record'] or driver_config.TRANSPORT['replay']:
+            # replay driver has no devtools commands, recordings must not depend on them
+            return
+        from base.configurations.network_tracker import TRACKER_SCRIPT
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': TRACKER_SCRIPT})
+        except Exception as e:
+            self.logger.warning("Failed to install network tracker at document start: {}".format(str(e)))
+
+    def process_ids(self):
+        """Return pids of root processes of the driver (driver service, that spawned browser).
+        Shared driver service hosts browsers of other sessions as well, so then only processes of
+        this browser are returned (found by its user data directory in chrome, by process id in firefox).
+        """
+        if self.service:
+            capabilities = self.driver.capabilities
+            if capabilities.get('moz:processID'):
+                return [capabilities['moz:processID']]
+            return self.service.browser_process_ids(capabilities.get('chrome', {}).get('userDataDir'))
+        service = getattr(self.driver, 'service', None)
+        process = getattr(service, 'process', None)
+        return [process.pid] if process else []
+
+    @property
+    def needs_recycle(self):
+        if driver_config.TRANSPORT['replay']:
+            # recorded browser was recycled here, if recording has the next segment after its quit
+            from base.driver.transport import recording_path
+            from base.configurations.results import current_test_name
+            return bool(getattr(self.driver.command_executor, 'at_quit', False) and os.path.exists(
+                recording_path(driver_config.TRANSPORT['replay'], current_test_name(), self.recording_segment + 1)))
+        return bool(self.governor and self.governor.over_threshold)
+
+    def recycle(self):
+        """Quit bloated browser and start a new one of the same type."""
+        self.logger.info("Recycling selenium web driver")
+        self.driver.quit()
+        self.remove_profile_clone()
+        self.release_service()
+        self.recording_segment += 1
+        self.init_driver(self.browser)
+        if self.governor:
+            self.governor.sample(event='recycled')
+            self.governor.reset()
 
+    def quit(self):
+        """Stop memory governor and quit browser."""
+        if self.governor:
+            self.governor.stop()
+            self.governor.sample(event='quit')
+        try:
+            self.driver.quit()
+        finally:
+            self.remove_profile_clone()
+            self.release_service()
@@ -1,4 +1,6 @@
 """Module for driver config"""
+import os
+
 CONFIG = {
 
     'chrome': {
@@ -52,3 +54,39 @@ CONFIG = {
                 }
     }
 }
+
+# headless browsers (load mode of base.runner.load enables it)
+HEADLESS = bool(os.environ.get('HEADLESS'))
+
+# pre-warmed profile templates (see base.driver.profile_template)
+PROFILE_TEMPLATE = {
+    'enabled': bool(os.environ.get('PROFILE_TEMPLATE')),
+    'directory': os.environ.get('PROFILE_TEMPLATE_DIR'),   # None - results/profiles/<browser>
+    'warm_urls': [url for url in os.environ.get('PROFILE_TEMPLATE_URLS', '').split(',') if url],
+    'max_age': 24 * 60 * 60,    # seconds, after which template is reported as stale
+}
+
+# long-lived driver services, shared by sessions of worker process (see base.driver.driver_service)
+DRIVER_SERVICE = {
+    'enabled': bool(os.environ.get('DRIVER_SERVICE')),
+}
+
+# memory governor (see base.driver.memory_governor), requires psutil
+MEMORY_GOVERNOR = {
+    'enabled': bool(os.environ.get('MEMORY_GOVERNOR')),
+    'threshold_mb': 2048,       # RSS of driver + browser process tree, after which driver is recycled
+    'sample_interval': 5,       # seconds
+}
+
+# record-and-replay of webdriver commands (see base.driver.transport):
+# directories with one recording file per test
+TRANSPORT = {
+    'record': os.environ.get('WEBDRIVER_RECORD'),
+    'replay': os.environ.get('WEBDRIVER_REPLAY'),
+}
+
+# streaming network capture from chrome performance logs (see base.driver.network_capture)
+NETWORK_CAPTURE = {
+    'enabled': bool(os.environ.get('NETWORK_CAPTURE')),
+    'poll_interval': 1,         # seconds between drains of browser performance log
+}
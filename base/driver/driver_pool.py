@@ -0,0 +1,87 @@
+"""Pool of pre-spawned drivers.
+
+Runner (see base.run) starts launching browsers in background while tests are collected,
+so the first session gets a ready browser instead of waiting for its launch.
+Selenium is imported in background thread as well, only when first driver is spawned.
+"""
+import threading
+import time
+
+
+class DriverPool:
+    """Class describes pool of drivers, launched in background threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.spawning = {}      # browser -> list of threads, which launch drivers
+        self.ready = {}         # browser -> list of launched Driver objects
+        self.errors = []
+        self.stats = {'selenium_import': 0.0, 'browser_launches': [], 'acquire_waits': []}
+
+    def prespawn(self, browser, logger, count=1):
+        """Start launching :count: drivers of specified browser in background."""
+        from base.driver import driver_config
+        if driver_config.TRANSPORT['record'] or driver_config.TRANSPORT['replay']:
+            # recordings are stored per test, so driver must be started inside of the test
+            logger.info("Drivers are not pre-spawned in record/replay mode")
+            return
+        browser = browser.lower()
+        for _ in range(count):
+            thread = threading.Thread(target=self.spawn, args=(browser, logger),
+                                      name='prespawn-{}'.format(browser), daemon=True)
+            with self.lock:
+                self.spawning.setdefault(browser, []).append(thread)
+            thread.start()
+
+    def spawn(self, browser, logger):
+        start = time.perf_counter()
+        try:
+            from base.driver.driver import Driver
+            imported = time.perf_counter()
+            with self.lock:
+                self.stats['selenium_import'] = max(self.stats['selenium_import'], imported - start)
+            driver = Driver(browser, logger)
+            with self.lock:
+                # spawn of shared driver service is reported separately (see base.driver.driver_service)
+                self.stats['browser_launches'].append(time.perf_counter() - imported - (driver.startup.get('service') or 0))
+                self.ready.setdefault(browser, []).append(driver)
+        except Exception as e:
+            logger.warning("Failed to pre-spawn '{}' driver: {}".format(browser, str(e)))
+            with self.lock:
+                self.errors.append(e)
+        finally:
+            with self.lock:
+                self.spawning[browser].remove(threading.current_thread())
+
+    def acquire(self, browser, logger):
+        """Return pre-spawned driver (wait for one being launched, if any) or launch a new one."""
+        browser = browser.lower()
+        start = time.perf_counter()
+        while True:
+            with self.lock:
+                if self.ready.get(browser):
+                    driver = self.ready[browser].pop(0)
+                    break
+                in_flight = list(self.spawning.get(browser, []))
+            if not in_flight:
+                from base.driver.driver import Driver
+                return Driver(browser, logger)
+            in_flight[0].join()
+
+        self.stats['acquire_waits'].append(time.perf_counter() - start)
+        driver.logger = logger
+        if driver.governor:
+            driver.governor.logger = logger
+        return driver
+
+    def shutdown(self):
+        """Quit drivers, that were spawned but not used."""
+        for thread in [thread for threads in list(self.spawning.values()) for thread in threads]:
+            thread.join()
+        for drivers in self.ready.values():
+            for driver in drivers:
+                driver.quit()
+        self.ready.clear()
+
+
+DRIVER_POOL = DriverPool()
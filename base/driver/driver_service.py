@@ -0,0 +1,211 @@
+"""Shared driver services.
+
+Without it every Driver lets selenium spawn its own chromedriver/geckodriver process and wait for
+its port before the browser is even launched. With DRIVER_SERVICE enabled (see driver_config), driver
+service processes are started once per worker process and kept alive: new sessions are created with
+webdriver.Remote against URL of a running service. Services are health checked (process is alive and
+answers /status) before every session: dead ones are restarted, busy ones (alive, but did not answer in
+time) are left to sessions running in them and another service is spawned. Chromedriver hosts any number of
+sessions, geckodriver - one session at a time, so firefox gets a service per concurrent session.
+
+Spawn time of services is kept in DRIVER_SERVICES.stats (browser launch time is measured separately
+by Driver), both are printed in startup breakdown of base.run.
+"""
+import atexit
+import json
+import socket
+import subprocess
+import threading
+import time
+import urllib.request
+
+START_TIMEOUT = 20
+HEALTH_TIMEOUT = 1
+
+# browser -> (command line arguments of driver service, max sessions per service process (None - unlimited))
+SERVICE_ARGUMENTS = {
+    'chrome': (lambda port: ['--port={}'.format(port)], None),
+    'firefox': (lambda port: ['--port', str(port)], 1),
+}
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+class DriverService:
+    """Long-lived driver service process (chromedriver/geckodriver)."""
+
+    def __init__(self, browser, path_to_driver, logger, start_timeout=START_TIMEOUT, health_timeout=HEALTH_TIMEOUT):
+        self.browser = browser
+        self.path_to_driver = path_to_driver
+        self.logger = logger
+        self.start_timeout = start_timeout
+        self.health_timeout = health_timeout
+        self.arguments, self.max_sessions = SERVICE_ARGUMENTS[browser]
+        self.process = None
+        self.port = None
+        self.sessions = 0
+        self.lock = threading.Lock()        # serializes (re)start of this service
+        self.started = threading.Event()    # set, when the first start finished (successfully or not)
+        self.error = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.port)
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    @property
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def has_capacity(self):
+        return self.max_sessions is None or self.sessions < self.max_sessions
+
+    def start(self):
+        """Spawn service process and wait until it answers. Return seconds spent."""
+        start = time.perf_counter()
+        self.port = free_port()
+        self.process = subprocess.Popen([self.path_to_driver] + self.arguments(self.port),
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        while not self.is_healthy():
+            if self.process.poll() is not None or time.perf_counter() - start > self.start_timeout:
+                self.stop()
+                raise RuntimeError("Driver service '{}' did not start in {} seconds".format(
+                    self.path_to_driver, self.start_timeout))
+            time.sleep(0.05)
+        spawn_time = time.perf_counter() - start
+        self.logger.info("Driver service '{}' started at {} in {:.3f} seconds".format(
+            self.browser, self.url, spawn_time))
+        return spawn_time
+
+    def is_healthy(self):
+        """True if service process is alive and answers status request."""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(self.url + '/status', timeout=self.health_timeout) as response:
+                json.loads(response.read().decode('utf-8'))
+            return True
+        except Exception:
+            return False
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def browser_process_ids(self, marker):
+        """Return pids of child processes of the service, that belong to one browser session:
+        command line of the process contains marker (e.g. user data directory of the session).
+        """
+        import psutil
+
+        try:
+            children = psutil.Process(self.pid).children()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            return []
+        pids = []
+        for child in children:
+            try:
+                if marker and any(marker in argument for argument in child.cmdline()):
+                    pids.append(child.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return pids
+
+
+class ServicePool:
+    """Class describes driver services of this process, shared by sessions."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.services = {}      # browser -> list of DriverService
+        self.stats = {'service_spawns': [], 'restarts': 0}
+        self.exit_handler_registered = False
+
+    def acquire(self, browser, path_to_driver, logger):
+        """Return healthy service with free capacity. Service must be given back by release().
+        Dead service (its process exited) is restarted. Service, that is alive but did not answer health
+        check (e.g. busy under load), is never stopped - browsers of other sessions run in it - new service
+        is spawned instead. Services are spawned outside of the pool lock.
+        """
+        skipped = []
+        while True:
+            spawn = False
+            with self.lock:
+                services = self.services.setdefault(browser, [])
+                service = next((service for service in services
+                                if service.has_capacity and service not in skipped), None)
+                if service is None:
+                    service = DriverService(browser, path_to_driver, logger)
+                    services.append(service)
+                    spawn = True
+                service.sessions += 1
+                if not self.exit_handler_registered:
+                    atexit.register(self.shutdown)
+                    self.exit_handler_registered = True
+
+            if spawn:
+                self.start_service(service)
+                return service
+
+            service.started.wait()
+            if service.error is None and service.is_healthy():
+                return service
+            with service.lock:
+                # the first session, which found service dead, restarts it
+                if service.error is None and not service.is_alive:
+                    logger.warning("Driver service '{}' at {} is dead. Restarting it".format(browser, service.url))
+                    service.stop()
+                    self.start_service(service, restart=True)
+                    return service
+            if service.error is None and service.is_healthy():
+                return service      # restarted by another session meanwhile
+            logger.warning("Driver service '{}' at {} did not answer health check. Spawning another one"
+                           .format(browser, service.url))
+            self.release(service)
+            skipped.append(service)
+
+    def start_service(self, service, restart=False):
+        """Start service (outside of pool lock). Failed service is removed from the pool."""
+        try:
+            spawn_time = service.start()
+        except Exception as e:
+            service.error = e
+            with self.lock:
+                service.sessions = max(service.sessions - 1, 0)
+                if service in self.services.get(service.browser, []):
+                    self.services[service.browser].remove(service)
+            raise
+        finally:
+            service.started.set()
+        with self.lock:
+            self.stats['service_spawns'].append(spawn_time)
+            if restart:
+                self.stats['restarts'] += 1
+
+    def release(self, service):
+        with self.lock:
+            service.sessions = max(service.sessions - 1, 0)
+
+    def shutdown(self):
+        """Stop all service processes."""
+        with self.lock:
+            for services in self.services.values():
+                for service in services:
+                    service.stop()
+            self.services.clear()
+
+
+DRIVER_SERVICES = ServicePool()
@@ -0,0 +1,88 @@
+"""Browser memory governor.
+
+Samples RSS of the driver process tree (driver service, browser and all its child processes; only
+browser processes of the session, if driver service is shared - see Driver.process_ids) in
+background, flags sessions which crossed configured threshold, so they are recycled at the next
+safe point (see SeleniumSession.safe_point), and exports per-session memory curve.
+Governor is enabled with MEMORY_GOVERNOR environment variable (see driver_config) and requires psutil.
+"""
+import csv
+import threading
+import time
+
+import psutil
+
+from base.driver import driver_config
+
+
+class MemoryGovernor:
+    """Class describes memory watcher of one Driver."""
+
+    def __init__(self, driver, logger, threshold_mb=None, sample_interval=None):
+        """
+        :param driver (Driver) - driver to watch. Its process_ids() are roots of sampled process tree.
+        :param threshold_mb (int) - RSS in megabytes, after which driver is flagged for recycling.
+                                    If None - driver_config.MEMORY_GOVERNOR['threshold_mb']
+        :param sample_interval (float) - seconds between samples.
+                                    If None - driver_config.MEMORY_GOVERNOR['sample_interval']
+        """
+        self.driver = driver
+        self.logger = logger
+        if threshold_mb is None:
+            threshold_mb = driver_config.MEMORY_GOVERNOR['threshold_mb']
+        if sample_interval is None:
+            sample_interval = driver_config.MEMORY_GOVERNOR['sample_interval']
+        self.threshold_mb = threshold_mb
+        self.sample_interval = sample_interval
+        self.samples = []
+        self.over_threshold = False
+        self.started = time.time()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.watch, name='memory-governor', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=self.sample_interval)
+            self.thread = None
+
+    def watch(self):
+        while not self.stopped.is_set():
+            self.sample()
+            self.stopped.wait(self.sample_interval)
+
+    def sample(self, event=''):
+        """Measure RSS of the process tree and store it as a point of memory curve. Return RSS in MB."""
+        rss = 0
+        for pid in self.driver.process_ids():
+            try:
+                root = psutil.Process(pid)
+                for process in [root] + root.children(recursive=True):
+                    rss += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        rss_mb = rss / 1024 / 1024
+        self.samples.append((round(time.time() - self.started, 2), round(rss_mb, 1), event))
+        if rss_mb > self.threshold_mb and not self.over_threshold:
+            self.over_threshold = True
+            self.logger.warning("Browser memory {:.0f} MB crossed threshold {} MB. Driver will be recycled "
+                                "at the next safe point".format(rss_mb, self.threshold_mb))
+        return rss_mb
+
+    def reset(self):
+        """Reset flag after driver was recycled. Memory curve is kept."""
+        self.over_threshold = False
+
+    def export(self, path):
+        """Write memory curve to csv file."""
+        with open(path, 'w', newline='') as curve_file:
+            writer = csv.writer(curve_file)
+            writer.writerow(['elapsed_s', 'rss_mb', 'event'])
+            writer.writerows(self.samples)
+        self.logger.info("Memory curve was exported to: {}".format(path))
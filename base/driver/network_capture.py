@@ -0,0 +1,235 @@
+"""Streaming network capture (HAR) from Chrome performance logs.
+
+With NETWORK_CAPTURE enabled (see driver_config), chrome is started with performance logging, and
+background consumer of the session drains DevTools Network.* events during the test. Every finished
+request is written to results/network/<test>.har as soon as it completes, so the capture is never
+held in memory. Requests are attributed to page object steps (session.mark_step is called on page
+object creation and navigation), slowest and largest requests of every step are summarized in
+results/network/<test>.summary.json.
+
+    NETWORK_CAPTURE=1 pytest projects/booking/tests
+"""
+import heapq
+import itertools
+import json
+import threading
+import time
+
+from base.configurations.results import results_path, current_test_name
+
+LOG_TYPE = 'performance'
+POLL_INTERVAL = 1
+TOP_REQUESTS = 5
+
+
+def enable_performance_logging(capabilities):
+    """Return copy of chrome capabilities with performance (DevTools Network) logging enabled."""
+    capabilities = dict(capabilities)
+    prefs = {LOG_TYPE: 'ALL'}
+    capabilities['loggingPrefs'] = dict(capabilities.get('loggingPrefs', {}), **prefs)
+    capabilities['goog:loggingPrefs'] = dict(capabilities.get('goog:loggingPrefs', {}), **prefs)
+    options = dict(capabilities.get('goog:chromeOptions', {}))
+    options['perfLoggingPrefs'] = {'enableNetwork': True, 'enablePage': False}
+    capabilities['goog:chromeOptions'] = options
+    return capabilities
+
+
+def timing_phases(timing, finished_timestamp=None):
+    """Convert DevTools ResourceTiming of response to HAR timings (milliseconds, -1 if not applicable)."""
+    if not timing:
+        return {'blocked': -1, 'dns': -1, 'connect': -1, 'ssl': -1, 'send': 0, 'wait': 0, 'receive': 0}
+
+    def phase(start, end):
+        return round(timing[end] - timing[start], 3) if timing.get(start, -1) >= 0 else -1
+
+    first_phase = next((timing[name] for name in ('dnsStart', 'connectStart', 'sendStart') if timing.get(name, -1) >= 0), 0)
+    receive = 0
+    if finished_timestamp:
+        receive = max(round((finished_timestamp - timing['requestTime']) * 1000 - timing['receiveHeadersEnd'], 3), 0)
+    return {'blocked': round(first_phase, 3),
+            'dns': phase('dnsStart', 'dnsEnd'),
+            'connect': phase('connectStart', 'connectEnd'),
+            'ssl': phase('sslStart', 'sslEnd'),
+            'send': max(phase('sendStart', 'sendEnd'), 0),
+            'wait': max(round(timing['receiveHeadersEnd'] - timing['sendEnd'], 3), 0),
+            'receive': receive}
+
+
+def har_headers(headers):
+    return [{'name': name, 'value': str(value)} for name, value in (headers or {}).items()]
+
+
+class HarWriter:
+    """Writes HAR file incrementally: entries are appended as they complete, pages are written on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w')
+        self.file.write('{"log": {"version": "1.2", "creator": {"name": "pythonFrameworkF_easy", "version": "1.0"}, '
+                        '"entries": [\n')
+        self.count = 0
+
+    def write_entry(self, entry):
+        self.file.write((',\n' if self.count else '') + json.dumps(entry))
+        self.count += 1
+        self.file.flush()
+
+    def close(self, pages):
+        if not self.file.closed:
+            self.file.write('\n], "pages": {}}}}}\n'.format(json.dumps(pages)))
+            self.file.close()
+
+
+class StepSummary:
+    """Slowest and largest requests of one page object step (only top N are kept)."""
+
+    def __init__(self, name, started, page_id):
+        """
+        :param page_id (str) - unique id of HAR page of the step (the same step name may repeat in session)
+        """
+        self.name = name
+        self.started = started
+        self.page_id = page_id
+        self.requests = 0
+        self.bytes = 0
+        self.slowest = []
+        self.largest = []
+        self.counter = itertools.count()
+
+    def add(self, url, duration, size):
+        self.requests += 1
+        self.bytes += size
+        for heap, value in ((self.slowest, duration), (self.largest, size)):
+            item = (value, next(self.counter), url)
+            if len(heap) < TOP_REQUESTS:
+                heapq.heappush(heap, item)
+            else:
+                heapq.heappushpop(heap, item)
+
+    def as_dict(self):
+        return {'step': self.name, 'page': self.page_id, 'requests': self.requests, 'bytes': self.bytes,
+                'slowest': [[url, round(value, 1)] for value, _, url in sorted(self.slowest, reverse=True)],
+                'largest': [[url, value] for value, _, url in sorted(self.largest, reverse=True)]}
+
+
+class NetworkCapture:
+    """Background consumer of DevTools network events of one session."""
+
+    def __init__(self, driver, logger, name=None, poll_interval=POLL_INTERVAL):
+        """
+        :param driver - selenium web driver, started with performance logging (enable_performance_logging)
+        :param name (str) - base name of capture files. If None - name of the current test.
+        """
+        self.driver = driver
+        self.logger = logger
+        self.poll_interval = poll_interval
+        name = name or current_test_name()
+        self.har_path = results_path('network', '{}.har'.format(name))
+        self.summary_path = results_path('network', '{}.summary.json'.format(name))
+        self.har = HarWriter(self.har_path)
+        self.in_flight = {}
+        self.steps = [StepSummary('session start', time.time(), 'page_0')]
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        # events of previous sessions of pre-spawned browser are not part of this capture
+        self.driver.get_log(LOG_TYPE)
+        self.thread = threading.Thread(target=self.consume, name='network-capture', daemon=True)
+        self.thread.start()
+        self.logger.info("Network is captured to: {}".format(self.har_path))
+
+    def mark_step(self, name):
+        """Start new page object step. Requests sent after this moment are attributed to it."""
+        with self.lock:
+            if self.steps[-1].name != name:
+                self.steps.append(StepSummary(name, time.time(), 'page_{}'.format(len(self.steps))))
+
+    def consume(self):
+        while not self.stopped.wait(self.poll_interval):
+            self.drain()
+
+    def drain(self):
+        try:
+            messages = self.driver.get_log(LOG_TYPE)
+        except Exception as e:
+            self.logger.warning("Failed to read browser performance log: {}".format(str(e)))
+            return
+        with self.lock:
+            for message in messages:
+                event = json.loads(message['message'])['message']
+                self.handle(event['method'], event.get('params', {}))
+
+    def handle(self, method, params):
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            if request_id in self.in_flight and params.get('redirectResponse'):
+                # redirect finishes previous request of the same id
+                request = self.in_flight.pop(request_id)
+                request['response'] = params['redirectResponse']
+                self.finish(request, params['timestamp'], params['redirectResponse'].get('encodedDataLength', 0))
+            self.in_flight[request_id] = {'request': params['request'], 'wall_time': params['wallTime'],
+                                          'timestamp': params['timestamp'], 'response': None, 'size': 0}
+        elif request_id not in self.in_flight:
+            return
+        elif method == 'Network.responseReceived':
+            self.in_flight[request_id]['response'] = params['response']
+        elif method == 'Network.dataReceived':
+            self.in_flight[request_id]['size'] += params.get('encodedDataLength', 0)
+        elif method == 'Network.loadingFinished':
+            request = self.in_flight.pop(request_id)
+            self.finish(request, params['timestamp'], params.get('encodedDataLength', request['size']))
+        elif method == 'Network.loadingFailed':
+            request = self.in_flight.pop(request_id)
+            request['error'] = params.get('errorText')
+            self.finish(request, params['timestamp'], request['size'])
+
+    def step_of(self, wall_time):
+        for step in reversed(self.steps):
+            if step.started <= wall_time:
+                return step
+        return self.steps[0]
+
+    def finish(self, request, finished_timestamp, size):
+        response = request['response'] or {}
+        timings = timing_phases(response.get('timing'), finished_timestamp)
+        duration = round((finished_timestamp - request['timestamp']) * 1000, 3)
+        step = self.step_of(request['wall_time'])
+        step.add(request['request']['url'], duration, size)
+        self.har.write_entry({
+            'pageref': step.page_id,
+            'startedDateTime': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(request['wall_time']))
+                               + '.{:03d}Z'.format(int(request['wall_time'] % 1 * 1000)),
+            'time': duration,
+            'request': {'method': request['request']['method'], 'url': request['request']['url'],
+                        'httpVersion': response.get('protocol', ''), 'headers': har_headers(request['request'].get('headers')),
+                        'queryString': [], 'cookies': [], 'headersSize': -1, 'bodySize': -1},
+            'response': {'status': response.get('status', 0), 'statusText': response.get('statusText', request.get('error', '')),
+                         'httpVersion': response.get('protocol', ''), 'headers': har_headers(response.get('headers')),
+                         'cookies': [], 'content': {'size': size, 'mimeType': response.get('mimeType', '')},
+                         'redirectURL': '', 'headersSize': -1, 'bodySize': size},
+            'cache': {},
+            'timings': timings,
+            'serverIPAddress': response.get('remoteIPAddress', ''),
+        })
+
+    def stop(self):
+        """Drain remaining events, close HAR file and write per-step summary. Return summary."""
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.drain()
+        with self.lock:
+            pages = [{'id': step.page_id, 'title': step.name, 'pageTimings': {},
+                      'startedDateTime': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(step.started))}
+                     for step in self.steps]
+            self.har.close(pages)
+            summary = [step.as_dict() for step in self.steps if step.requests]
+        with open(self.summary_path, 'w') as summary_file:
+            json.dump(summary, summary_file, indent=2)
+        for step in summary:
+            self.logger.info("Network of step '{}': {} requests, {} bytes, slowest: {}"
+                             .format(step['step'], step['requests'], step['bytes'], step['slowest'][:1]))
+        return summary
@@ -0,0 +1,227 @@
+"""Pre-warmed browser profile templates.
+
+Template is a browser user data directory, built once: first-run dialogs are disabled and HTTP cache
+is primed by visiting warm-up urls. Every driver gets its own cheap clone of the template in temporary
+directory (reflink where file system supports it, otherwise hardlink for cache entries, copy for the
+rest), which is removed on quit. Cache entries of template are made read-only, so browser, that wants
+to update hardlinked entry, fails to open it for writing and replaces it instead of changing template.
+
+    python -m base.driver.profile_template --browser chrome https://www.booking.com/
+
+builds template and reports first navigation time of every url with empty (cold) and cloned warm profile.
+Drivers use template when PROFILE_TEMPLATE is enabled (see driver_config).
+"""
+import argparse
+import errno
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+TEMPLATE_FILE = 'template.json'
+FICLONE = 0x40049409    # ioctl of linux file systems with copy-on-write (btrfs, xfs)
+
+# profile files, that must not be cloned: locks of the browser, that built the template
+SKIP_FILES = {'SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'parent.lock', '.parentlock'}
+# cache entries of template are shared by hardlink
+CACHE_DIRS = {'Cache', 'Cache_Data', 'Code Cache', 'cache2'}
+CACHE_ENTRY = re.compile(r'^(f_[0-9a-f]+|[0-9a-f]{16}_[0-9s]|[0-9A-F]{40})$')
+
+FIRST_RUN_ARGS = {
+    'chrome': ['--no-first-run', '--no-default-browser-check', '--disable-search-engine-choice-screen',
+               '--disable-background-networking', '--disable-component-update'],
+    'firefox': [],
+}
+
+
+class ProfileTemplate:
+    """Template of browser profile of one browser type."""
+
+    def __init__(self, browser, directory, logger):
+        """
+        :param browser (str) - browser type (e.g "chrome")
+        :param directory (str) - directory of template profile
+        """
+        self.browser = browser.lower()
+        self.directory = directory
+        self.logger = logger
+        self.clone_stats = {'reflink': 0, 'hardlink': 0, 'copy': 0}
+
+    @property
+    def metadata(self):
+        path = os.path.join(self.directory, TEMPLATE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as template_file:
+            return json.load(template_file)
+
+    @property
+    def exists(self):
+        return self.metadata is not None
+
+    def build(self, urls):
+        """Build template: start browser with empty profile, visit urls, quit (browser flushes cache on quit).
+        Return first navigation times of urls (cold profile).
+        """
+        from base.driver.driver import Driver
+
+        parent = os.path.dirname(os.path.abspath(self.directory))
+        os.makedirs(parent, exist_ok=True)
+        building = tempfile.mkdtemp(prefix='profile-template-', dir=parent)
+        self.logger.info("Building {} profile template with warm up urls: {}".format(self.browser, urls))
+        driver = Driver(self.browser, self.logger, user_data_dir=building)
+        try:
+            timings = driver.navigation_timings(urls)
+        finally:
+            driver.quit()
+
+        for path in self.cache_entries(building):
+            os.chmod(path, 0o444)
+        with open(os.path.join(building, TEMPLATE_FILE), 'w') as template_file:
+            json.dump({'browser': self.browser, 'built_at': time.time(), 'urls': list(urls), 'cold': timings},
+                      template_file, indent=2)
+        try:
+            os.rename(building, self.directory)
+        except OSError as e:
+            # template was built by another process in the meantime
+            shutil.rmtree(building, ignore_errors=True)
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                raise
+        return timings
+
+    @staticmethod
+    def cache_entries(directory):
+        for root, _, files in os.walk(directory):
+            if CACHE_DIRS.intersection(os.path.relpath(root, directory).split(os.sep)):
+                for name in files:
+                    if CACHE_ENTRY.match(name):
+                        yield os.path.join(root, name)
+
+    def clone(self):
+        """Return path to temporary copy of template. Remove it with remove_clone when browser is closed."""
+        start = time.perf_counter()
+        clone_directory = tempfile.mkdtemp(prefix='profile-{}-'.format(self.browser))
+        for root, directories, files in os.walk(self.directory):
+            relative = os.path.relpath(root, self.directory)
+            target_root = os.path.normpath(os.path.join(clone_directory, relative))
+            os.makedirs(target_root, exist_ok=True)
+            in_cache = bool(CACHE_DIRS.intersection(relative.split(os.sep)))
+            for name in files:
+                if name in SKIP_FILES or (relative == '.' and name == TEMPLATE_FILE):
+                    continue
+                source = os.path.join(root, name)
+                if os.path.islink(source):
+                    continue
+                self.clone_file(source, os.path.join(target_root, name), in_cache and CACHE_ENTRY.match(name))
+        self.logger.info("Profile template was cloned to '{}' in {:.3f} s ({})".format(
+            clone_directory, time.perf_counter() - start, self.clone_stats))
+        return clone_directory
+
+    def clone_file(self, source, target, shareable):
+        if fcntl:
+            try:
+                with open(source, 'rb') as source_file, open(target, 'wb') as target_file:
+                    fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+                shutil.copystat(source, target)
+                self.clone_stats['reflink'] += 1
+                return
+            except OSError:
+                os.remove(target)
+        if shareable:
+            try:
+                os.link(source, target)
+                self.clone_stats['hardlink'] += 1
+                return
+            except OSError:
+                pass
+        shutil.copy2(source, target)
+        self.clone_stats['copy'] += 1
+
+    @staticmethod
+    def remove_clone(clone_directory):
+        shutil.rmtree(clone_directory, ignore_errors=True)
+
+    def remove(self):
+        for path in self.cache_entries(self.directory):
+            os.chmod(path, 0o644)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def get_template(browser, logger):
+    """Return template of browser, configured in driver_config. Template is built if it does not exist yet.
+    Return None if template can't be used (disabled, or not built and there are no warm up urls).
+    """
+    from base.driver import driver_config
+    from base.configurations.results import results_path
+
+    settings = driver_config.PROFILE_TEMPLATE
+    if not settings['enabled']:
+        return None
+    browser = browser.lower()
+    template = ProfileTemplate(browser, settings['directory'] or results_path('profiles', browser), logger)
+    metadata = template.metadata
+    if metadata and time.time() - metadata['built_at'] > settings['max_age']:
+        logger.warning("Profile template '{}' is older than {} seconds. Rebuild it with "
+                       "'python -m base.driver.profile_template'".format(template.directory, settings['max_age']))
+    if not metadata:
+        if not settings['warm_urls']:
+            logger.warning("Profile template '{}' is not built and no warm up urls are configured. "
+                           "Empty profile is used".format(template.directory))
+            return None
+        template.build(settings['warm_urls'])
+    return template
+
+
+def print_report(cold, warm):
+    lines = ["First navigation time (seconds):", "  {:<60} {:>8} {:>8}".format('url', 'cold', 'warm')]
+    for url in cold:
+        lines.append("  {:<60} {:>8.3f} {:>8.3f}".format(url[:60], cold[url], warm.get(url, float('nan'))))
+    print('\n'.join(lines))
+
+
+def main(argv=None):
+    from base.configurations.logger import Logger
+    from base.configurations.results import results_path
+    from base.driver import driver_config
+    from base.driver.driver import Driver
+
+    parser = argparse.ArgumentParser(prog='python -m base.driver.profile_template', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('urls', nargs='*', help='warm up urls (default: warm_urls of driver_config)')
+    parser.add_argument('--browser', default='chrome')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    logger = Logger(__name__).logger
+    urls = args.urls or driver_config.PROFILE_TEMPLATE['warm_urls']
+    directory = driver_config.PROFILE_TEMPLATE['directory'] or results_path('profiles', args.browser.lower())
+    template = ProfileTemplate(args.browser, directory, logger)
+    template.remove()
+    cold = template.build(urls)
+
+    # warm: the same urls in a browser with cloned template
+    clone = template.clone()
+    driver = Driver(args.browser, logger, user_data_dir=clone)
+    try:
+        warm = driver.navigation_timings(urls)
+    finally:
+        driver.quit()
+        template.remove_clone(clone)
+
+    metadata = template.metadata
+    metadata['warm'] = warm
+    with open(os.path.join(directory, TEMPLATE_FILE), 'w') as template_file:
+        json.dump(metadata, template_file, indent=2)
+    print_report(cold, warm)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Record-and-replay transport of WebDriver commands.
+
+Recording mode captures every WebDriver command and its response into compact gzipped
+json-lines file (one file per test). Replay mode serves recorded responses with no browser
+at all, so framework and page object code can be developed and unit tested in milliseconds.
+
+    WEBDRIVER_RECORD=recordings pytest projects/booking/tests   # record with real browser
+    WEBDRIVER_REPLAY=recordings pytest projects/booking/tests   # replay without browser
+
+Command, that differs from the recorded one during replay, raises ReplayMismatchException
+with diff of expected and actual command. Browser, recycled during the test (see Driver.recycle),
+is recorded to the next segment of the recording; replay recycles its driver at the same point.
+"""
+import collections
+import difflib
+import gzip
+import json
+import os
+
+from base.configurations.exception import ReplayMismatchException
+
+NEW_SESSION = 'newSession'
+
+
+def recording_path(directory, test_name, segment=0):
+    """Return path of recording file of test. Every recycled browser of the test gets the next segment."""
+    return os.path.join(directory, '{}{}.jsonl.gz'.format(test_name, '.{}'.format(segment) if segment else ''))
+
+
+def normalize(value):
+    """Return value as it is stored in recording (json round trip)."""
+    return json.loads(json.dumps(value, sort_keys=True, default=str))
+
+
+class RecordingConnection:
+    """Wrapper of selenium remote connection, that writes every command and response to file."""
+
+    def __init__(self, connection, path, driver):
+        """
+        :param connection - command executor of started web driver
+        :param path (str) - path to recording file
+        :param driver - started web driver (its session is written as the first record)
+        """
+        self.connection = connection
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = gzip.open(path, 'wt')
+        self.write({'session_id': driver.session_id, 'capabilities': driver.capabilities,
+                    'w3c': getattr(driver, 'w3c', True)})
+
+    def write(self, record):
+        self.file.write(json.dumps(record, sort_keys=True, default=str, separators=(',', ':')) + '\n')
+
+    def execute(self, command, params):
+        response = self.connection.execute(command, params)
+        self.write({'command': command, 'params': params, 'response': response})
+        if command == 'quit':
+            self.close()
+        return response
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+class ReplayConnection:
+    """Command executor, that serves responses from recording file instead of a browser."""
+
+    def __init__(self, path):
+        with gzip.open(path, 'rt') as recording_file:
+            lines = recording_file.read().splitlines()
+        self.path = path
+        self.session = json.loads(lines[0])
+        self.records = collections.deque(json.loads(line) for line in lines[1:])
+        self.executed = 0
+        self.w3c = self.session['w3c']
+        self.keep_alive = False
+
+    @property
+    def at_quit(self):
+        """True if the only command left in recording is quit of the browser."""
+        return len(self.records) == 1 and self.records[0]['command'] == 'quit'
+
+    def new_session_response(self):
+        if self.session['w3c']:
+            return {'value': {'sessionId': self.session['session_id'],
+                              'capabilities': self.session['capabilities']}}
+        return {'status': 0, 'sessionId': self.session['session_id'], 'value': self.session['capabilities']}
+
+    def execute(self, command, params):
+        if command == NEW_SESSION:
+            return self.new_session_response()
+
+        actual = {'command': command, 'params': normalize(params)}
+        if not self.records:
+            raise ReplayMismatchException("Replay of '{}': command #{} was not recorded:\n{}"
+                                          .format(self.path, self.executed + 1, json.dumps(actual, indent=2)))
+        record = self.records[0]
+        expected = {'command': record['command'], 'params': record['params']}
+        if expected != actual:
+            diff = difflib.unified_diff(json.dumps(expected, indent=2, sort_keys=True).splitlines(),
+                                        json.dumps(actual, indent=2, sort_keys=True).splitlines(),
+                                        'recorded', 'replayed', lineterm='')
+            raise ReplayMismatchException("Replay of '{}': command #{} differs from recording:\n{}"
+                                          .format(self.path, self.executed + 1, '\n'.join(diff)))
+        self.records.popleft()
+        self.executed += 1
+        return record['response']
+
+    def close(self):
+        pass
+
+
+def replay_driver(path):
+    """Return web driver, that replays recording file."""
+    from selenium import webdriver
+
+    connection = ReplayConnection(path)
+    return webdriver.Remote(command_executor=connection, desired_capabilities=connection.session['capabilities'])
@@ -0,0 +1,132 @@
+"""Fast-start runner.
+
+    python -m base.run projects/booking/tests/demo_training_test.py -k setting --prespawn 1
+
+Starts launching browsers in background (selenium is imported there too) while pytest imports
+and collects tests, then runs them and prints import-time and startup-time breakdown.
+Arguments, unknown to the runner, are passed to pytest as is.
+
+With --workers N tests are run in N parallel processes, balanced by duration history
+(see base.runner.scheduler). Results of all workers are merged into JUnit/json reports and
+trend table at the end of the run (see base.runner.report).
+"""
+import time
+
+RUNNER_START = time.perf_counter()
+
+import argparse
+import os
+import sys
+
+from base.configurations.logger import Logger
+from base.driver.driver_pool import DRIVER_POOL
+from base.driver.driver_service import DRIVER_SERVICES
+from base.runner.report import merge
+from base.runner.result_stream import ResultStream, new_run_id, RUN_ID_VARIABLE, WORKER_VARIABLE
+
+LOGGER = Logger(__name__).logger
+
+
+class StartupTimer:
+    """Pytest plugin, that records time of collection and of the first test start."""
+
+    def __init__(self):
+        self.collected = None
+        self.first_test = None
+
+    def pytest_collection_finish(self, session):
+        self.collected = time.perf_counter()
+
+    def pytest_runtest_call(self, item):
+        if self.first_test is None:
+            self.first_test = time.perf_counter()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m base.run', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--browser', default='chrome', help='browser to pre-spawn')
+    parser.add_argument('--prespawn', type=int, default=1,
+                        help='number of browsers to launch in background before tests start (0 - disable)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='run tests in N parallel processes, scheduled by duration history')
+    return parser.parse_known_args(argv)
+
+
+def print_breakdown(imports_done, pytest_imported, timer, finished):
+    """Print where startup time went (seconds since runner start)."""
+    def since_start(moment):
+        return '{:8.3f} s'.format(moment - RUNNER_START) if moment else '       - '
+
+    stats = DRIVER_POOL.stats
+    lines = [
+        "Startup breakdown (since runner start):",
+        "  runner imports done       {}".format(since_start(imports_done)),
+        "  pytest imported           {}".format(since_start(pytest_imported)),
+        "  tests collected           {}".format(since_start(timer.collected)),
+        "  first test started        {}".format(since_start(timer.first_test)),
+        "  run finished              {}".format(since_start(finished)),
+        "Background (pre-spawn threads):",
+        "  selenium import           {:8.3f} s".format(stats['selenium_import']),
+    ]
+    for index, spawn in enumerate(DRIVER_SERVICES.stats['service_spawns']):
+        lines.append("  driver service spawn #{}   {:8.3f} s".format(index + 1, spawn))
+    if DRIVER_SERVICES.stats['restarts']:
+        lines.append("  driver service restarts   {:8d}".format(DRIVER_SERVICES.stats['restarts']))
+    for index, launch in enumerate(stats['browser_launches']):
+        lines.append("  browser launch #{}         {:8.3f} s".format(index + 1, launch))
+    if stats['acquire_waits']:
+        lines.append("  tests waited for browser  {:8.3f} s".format(sum(stats['acquire_waits'])))
+    print('\n'.join(lines))
+
+
+def run_parallel(args, pytest_args):
+    """Collect tests and run them in parallel worker processes."""
+    from base.runner.scheduler import CollectionError, Scheduler, collect_tests
+
+    try:
+        tests = collect_tests(pytest_args)
+    except CollectionError as e:
+        print(str(e))
+        return 1
+    # test paths are replaced by node ids of single tests in worker processes
+    options = [arg for arg in pytest_args if '::' not in arg and not os.path.exists(arg)]
+    runner_args = ['--browser', args.browser, '--prespawn', str(args.prespawn)]
+    # workers stream results of the same run (see base.runner.result_stream)
+    os.environ.setdefault(RUN_ID_VARIABLE, new_run_id())
+    exit_code = Scheduler(tests, args.workers, pytest_args=options, runner_args=runner_args).run()
+    merge(os.environ[RUN_ID_VARIABLE])
+    return exit_code
+
+
+def main(argv=None):
+    args, pytest_args = parse_args(sys.argv[1:] if argv is None else argv)
+    imports_done = time.perf_counter()
+
+    if args.workers:
+        return run_parallel(args, pytest_args)
+
+    if args.prespawn:
+        DRIVER_POOL.prespawn(args.browser, LOGGER, count=args.prespawn)
+
+    import pytest
+    pytest_imported = time.perf_counter()
+
+    timer = StartupTimer()
+    stream = ResultStream()
+    try:
+        exit_code = pytest.main(pytest_args, plugins=[timer, stream])
+    finally:
+        finished = time.perf_counter()
+        DRIVER_POOL.shutdown()
+        DRIVER_SERVICES.shutdown()
+
+    print_breakdown(imports_done, pytest_imported, timer, finished)
+    if WORKER_VARIABLE not in os.environ:
+        # worker processes of parallel run are merged by the parent process
+        merge(stream.run_id)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
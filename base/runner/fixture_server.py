@@ -0,0 +1,55 @@
+"""Local fixture server.
+
+Serves static fixture pages of a project (e.g. projects/booking/fixtures) on localhost, so flows can
+be executed and validated offline:
+
+    with FixtureServer('projects/booking/fixtures') as server:
+        session = SeleniumSession('BOOKING CONFIG', LOGGER, url=server.url, credentials=('user', 'password'))
+"""
+import functools
+import http.server
+import threading
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler, that does not log every request to stderr."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """HTTP server of static fixture directory, running in background thread."""
+
+    def __init__(self, directory, host='127.0.0.1', port=0):
+        """
+        :param directory (str) - directory with fixture pages
+        :param port (int) - port to listen. 0 - any free port
+        """
+        handler = functools.partial(QuietHandler, directory=directory)
+        self.server = http.server.ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return 'http://{}:{}/'.format(host, port)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fixture-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
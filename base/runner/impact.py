@@ -0,0 +1,256 @@
+"""Change-impact test selection.
+
+1. Record which page objects, locators and Interactions methods every test touches:
+
+    pytest -p base.runner.impact --record-impact projects/booking/tests
+
+   Dependency map is merged into results/impact/dependency_map.json (tests, that were not run,
+   keep their previous entries).
+
+2. Select tests, affected by changes since git revision:
+
+    pytest $(python -m base.runner.impact --since origin/master)
+
+   - change of locator line in page object / component selects only tests, that used the locator;
+   - change of Interactions method selects only tests, that called the method;
+   - any other change of page object / component module selects tests, that used the module;
+   - changed test module is selected as a whole;
+   - any other change in framework (base/) or project (data, fixtures, flows...) selects all tests.
+"""
+import argparse
+import ast
+import functools
+import json
+import os
+import re
+import subprocess
+import sys
+
+from base.configurations.results import results_path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+PAGE_OBJECT_DIRS = ('projects/booking/pages/', 'projects/booking/components/')
+INTERACTIONS_MODULE = 'base/configurations/interactions.py'
+DEFAULT_MAP_PATH = os.path.join('impact', 'dependency_map.json')
+
+LOCATOR_PATTERN = re.compile(r"""\(\s*["'](?:CSS_SELECTOR|XPATH)["']\s*,\s*(["'])(.*?)\1\s*\)""")
+HUNK_PATTERN = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def relative_path(path):
+    return os.path.relpath(os.path.realpath(path), REPO_ROOT).replace(os.sep, '/')
+
+
+class ImpactRecorder:
+    """Collects dependencies of the currently running test."""
+
+    def __init__(self):
+        self.current_test = None
+        self.dependencies = {}
+
+    def record(self, kind, value):
+        if self.current_test:
+            self.dependencies.setdefault(self.current_test, {
+                'modules': set(), 'pages': set(), 'locators': set(), 'interactions': set()})[kind].add(value)
+
+    def install(self):
+        """Instrument BasePage, Element and Interactions to report to recorder."""
+        from base.configurations.base_page import BasePage
+        from base.configurations.element import Element
+        from base.configurations.interactions import Interactions
+
+        recorder = self
+        original_page_init = BasePage.__init__
+        original_element_init = Element.__init__
+
+        @functools.wraps(original_page_init)
+        def page_init(page, *args, **kwargs):
+            for klass in type(page).__mro__:
+                module = sys.modules.get(klass.__module__)
+                if klass.__module__.startswith('projects.') and getattr(module, '__file__', None):
+                    recorder.record('pages', klass.__name__)
+                    recorder.record('modules', relative_path(module.__file__))
+            return original_page_init(page, *args, **kwargs)
+
+        # locators are recorded when Element is created: extract, stream_items and fill_form resolve
+        # them by scripts, without calling Element
+        @functools.wraps(original_element_init)
+        def element_init(element, *args, **kwargs):
+            original_element_init(element, *args, **kwargs)
+            if element.locator:
+                recorder.record('locators', element.locator[1])
+            for _, context_locator in element.context:
+                recorder.record('locators', context_locator[1])
+
+        BasePage.__init__ = page_init
+        Element.__init__ = element_init
+        for name, method in list(vars(Interactions).items()):
+            if callable(method) and not name.startswith('_'):
+                setattr(Interactions, name, self.wrap_interaction(name, method))
+
+    def wrap_interaction(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            self.record('interactions', name)
+            return method(*args, **kwargs)
+        return wrapper
+
+    def save(self, path):
+        """Merge recorded dependencies into dependency map file."""
+        dependency_map = load_map(path)
+        for test, dependencies in self.dependencies.items():
+            dependency_map[test] = {kind: sorted(values) for kind, values in dependencies.items()}
+        with open(path, 'w') as map_file:
+            json.dump(dependency_map, map_file, indent=2, sort_keys=True)
+
+
+RECORDER = ImpactRecorder()
+
+
+# pytest plugin
+
+def pytest_addoption(parser):
+    parser.addoption('--record-impact', action='store_true',
+                     help='record page objects, locators and interactions used by every test')
+    parser.addoption('--impact-map', default=None, help='path to dependency map file')
+
+
+def pytest_configure(config):
+    if config.getoption('--record-impact'):
+        RECORDER.install()
+
+
+def pytest_runtest_setup(item):
+    # node id relative to repository root (pytest node id depends on rootdir of the run)
+    module = relative_path(str(item.fspath))
+    RECORDER.current_test = '::'.join([module] + item.nodeid.split('::')[1:])
+    RECORDER.record('modules', module)
+
+
+def pytest_runtest_teardown(item):
+    RECORDER.current_test = None
+
+
+def pytest_sessionfinish(session):
+    if session.config.getoption('--record-impact'):
+        RECORDER.save(session.config.getoption('--impact-map') or results_path(DEFAULT_MAP_PATH))
+
+
+# selection
+
+def load_map(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as map_file:
+        return json.load(map_file)
+
+
+def git_diff(since):
+    """Return changes of working tree since git revision (see parse_diff)."""
+    output = subprocess.run(['git', 'diff', '-U0', '--no-color', since], cwd=REPO_ROOT,
+                            stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+    return parse_diff(output)
+
+
+def parse_diff(output):
+    """Return {file: {'added': [(line_number, text)], 'removed': [(line_number, text)]}} of unified diff
+    with zero context lines. Line numbers are of the new version of file (position of removed line for
+    removed lines)."""
+    changes = {}
+    current = None
+    in_header = False
+    line_number = 0
+    for line in output.splitlines():
+        if line.startswith('diff --git'):
+            in_header = True
+        elif in_header and line.startswith('--- ') and line[4:] != '/dev/null':
+            # removed file has no "+++ b/..." path, so its changes are collected under old path
+            current = changes.setdefault(line[6:], {'added': [], 'removed': []})
+        elif in_header and line.startswith('+++ ') and line[4:] != '/dev/null':
+            current = changes.setdefault(line[6:], {'added': [], 'removed': []})
+        elif line.startswith('@@'):
+            in_header = False
+            line_number = int(HUNK_PATTERN.match(line).group(1))
+        elif in_header:
+            continue
+        elif line.startswith('+'):
+            current['added'].append((line_number, line[1:]))
+            line_number += 1
+        elif line.startswith('-'):
+            current['removed'].append((line_number, line[1:]))
+    return changes
+
+
+def changed_functions(path, line_numbers):
+    """Return names of methods (and module level functions), that contain all changed lines,
+    or None if some line is outside of them."""
+    with open(os.path.join(REPO_ROOT, path)) as module_file:
+        tree = ast.parse(module_file.read())
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef)]
+    for class_node in [node for node in tree.body if isinstance(node, ast.ClassDef)]:
+        functions += [node for node in class_node.body if isinstance(node, ast.FunctionDef)]
+
+    names = set()
+    for line_number in line_numbers:
+        enclosing = [function for function in functions
+                     if function.lineno - len(function.decorator_list) <= line_number <= function.end_lineno]
+        if not enclosing:
+            return None
+        names.add(enclosing[0].name)
+    return names
+
+
+def select_tests(dependency_map, changes):
+    """Return sorted list of test node ids (or test modules) affected by changes."""
+    selected = set()
+
+    def tests_using(kind, values):
+        return {test for test, dependencies in dependency_map.items() if set(dependencies[kind]) & set(values)}
+
+    for path, change in changes.items():
+        changed = [(line_number, text) for line_number, text in change['added'] + change['removed']
+                   if text.strip() and not text.strip().startswith('#')]
+        changed_lines = [text for _, text in changed]
+        if not changed_lines:
+            continue
+
+        if path.startswith(PAGE_OBJECT_DIRS):
+            if all(LOCATOR_PATTERN.search(text) for text in changed_lines):
+                locators = [match.group(2) for text in changed_lines for match in LOCATOR_PATTERN.finditer(text)]
+                selected |= tests_using('locators', locators)
+            else:
+                selected |= tests_using('modules', [path])
+        elif path == INTERACTIONS_MODULE and os.path.exists(os.path.join(REPO_ROOT, path)):
+            functions = changed_functions(path, [line_number for line_number, _ in changed])
+            selected |= tests_using('interactions', functions) if functions is not None else set(dependency_map)
+        elif path.startswith('projects/') and (os.path.basename(path).endswith('_test.py') or
+                                               os.path.basename(path).startswith('test_')):
+            if os.path.exists(os.path.join(REPO_ROOT, path)):
+                selected.add(path)
+        elif path.startswith('projects/'):
+            # data, fixtures, flows, registrations of project: usage of them is not recorded
+            selected |= set(dependency_map)
+        elif path.startswith('base/') and path.endswith(('.py', '.ini')):
+            selected |= set(dependency_map)
+
+    # node ids of modules, selected as a whole, are redundant
+    modules = {test for test in selected if '::' not in test}
+    return sorted(test for test in selected if test in modules or test.split('::')[0] not in modules)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m base.runner.impact',
+                                     description='Print tests affected by changes since git revision.')
+    parser.add_argument('--since', default='HEAD', help='git revision to compare working tree with')
+    parser.add_argument('--map', default=None, help='path to dependency map file')
+    args = parser.parse_args(argv)
+
+    dependency_map = load_map(args.map or results_path(DEFAULT_MAP_PATH))
+    if not dependency_map:
+        sys.stderr.write("Dependency map is empty. Run tests with --record-impact first.\n")
+    for test in select_tests(dependency_map, git_diff(args.since)):
+        print(test)
+
+
+if __name__ == '__main__':
+    main()
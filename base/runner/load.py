@@ -0,0 +1,250 @@
+"""Load mode: page object flows executed by concurrent virtual users.
+
+Flow is a function, that takes session and step timer, and performs user journey with page objects:
+
+    def login(session, step):
+        page = LoginPage(session)
+        with step('open login page'):
+            page.navigate_to_login_page()
+        ...
+
+Every virtual user has its own headless browser (pre-spawned in pool), users are started evenly
+during ramp-up and repeat the flow (with think time after every step) until duration is over.
+Throughput and p50/p95/p99 of every step are reported and written to results/load/<flow>.json.
+By default flow is executed against local fixture server, so load mode can be validated offline:
+
+    python -m base.runner.load projects.booking.load_flows:edit_personal_info --users 5 --ramp-up 10 --duration 60
+"""
+import argparse
+import contextlib
+import importlib
+import json
+import math
+import sys
+import threading
+import time
+
+from base.configurations.logger import Logger
+from base.configurations.results import results_path
+from base.driver import driver_config
+from base.driver.driver_pool import DRIVER_POOL
+
+LOGGER = Logger(__name__).logger
+
+PERCENTILES = (50, 95, 99)
+DEFAULT_FIXTURES = 'projects/booking/fixtures'
+DEFAULT_CREDENTIALS = 'load.user@example.com:password'
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    rank = max(math.ceil(percent / 100.0 * len(values)), 1)
+    return values[rank - 1]
+
+
+def load_flow(path):
+    """Import flow function by 'package.module:function' path."""
+    module_name, _, function_name = path.partition(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+class LoadStats:
+    """Durations and errors of steps of all virtual users."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = {}
+        self.errors = {}
+        self.iterations = 0
+        self.failed_iterations = 0
+
+    def add(self, step, duration, error=None):
+        with self.lock:
+            if error:
+                self.errors.setdefault(step, []).append(error)
+            else:
+                self.durations.setdefault(step, []).append(duration)
+
+    def add_iteration(self, passed):
+        with self.lock:
+            self.iterations += 1
+            self.failed_iterations += 0 if passed else 1
+
+    def report(self, elapsed):
+        steps = []
+        for step in list(dict.fromkeys(list(self.durations) + list(self.errors))):
+            durations = sorted(self.durations.get(step, []))
+            row = {'step': step, 'count': len(durations), 'errors': len(self.errors.get(step, [])),
+                   'throughput': round(len(durations) / elapsed, 3) if elapsed else 0.0}
+            for percent in PERCENTILES:
+                value = percentile(durations, percent)
+                row['p{}'.format(percent)] = round(value, 3) if value is not None else None
+            row['max'] = round(durations[-1], 3) if durations else None
+            steps.append(row)
+        return {'elapsed': round(elapsed, 3), 'iterations': self.iterations,
+                'failed_iterations': self.failed_iterations,
+                'iterations_per_second': round(self.iterations / elapsed, 3) if elapsed else 0.0, 'steps': steps}
+
+
+class VirtualUser:
+    """One simulated user: own browser session, repeats flow until load test ends."""
+
+    def __init__(self, index, load_test):
+        self.index = index
+        self.load_test = load_test
+        self.stats = load_test.stats
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """Time step of flow, then wait think time."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.stats.add(name, time.perf_counter() - start, error='{}: {}'.format(type(e).__name__, str(e)))
+            raise
+        self.stats.add(name, time.perf_counter() - start)
+        self.load_test.stopped.wait(self.load_test.think_time)
+
+    def run(self):
+        from base.session.selenium_session import SeleniumSession
+
+        test = self.load_test
+        try:
+            session = SeleniumSession(test.config_section, LOGGER, browser=test.browser, url=test.url,
+                                      credentials=test.credentials)
+        except Exception as e:
+            LOGGER.error("Virtual user {} failed to start browser: {}".format(self.index, str(e)))
+            self.stats.add('start browser', 0, error=str(e))
+            return
+        try:
+            while not test.stopped.is_set() and time.time() < test.deadline:
+                try:
+                    test.flow(session, self.step)
+                    self.stats.add_iteration(passed=True)
+                except Exception as e:
+                    LOGGER.warning("Virtual user {} iteration failed: {}".format(self.index, str(e)))
+                    self.stats.add_iteration(passed=False)
+                self.reset_state(session)
+        finally:
+            session.close()
+
+    @staticmethod
+    def reset_state(session):
+        """Sign out between iterations: every iteration starts as a new user."""
+        try:
+            session.driver.delete_all_cookies()
+            session.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass
+
+
+class LoadTest:
+    """Runs flow as N concurrent virtual users with ramp-up, think time and fixed duration."""
+
+    def __init__(self, flow, url, users=1, ramp_up=0, duration=60, think_time=1, browser='chrome',
+                 credentials=None, config_section='BOOKING CONFIG'):
+        """
+        :param flow - function(session, step), see description to this module
+        :param url (str) - base url of site under load (e.g. url of FixtureServer)
+        :param ramp_up (float) - seconds, during which users are started evenly
+        :param duration (float) - seconds of load, including ramp-up
+        :param think_time (float) - seconds of pause after every step
+        """
+        self.flow = flow
+        self.url = url
+        self.users = users
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.think_time = think_time
+        self.browser = browser
+        self.credentials = credentials
+        self.config_section = config_section
+        self.stats = LoadStats()
+        self.stopped = threading.Event()
+        self.deadline = None
+
+    def run(self):
+        """Execute load and return report (dict)."""
+        DRIVER_POOL.prespawn(self.browser, LOGGER, count=self.users)
+        start = time.time()
+        self.deadline = start + self.duration
+        threads = []
+        try:
+            for index in range(self.users):
+                thread = threading.Thread(target=VirtualUser(index, self).run, name='vu-{}'.format(index))
+                thread.start()
+                threads.append(thread)
+                if index < self.users - 1 and self.stopped.wait(self.ramp_up / (self.users - 1)):
+                    break
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stopped.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            DRIVER_POOL.shutdown()
+        return self.stats.report(time.time() - start)
+
+
+def print_report(name, report):
+    lines = ["Load of '{}': {} iterations ({} failed) in {:.1f} s, {:.2f} iterations/s".format(
+        name, report['iterations'], report['failed_iterations'], report['elapsed'], report['iterations_per_second'])]
+    lines.append("  {:<30} {:>7} {:>7} {:>8} {:>8} {:>8} {:>8} {:>8}".format(
+        'step', 'count', 'errors', 'per s', 'p50', 'p95', 'p99', 'max'))
+    for row in report['steps']:
+        lines.append("  {:<30} {:>7} {:>7} {:>8} {:>8} {:>8} {:>8} {:>8}".format(
+            row['step'][:30], row['count'], row['errors'], row['throughput'],
+            *['-' if row[key] is None else row[key] for key in ('p50', 'p95', 'p99', 'max')]))
+    print('\n'.join(lines))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m base.runner.load', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('flow', help="flow function, e.g. 'projects.booking.load_flows:login'")
+    parser.add_argument('--users', type=int, default=1, help='number of concurrent virtual users')
+    parser.add_argument('--ramp-up', type=float, default=0, help='seconds to start all users')
+    parser.add_argument('--duration', type=float, default=60, help='seconds of load (including ramp-up)')
+    parser.add_argument('--think-time', type=float, default=1, help='seconds of pause after every step')
+    parser.add_argument('--browser', default='chrome')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='directory of fixture pages to serve')
+    parser.add_argument('--url', help='run against this url instead of local fixture server')
+    parser.add_argument('--credentials', default=DEFAULT_CREDENTIALS, help='user:password of virtual users')
+    parser.add_argument('--headed', action='store_true', help='show browsers (headless by default)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    driver_config.HEADLESS = not args.headed
+    flow = load_flow(args.flow)
+    credentials = tuple(args.credentials.split(':', 1))
+
+    server = None
+    url = args.url
+    if not url:
+        from base.runner.fixture_server import FixtureServer
+        server = FixtureServer(args.fixtures).start()
+        url = server.url
+        LOGGER.info("Fixture server of '{}' is started: {}".format(args.fixtures, url))
+    try:
+        report = LoadTest(flow, url, users=args.users, ramp_up=args.ramp_up, duration=args.duration,
+                          think_time=args.think_time, browser=args.browser, credentials=credentials).run()
+    finally:
+        if server:
+            server.stop()
+
+    name = flow.__name__
+    report.update(flow=args.flow, users=args.users, url=url)
+    with open(results_path('load', '{}.json'.format(name)), 'w') as report_file:
+        json.dump(report, report_file, indent=2)
+    print_report(name, report)
+    return 0 if not report['failed_iterations'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Locator cost analyzer.
+
+Gathers every locator, defined as property of page objects of a project, opens saved DOM snapshots
+in headless browser and evaluates every locator repeatedly inside of the page (no WebDriver round trip
+in measured time). Reports query time and match count of every locator, flags slow locators, ambiguous
+ones (many matches, where one element is expected), locators, that match nothing in any snapshot, and
+static hints (descendant wildcards, text() predicates, attribute substring selectors).
+
+    python -m base.runner.locator_cost                                # fixtures + results/snapshots
+    python -m base.runner.locator_cost --snapshots path/to/snapshots --iterations 50
+
+Snapshots of live pages can be saved from tests with save_snapshot(self.session.driver, 'settings').
+Ranked report is written to results/locator_cost.json.
+"""
+import argparse
+import glob
+import importlib
+import json
+import os
+import pkgutil
+import re
+import statistics
+import sys
+
+from base.configurations.results import results_path
+
+DEFAULT_PACKAGE = 'projects.booking'
+DEFAULT_SNAPSHOTS = ['projects/booking/fixtures', os.path.join('results', 'snapshots')]
+ITERATIONS = 20
+BATCH = 10              # queries per timed batch (performance.now() resolution is coarse)
+SLOW_MS = 0.5           # query slower than that (or 10 times slower than median locator) is flagged
+SLOW_FACTOR = 10
+
+# property names of locators, which are expected to match many elements: the last word of name is
+# list/options/items or plural (not ending with -ss, -us, -is: address, previous, status, analysis)
+MULTIPLE_NAME = re.compile(r'(^|_)(list|options|items|[a-z]*[^isu_]s)$')
+
+STATIC_HINTS = [
+    ('XPATH', re.compile(r'//\*'), "descendant wildcard '//*' scans whole subtree"),
+    ('XPATH', re.compile(r'contains\(\s*text\(\)'), "contains(text()) compares text of every candidate node"),
+    ('XPATH', re.compile(r'^\s*//[^/\[]*\['), "predicate on unanchored '//' search"),
+    ('CSS_SELECTOR', re.compile(r'\[[\w-]+[*^$~|]='), "attribute substring selector can't use id/class indexes"),
+    ('CSS_SELECTOR', re.compile(r'(^|\s)\*(\s|$)'), "universal selector"),
+    ('CSS_SELECTOR', re.compile(r':not\(|:nth-'), "structural pseudo class"),
+]
+
+MEASURE_SCRIPT = """
+var strategy = arguments[0], locator = arguments[1], iterations = arguments[2], batch = arguments[3];
+function query() {
+    if (strategy === 'XPATH') {
+        return document.evaluate(locator, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    }
+    return document.querySelectorAll(locator).length;
+}
+var count;
+try { count = query(); } catch (e) { return {error: String(e.message || e)}; }
+var times = [];
+for (var i = 0; i < iterations; i++) {
+    var start = performance.now();
+    for (var j = 0; j < batch; j++) { query(); }
+    times.push((performance.now() - start) / batch);
+}
+return {count: count, times: times};
+"""
+
+
+class Locator:
+    """Locator property of page object."""
+
+    def __init__(self, page, name, locator, context=()):
+        self.page = page
+        self.name = name
+        self.strategy = 'XPATH' if 'xpath' in locator[0].lower() else 'CSS_SELECTOR'
+        self.value = locator[1]
+        self.context = context
+        self.expect_multiple = bool(MULTIPLE_NAME.search(name))
+
+    @property
+    def title(self):
+        return '{}.{}'.format(self.page, self.name)
+
+    def hints(self):
+        return [hint for strategy, pattern, hint in STATIC_HINTS
+                if strategy == self.strategy and pattern.search(self.value)]
+
+
+class StubSession:
+    """Session without browser: enough to create Element objects of page object properties."""
+
+    def __init__(self, logger):
+        self.driver = None
+        self.logger = logger
+
+
+def all_subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from all_subclasses(subclass)
+
+
+def gather_locators(package=DEFAULT_PACKAGE, logger=None):
+    """Return locators of all page objects (BasePage subclasses) of package, and of BasePage itself."""
+    from base.configurations.base_page import BasePage
+    from base.configurations.element import Element
+
+    root = importlib.import_module(package)
+    for module_info in pkgutil.walk_packages(root.__path__, package + '.'):
+        if '.tests' not in module_info.name:
+            importlib.import_module(module_info.name)
+
+    session = StubSession(logger)
+    locators = []
+    page_classes = [BasePage] + [cls for cls in all_subclasses(BasePage) if cls.__module__.startswith(package)]
+    for page_class in dict.fromkeys(page_classes):
+        page = page_class.__new__(page_class)
+        page.session = session
+        for name, attribute in vars(page_class).items():
+            if not isinstance(attribute, property):
+                continue
+            try:
+                value = attribute.fget(page)
+            except Exception:
+                continue
+            if isinstance(value, Element) and value.locator:
+                locators.append(Locator(page_class.__name__, name, value.locator, value.context))
+    return locators
+
+
+def snapshot_files(directories):
+    files = []
+    for directory in directories:
+        files += sorted(glob.glob(os.path.join(directory, '*.html')))
+    return files
+
+
+def save_snapshot(driver, name, directory=None):
+    """Save DOM of the current page of driver as snapshot for locator cost analysis. Return path."""
+    path = os.path.join(directory, '{}.html'.format(name)) if directory else \
+        results_path('snapshots', '{}.html'.format(name))
+    with open(path, 'w', encoding='utf-8') as snapshot_file:
+        snapshot_file.write(driver.execute_script("return document.documentElement.outerHTML;"))
+    return path
+
+
+def measure(driver, locators, snapshots, iterations=ITERATIONS):
+    """Evaluate every locator in every snapshot. Return {locator title: {snapshot: measurement}}."""
+    measurements = {locator.title: {} for locator in locators}
+    for snapshot in snapshots:
+        driver.get('file://' + os.path.abspath(snapshot))
+        for locator in locators:
+            if locator.context:
+                continue    # frames and shadow roots are not part of saved snapshots
+            result = driver.execute_script(MEASURE_SCRIPT, locator.strategy, locator.value, iterations, BATCH)
+            if 'error' not in result:
+                result = {'count': result['count'], 'median_ms': round(statistics.median(result['times']), 4),
+                          'max_ms': round(max(result['times']), 4)}
+            measurements[locator.title][os.path.basename(snapshot)] = result
+    return measurements
+
+
+def rank(locators, measurements):
+    """Build ranked report rows (the most expensive locator first)."""
+    rows = []
+    for locator in locators:
+        by_snapshot = measurements.get(locator.title, {})
+        errors = sorted({result['error'] for result in by_snapshot.values() if 'error' in result})
+        timed = {snapshot: result for snapshot, result in by_snapshot.items() if 'error' not in result}
+        counts = [result['count'] for result in timed.values()]
+        rows.append({
+            'locator': locator.title, 'strategy': locator.strategy, 'value': locator.value,
+            'median_ms': max([result['median_ms'] for result in timed.values()], default=None),
+            'max_matches': max(counts, default=None),
+            'matched_in': sorted(snapshot for snapshot, result in timed.items() if result['count']),
+            'hints': locator.hints(), 'errors': errors, 'flags': [],
+            'expect_multiple': locator.expect_multiple, 'snapshots': by_snapshot})
+
+    times = [row['median_ms'] for row in rows if row['median_ms'] is not None]
+    typical = statistics.median(times) if times else 0
+    for row in rows:
+        if row['errors']:
+            row['flags'].append('invalid')
+        if row['median_ms'] is not None and (row['median_ms'] > SLOW_MS or
+                                             (typical and row['median_ms'] > SLOW_FACTOR * typical)):
+            row['flags'].append('slow')
+        if row['max_matches'] and row['max_matches'] > 1 and not row['expect_multiple']:
+            row['flags'].append('ambiguous')
+        if row['max_matches'] == 0:
+            row['flags'].append('unmatched')
+    rows.sort(key=lambda row: (row['median_ms'] is None, -(row['median_ms'] or 0)))
+    return rows
+
+
+def print_report(rows):
+    lines = ["Locator cost (the most expensive first):",
+             "  {:<50} {:>10} {:>8}  {}".format('locator', 'median ms', 'matches', 'flags / hints')]
+    for row in rows:
+        lines.append("  {:<50} {:>10} {:>8}  {}".format(
+            row['locator'][:50], '-' if row['median_ms'] is None else '{:.4f}'.format(row['median_ms']),
+            '-' if row['max_matches'] is None else row['max_matches'],
+            ', '.join(row['flags'] + row['hints'])))
+    print('\n'.join(lines))
+
+
+def main(argv=None):
+    from base.configurations.logger import Logger
+    from base.driver import driver_config
+    from base.driver.driver import Driver
+
+    parser = argparse.ArgumentParser(prog='python -m base.runner.locator_cost', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--package', default=DEFAULT_PACKAGE, help='package of page objects')
+    parser.add_argument('--snapshots', nargs='+', default=DEFAULT_SNAPSHOTS, help='directories of html snapshots')
+    parser.add_argument('--iterations', type=int, default=ITERATIONS)
+    parser.add_argument('--browser', default='chrome')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    logger = Logger(__name__).logger
+    locators = gather_locators(args.package, logger)
+    snapshots = snapshot_files(args.snapshots)
+    if not snapshots:
+        print("No html snapshots found in: {}".format(args.snapshots))
+        return 1
+    logger.info("Measuring {} locators in {} snapshots".format(len(locators), len(snapshots)))
+
+    driver_config.HEADLESS = True
+    driver = Driver(args.browser, logger)
+    try:
+        measurements = measure(driver.driver, locators, snapshots, args.iterations)
+    finally:
+        driver.quit()
+
+    rows = rank(locators, measurements)
+    with open(results_path('locator_cost.json'), 'w') as report_file:
+        json.dump(rows, report_file, indent=2)
+    print_report(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
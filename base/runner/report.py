@@ -0,0 +1,176 @@
+"""Merger of per-worker result streams (see base.runner.result_stream).
+
+Reads worker jsonl files of the run record by record (details of a run are never loaded in memory
+at once) and writes:
+    results/runs/<run id>/junit.xml    - combined JUnit report
+    results/runs/<run id>/report.json  - combined json report (records and summary)
+    results/trends.json                - per-test aggregates over all merged runs
+and prints summary and trend table.
+
+    python -m base.runner.report                 # merge the latest run
+    python -m base.runner.report --run <run id>
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from xml.sax.saxutils import escape, quoteattr
+
+from base.configurations import results
+from base.runner.result_stream import run_directory
+
+TREND_HISTORY = 10      # last statuses kept per test
+
+
+def stream_paths(run_id):
+    return sorted(glob.glob(os.path.join(run_directory(run_id), '*.jsonl')))
+
+
+def iter_records(run_id):
+    for path in stream_paths(run_id):
+        with open(path) as stream_file:
+            for line in stream_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def latest_run():
+    runs = glob.glob(os.path.join(results.RESULTS_DIR, 'runs', '*'))
+    runs = [run for run in runs if os.path.isdir(run)]
+    return os.path.basename(max(runs, key=os.path.getmtime)) if runs else None
+
+
+def summarize(run_id):
+    """First pass: counts and totals of the run."""
+    summary = {'run_id': run_id, 'tests': 0, 'passed': 0, 'failed': 0, 'error': 0, 'skipped': 0,
+               'duration': 0.0, 'retries': 0, 'interstitials': {}, 'workers': {}}
+    for record in iter_records(run_id):
+        summary['tests'] += 1
+        summary[record['status']] += 1
+        summary['duration'] = round(summary['duration'] + record['duration'], 3)
+        summary['retries'] += sum(record['retry_counts'].values())
+        for name, count in record.get('interstitials', {}).items():
+            summary['interstitials'][name] = summary['interstitials'].get(name, 0) + count
+        worker = summary['workers'].setdefault(record['worker'], {'tests': 0, 'duration': 0.0})
+        worker['tests'] += 1
+        worker['duration'] = round(worker['duration'] + record['duration'], 3)
+    return summary
+
+
+def junit_testcase(record):
+    class_name, _, name = record['test'].rpartition('::')
+    lines = ['  <testcase classname={} name={} time="{:.3f}">'.format(
+        quoteattr(class_name.replace('/', '.').replace('.py::', '.')), quoteattr(name), record['duration'])]
+    if record['status'] in ('failed', 'error'):
+        lines.append('    <{0} message={1}>{2}</{0}>'.format(
+            'failure' if record['status'] == 'failed' else 'error',
+            quoteattr((record['message'] or '').splitlines()[-1] if record['message'] else ''),
+            escape(record['message'] or '')))
+    elif record['status'] == 'skipped':
+        lines.append('    <skipped message={}/>'.format(quoteattr(record['message'] or '')))
+    properties = [('worker', record['worker'])]
+    properties += [('step: {} {}'.format(timing.get('flow', ''), timing['step']).strip(), timing['duration'])
+                   for timing in record['step_timings']]
+    properties += [('retries: {}'.format(locator), count) for locator, count in record['retry_counts'].items()]
+    properties += [('dismissed: {}'.format(name), count) for name, count in record.get('interstitials', {}).items()]
+    properties += [('artifact: {}'.format(kind), path) for kind, path in record['artifacts'].items()]
+    lines.append('    <properties>')
+    lines += ['      <property name={} value={}/>'.format(quoteattr(str(name)), quoteattr(str(value)))
+              for name, value in properties]
+    lines.append('    </properties>')
+    lines.append('  </testcase>')
+    return '\n'.join(lines) + '\n'
+
+
+def write_reports(run_id, summary):
+    """Second pass: stream records into JUnit and json reports."""
+    directory = run_directory(run_id)
+    with open(os.path.join(directory, 'junit.xml'), 'w') as junit_file, \
+            open(os.path.join(directory, 'report.json'), 'w') as json_file:
+        junit_file.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        junit_file.write('<testsuite name={} tests="{}" failures="{}" errors="{}" skipped="{}" time="{:.3f}">\n'.format(
+            quoteattr(run_id), summary['tests'], summary['failed'], summary['error'], summary['skipped'],
+            summary['duration']))
+        json_file.write('{"records": [\n')
+        for index, record in enumerate(iter_records(run_id)):
+            junit_file.write(junit_testcase(record))
+            json_file.write((',\n' if index else '') + json.dumps(record, sort_keys=True))
+        junit_file.write('</testsuite>\n')
+        json_file.write('\n], "summary": {}}}\n'.format(json.dumps(summary, sort_keys=True)))
+    return directory
+
+
+def update_trends(run_id, path=None):
+    """Fold records of the run into per-test aggregates. Return trends of tests of this run."""
+    path = path or results.results_path('trends.json')
+    trends = {}
+    if os.path.exists(path):
+        with open(path) as trends_file:
+            trends = json.load(trends_file)
+    merged_runs = trends.setdefault('__runs__', [])
+    tests = trends.setdefault('tests', {})
+    current = {}
+    if run_id not in merged_runs:
+        merged_runs.append(run_id)
+        for record in iter_records(run_id):
+            trend = tests.setdefault(record['test'], {'runs': 0, 'passed': 0, 'total_duration': 0.0,
+                                                      'last_duration': None, 'previous_duration': None,
+                                                      'history': []})
+            trend['runs'] += 1
+            trend['passed'] += record['status'] == 'passed'
+            trend['total_duration'] = round(trend['total_duration'] + record['duration'], 3)
+            trend['previous_duration'], trend['last_duration'] = trend['last_duration'], record['duration']
+            trend['history'] = (trend['history'] + [record['status'][0].upper()])[-TREND_HISTORY:]
+            current[record['test']] = trend
+        with open(path, 'w') as trends_file:
+            json.dump(trends, trends_file, indent=2, sort_keys=True)
+    return current
+
+
+def print_report(summary, trends):
+    lines = ["Run {}: {} tests, {} passed, {} failed, {} errors, {} skipped, {} retries, {:.1f} s".format(
+        summary['run_id'], summary['tests'], summary['passed'], summary['failed'], summary['error'],
+        summary['skipped'], summary['retries'], summary['duration'])]
+    if summary.get('interstitials'):
+        lines.append("  dismissed interstitials: {}".format(', '.join(
+            '{} x{}'.format(name, count) for name, count in sorted(summary['interstitials'].items()))))
+    for worker, stats in sorted(summary['workers'].items()):
+        lines.append("  {}: {} tests, {:.1f} s".format(worker, stats['tests'], stats['duration']))
+    if trends:
+        lines.append("  {:<60} {:>5} {:>6} {:>8} {:>8} {:>8}  {}".format(
+            'test', 'runs', 'pass%', 'mean s', 'last s', 'delta s', 'history'))
+        for test, trend in sorted(trends.items()):
+            delta = trend['last_duration'] - trend['previous_duration'] if trend['previous_duration'] is not None else 0
+            lines.append("  {:<60} {:>5} {:>6.0f} {:>8.1f} {:>8.1f} {:>+8.1f}  {}".format(
+                test[-60:], trend['runs'], 100.0 * trend['passed'] / trend['runs'],
+                trend['total_duration'] / trend['runs'], trend['last_duration'], delta, ''.join(trend['history'])))
+    print('\n'.join(lines))
+
+
+def merge(run_id, print_summary=True):
+    """Merge streams of the run into reports and trends. Return summary of the run."""
+    if not stream_paths(run_id):
+        return None
+    summary = summarize(run_id)
+    write_reports(run_id, summary)
+    trends = update_trends(run_id)
+    if print_summary:
+        print_report(summary, trends)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m base.runner.report', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--run', help='run id (default: the latest run)')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    run_id = args.run or latest_run()
+    if not run_id or not merge(run_id):
+        print("No result streams found for run: {}".format(run_id))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Per-worker result streams.
+
+Pytest plugin (registered by base.run), that appends one json record per finished test to
+results/runs/<run id>/<worker>.jsonl: status, duration, step timings, retry counts and dismissed
+interstitials of sessions and paths of test artifacts (HAR, memory curve, performance metrics). Every worker process writes
+only its own file, so no locking is needed; run id and worker name are taken from TEST_RUN_ID and
+TEST_WORKER environment variables, set by parallel scheduler (see base.runner.scheduler).
+Streams are merged into combined reports by base.runner.report.
+"""
+import json
+import os
+import time
+
+from base.configurations import results
+
+RUN_ID_VARIABLE = 'TEST_RUN_ID'
+WORKER_VARIABLE = 'TEST_WORKER'
+
+
+def new_run_id():
+    return time.strftime('%Y%m%d-%H%M%S') + '-{}'.format(os.getpid())
+
+
+def run_directory(run_id):
+    return os.path.join(results.RESULTS_DIR, 'runs', run_id)
+
+
+def session_report(session):
+    """Report of session, that was not closed by the test."""
+    retry_policy = getattr(session, 'retry_policy', None)
+    watchdog = getattr(session, 'interstitials', None)
+    return {'step_timings': list(getattr(session, 'step_timings', [])),
+            'retry_counts': dict(retry_policy.retry_counts) if retry_policy else {}, 'artifacts': {},
+            'interstitials': dict(watchdog.dismissed) if watchdog else {}}
+
+
+class ResultStream:
+    """Pytest plugin, that streams test results of this process to its jsonl file."""
+
+    def __init__(self, run_id=None, worker=None):
+        self.run_id = run_id or os.environ.get(RUN_ID_VARIABLE) or new_run_id()
+        self.worker = worker or os.environ.get(WORKER_VARIABLE) or 'main'
+        self.path = results.results_path('runs', self.run_id, '{}.jsonl'.format(self.worker))
+        self.file = None
+        self.reports = {}
+
+    def pytest_runtest_setup(self, item):
+        del results.SESSION_REPORTS[:]
+
+    def pytest_runtest_logreport(self, report):
+        record = self.reports.setdefault(report.nodeid, {
+            'run_id': self.run_id, 'worker': self.worker, 'test': report.nodeid, 'status': 'passed',
+            'duration': 0.0, 'finished': None, 'message': None})
+        record['duration'] = round(record['duration'] + report.duration, 3)
+        if report.failed:
+            record['status'] = 'failed' if report.when == 'call' else 'error'
+            record['message'] = str(report.longrepr)[-2000:]
+        elif report.skipped and record['status'] == 'passed':
+            record['status'] = 'skipped'
+            record['message'] = str(report.longrepr[-1]) if isinstance(report.longrepr, tuple) else None
+
+    def pytest_runtest_teardown(self, item, nextitem):
+        # session, that test did not close, is reported as it is
+        session = getattr(getattr(item, 'instance', None), 'session', None)
+        if session is not None and getattr(session, 'step_timings', None) is not None:
+            results.SESSION_REPORTS.append(session_report(session))
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        record = self.reports.pop(nodeid, None)
+        if record is None:
+            return
+        record['finished'] = round(time.time(), 3)
+        record['step_timings'] = [timing for report in results.SESSION_REPORTS for timing in report['step_timings']]
+        retry_counts = {}
+        artifacts = {}
+        interstitials = {}
+        for report in results.SESSION_REPORTS:
+            for locator, count in report['retry_counts'].items():
+                retry_counts[locator] = retry_counts.get(locator, 0) + count
+            for name, count in report['interstitials'].items():
+                interstitials[name] = interstitials.get(name, 0) + count
+            artifacts.update(report['artifacts'])
+        record['retry_counts'] = retry_counts
+        record['artifacts'] = artifacts
+        record['interstitials'] = interstitials
+        del results.SESSION_REPORTS[:]
+        self.write(record)
+
+    def write(self, record):
+        if self.file is None:
+            self.file = open(self.path, 'a')
+        self.file.write(json.dumps(record, sort_keys=True) + '\n')
+        self.file.flush()
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.file:
+            self.file.close()
+            self.file = None
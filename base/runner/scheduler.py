@@ -0,0 +1,174 @@
+"""Duration-history-aware parallel scheduler.
+
+Keeps duration history of every test (results/durations.json), plans tests longest-first over
+workers (LPT), and lets idle worker steal the shortest pending tests of the most loaded worker
+at the end of the run. Every test is executed in a separate `python -m base.run` process, its
+output is written to results/logs and its result is streamed to results/runs (see
+base.runner.result_stream). Predicted and actual makespan are reported at the end.
+
+    python -m base.run --workers 4 projects/booking/tests
+"""
+import collections
+import heapq
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+from base.configurations.results import results_path
+
+DEFAULT_DURATION = 60.0
+SMOOTHING = 0.5
+
+
+class CollectionError(RuntimeError):
+    """Raise if pytest failed to collect tests or collected none"""
+    pass
+
+
+class DurationHistory:
+    """Exponentially smoothed duration of every test."""
+
+    def __init__(self, path=None):
+        self.path = path or results_path('durations.json')
+        self.durations = {}
+        if os.path.exists(self.path):
+            with open(self.path) as history_file:
+                self.durations = json.load(history_file)
+
+    def predict(self, test):
+        """Return predicted duration of test. Unknown tests get median duration of known ones."""
+        if test in self.durations:
+            return self.durations[test]
+        if self.durations:
+            known = sorted(self.durations.values())
+            return known[len(known) // 2]
+        return DEFAULT_DURATION
+
+    def update(self, test, duration):
+        previous = self.durations.get(test)
+        self.durations[test] = duration if previous is None else \
+            round(SMOOTHING * duration + (1 - SMOOTHING) * previous, 3)
+
+    def save(self):
+        with open(self.path, 'w') as history_file:
+            json.dump(self.durations, history_file, indent=2, sort_keys=True)
+
+
+class Worker:
+    """Queue of tests, assigned to one worker."""
+
+    def __init__(self, index):
+        self.index = index
+        self.queue = collections.deque()
+        self.predicted_load = 0.0
+        self.busy_time = 0.0
+        self.stolen = 0
+
+
+def plan(tests, history, workers_count):
+    """Distribute tests over workers longest-first, every next test goes to the least loaded worker."""
+    workers = [Worker(index) for index in range(workers_count)]
+    heap = [(0.0, worker.index) for worker in workers]
+    for test in sorted(tests, key=history.predict, reverse=True):
+        load, index = heapq.heappop(heap)
+        workers[index].queue.append(test)
+        workers[index].predicted_load += history.predict(test)
+        heapq.heappush(heap, (workers[index].predicted_load, index))
+    return workers
+
+
+def collect_tests(pytest_args):
+    """Return node ids of tests, collected by pytest with specified arguments.
+    Raise CollectionError if collection failed (e.g. module with syntax error) or found no tests.
+    """
+    # node ids are relative to current directory, where worker processes are started
+    collection = subprocess.run([sys.executable, '-m', 'pytest', '--collect-only', '-q', '--rootdir', os.getcwd()]
+                                + pytest_args,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    tests = [line.strip() for line in collection.stdout.splitlines() if '::' in line]
+    if collection.returncode or not tests:
+        raise CollectionError("Test collection {} (pytest exit code {}):\n{}".format(
+            'found no tests' if collection.returncode in (0, 5) else 'failed', collection.returncode,
+            collection.stdout[-4000:]))
+    return tests
+
+
+class Scheduler:
+    """Runs tests in parallel worker processes according to the plan, with work stealing."""
+
+    def __init__(self, tests, workers_count, pytest_args=(), runner_args=(), history=None):
+        """
+        :param tests (list) - node ids of tests
+        :param pytest_args (list) - arguments passed to pytest of every test (except test paths)
+        :param runner_args (list) - arguments passed to base.run of every test (e.g. --prespawn)
+        """
+        self.history = history or DurationHistory()
+        self.workers = plan(tests, self.history, workers_count)
+        self.pytest_args = list(pytest_args)
+        self.runner_args = list(runner_args)
+        self.lock = threading.Lock()
+        self.results = {}
+
+    @property
+    def predicted_makespan(self):
+        return max(worker.predicted_load for worker in self.workers) if self.workers else 0.0
+
+    def next_test(self, worker):
+        """Return next test of worker queue, or steal one from the worker with the most predicted work left."""
+        with self.lock:
+            if worker.queue:
+                return worker.queue.popleft()
+            victims = [other for other in self.workers if other.queue]
+            if not victims:
+                return None
+            victim = max(victims, key=lambda other: sum(self.history.predict(test) for test in other.queue))
+            worker.stolen += 1
+            # the tail of queue holds the shortest tests of the victim
+            return victim.queue.pop()
+
+    def run_worker(self, worker):
+        while True:
+            test = self.next_test(worker)
+            if test is None:
+                return
+            log_path = results_path('logs', 'worker{}'.format(worker.index),
+                                    re.sub(r'[^\w.-]+', '_', test) + '.log')
+            environment = dict(os.environ, TEST_WORKER='worker{}'.format(worker.index))
+            start = time.time()
+            with open(log_path, 'w') as log_file:
+                return_code = subprocess.call(
+                    [sys.executable, '-m', 'base.run'] + self.runner_args + [test] + self.pytest_args,
+                    stdout=log_file, stderr=subprocess.STDOUT, env=environment)
+            duration = time.time() - start
+            with self.lock:
+                worker.busy_time += duration
+                self.history.update(test, duration)
+                self.results[test] = (return_code, duration)
+            print("[worker{}] {} {} in {:.1f} s".format(
+                worker.index, 'PASSED' if return_code == 0 else 'FAILED', test, duration))
+
+    def run(self):
+        """Execute all tests. Return 0 if all tests passed, 1 otherwise (or if there were no tests)."""
+        start = time.time()
+        threads = [threading.Thread(target=self.run_worker, args=(worker,)) for worker in self.workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        makespan = time.time() - start
+        self.history.save()
+        self.report(makespan)
+        return 0 if self.results and all(code == 0 for code, _ in self.results.values()) else 1
+
+    def report(self, makespan):
+        lines = ["Schedule of {} tests over {} workers:".format(len(self.results), len(self.workers)),
+                 "  predicted makespan  {:8.1f} s".format(self.predicted_makespan),
+                 "  actual makespan     {:8.1f} s".format(makespan)]
+        for worker in self.workers:
+            lines.append("  worker{}: predicted {:8.1f} s, busy {:8.1f} s, stolen tests: {}"
+                         .format(worker.index, worker.predicted_load, worker.busy_time, worker.stolen))
+        print('\n'.join(lines))
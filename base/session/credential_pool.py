@@ -0,0 +1,149 @@
+"""Credentials pool module.
+
+Leases a distinct account to every selenium session, so parallel sessions never log in with
+the same account. Accounts are locked across processes with lock files (one file per account):
+the lock is held for the lifetime of the session and released on session cleanup, or by OS
+if process crashed.
+
+Pool is described either by section of config file:
+    [BOOKING CONFIG]
+    CREDENTIALS_POOL = BOOKING CREDENTIALS POOL
+
+    [BOOKING CREDENTIALS POOL]
+    ACCOUNTS = first@ukr.net:Password1
+               second@ukr.net:Password2
+
+or by path to external file with one "username:password" pair per line:
+    CREDENTIALS_POOL = /path/to/accounts.txt
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from base.configurations.exception import CredentialsPoolException
+
+LEASE_TIMEOUT = 600
+POLL_FREQUENCY = 0.5
+
+
+class CredentialLease:
+    """Class describes account, leased from the pool to a session."""
+
+    def __init__(self, credentials, lock_file, wait_time, logger):
+        """
+        :param credentials (tuple) - (username, password) of leased account
+        :param lock_file (file) - opened and locked lock file of the account
+        :param wait_time (float) - seconds session waited for a free account
+        """
+        self.credentials = credentials
+        self.lock_file = lock_file
+        self.wait_time = wait_time
+        self.logger = logger
+
+    def release(self):
+        """Return account to the pool."""
+        if self.lock_file.closed:
+            return
+        self.logger.info("Releasing account '{}' to credentials pool".format(self.credentials[0]))
+        _unlock(self.lock_file)
+        self.lock_file.close()
+
+
+class CredentialPool:
+    """Class describes pool of accounts, shared by all processes on the machine."""
+
+    def __init__(self, name, accounts, logger, lock_dir=None):
+        """
+        :param name (str) - name of the pool, used to separate lock files of different pools
+        :param accounts (list) - list of (username, password) tuples
+        :param lock_dir (str) - directory for lock files. Temp directory is used by default.
+        """
+        if not accounts:
+            raise CredentialsPoolException("Credentials pool '{}' has no accounts".format(name))
+        self.name = name
+        self.accounts = accounts
+        self.logger = logger
+        self.lock_dir = lock_dir or os.path.join(
+            tempfile.gettempdir(), 'credentials_pool_' + hashlib.sha1(name.encode()).hexdigest()[:10])
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config, pool, logger):
+        """Create pool from config section or from external file.
+        :param config (ConfigParser) - parsed config
+        :param pool (str) - name of config section or path to file with "username:password" lines
+        """
+        if config.has_section(pool):
+            lines = config.get(pool, "ACCOUNTS").splitlines()
+        elif os.path.isfile(pool):
+            with open(pool) as accounts_file:
+                lines = accounts_file.read().splitlines()
+        else:
+            raise CredentialsPoolException(
+                "Credentials pool '{}' is neither config section nor existing file".format(pool))
+
+        accounts = [tuple(line.strip().split(':', 1)) for line in lines
+                    if line.strip() and not line.strip().startswith('#')]
+        return cls(pool, accounts, logger)
+
+    def lease(self, timeout=LEASE_TIMEOUT, poll_frequency=POLL_FREQUENCY):
+        """Lock free account for the caller. Wait if all accounts are leased by other sessions.
+        :param timeout (int) - seconds to wait for a free account
+        :return CredentialLease
+        """
+        start = time.time()
+        # start search from different accounts in different processes to lower lock contention
+        offset = os.getpid() % len(self.accounts)
+        ordered_accounts = self.accounts[offset:] + self.accounts[:offset]
+
+        while True:
+            for credentials in ordered_accounts:
+                lock_file = self._try_lock(credentials[0])
+                if lock_file:
+                    wait_time = time.time() - start
+                    self.logger.info("Leased account '{}' from credentials pool '{}'. Waited for {:.2f} seconds"
+                                     .format(credentials[0], self.name, wait_time))
+                    if wait_time > poll_frequency:
+                        self.logger.warning("Credentials pool '{}' is a bottleneck: all {} accounts were busy "
+                                            "for {:.2f} seconds".format(self.name, len(self.accounts), wait_time))
+                    return CredentialLease(credentials, lock_file, wait_time, self.logger)
+
+            if time.time() - start > timeout:
+                raise CredentialsPoolException("No free account in credentials pool '{}'. Waited for {} seconds"
+                                               .format(self.name, timeout))
+            time.sleep(poll_frequency)
+
+    def _try_lock(self, username):
+        """Return locked lock file of account or None if account is leased by another session."""
+        lock_path = os.path.join(self.lock_dir, hashlib.sha1(username.encode()).hexdigest() + '.lock')
+        lock_file = open(lock_path, 'a+')
+        try:
+            _lock(lock_file)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+
+def _lock(lock_file):
+    """Non-blocking exclusive lock. Raise OSError if file is locked already."""
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def _unlock(lock_file):
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,107 @@
+"""Browserless HTTP session.
+
+Fetches server-rendered pages with pooled HTTP client and parses them with lxml, so checks of
+static content (title, links, meta tags) do not pay for a browser. Locators are the same tuples,
+that Element understands: ("CSS_SELECTOR", ".locator") or ("XPATH", "//*[@class ='class']").
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
+from selenium.webdriver.common.by import By
+
+from base.configurations.element import Element
+from base.configurations.exception import PageNotLoadedException, ElementNotFoundExcepiton
+from base.session.selenium_session import get_default_config
+
+POOL_SIZE = 10
+REQUEST_TIMEOUT = 30
+
+
+class HttpSession:
+    """Session, that can be passed to browserless page objects instead of SeleniumSession."""
+
+    is_http = True
+
+    def __init__(self, config_section, logger, url=None, credentials=None, cookies=None, pool_size=POOL_SIZE):
+        """
+        :param cookies (list) - cookies in selenium format (list of dicts with name, value, domain, path)
+        :param pool_size (int) - max number of kept alive connections per host
+        """
+        logger.info("Initializing http session...")
+        self.logger = logger
+        self.driver = None
+        self.document = None
+        self.current_url = None
+
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
+        for cookie in cookies or []:
+            self.http.cookies.set(cookie['name'], cookie['value'],
+                                  domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+        config = get_default_config()
+        if not credentials:
+            self.credentials = (config.get(config_section, "USERNAME", fallback=None),
+                                config.get(config_section, "PASSWORD", fallback=None))
+        else:
+            self.credentials = credentials
+
+        if not url:
+            self.url = config.get(config_section, "URL")
+        else:
+            self.url = url
+
+    @classmethod
+    def from_selenium_session(cls, session, config_section="BOOKING CONFIG"):
+        """Create http session, authenticated with cookies (and user agent) of browser session."""
+        http_session = cls(config_section, session.logger, url=session.url, credentials=session.credentials,
+                           cookies=session.driver.get_cookies())
+        http_session.http.headers['User-Agent'] = session.driver.execute_script("return navigator.userAgent")
+        return http_session
+
+    def get(self, url=None):
+        """Fetch page and parse it. Parsed document is used by all following locator lookups.
+        :param url (str) - url to fetch. If None - url of the session is used.
+        """
+        url = url or self.url
+        self.logger.info("Fetching page by address: {}".format(url))
+        try:
+            response = self.http.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise PageNotLoadedException("Failed to fetch page by address: {}. Got following error: '{}'"
+                                         .format(url, str(e)))
+        self.current_url = response.url
+        self.document = lxml_html.fromstring(response.content, base_url=response.url)
+        return self.document
+
+    def find(self, locator, multiple=False):
+        """Return lxml element (or list of elements) of fetched page by locator tuple.
+        Raise ElementNotFoundException if element not found.
+        """
+        if self.document is None:
+            raise PageNotLoadedException("No page fetched yet. Call get() before looking for elements")
+
+        if Element.get_by_object(locator[0]) == By.XPATH:
+            elements = self.document.xpath(locator[1])
+        else:
+            elements = self.document.cssselect(locator[1])
+
+        if multiple:
+            return elements
+        if not elements:
+            raise ElementNotFoundExcepiton("Element by locator : '{}' not found on page {}"
+                                           .format(locator, self.current_url))
+        return elements[0]
+
+    @property
+    def title(self):
+        if self.document is None:
+            return None
+        return (self.document.findtext('.//title') or '').strip()
+
+    def close(self):
+        """Close pooled connections."""
+        self.http.close()
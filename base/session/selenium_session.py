@@ -1,9 +1,24 @@
 import configparser
 import os
-from base.driver.driver import Driver
+from urllib.parse import urlsplit
+from base.configurations.results import results_path, current_test_name, report_session
+from base.configurations.context import LocatorContext
+from base.configurations.interstitials import InterstitialWatchdog
+from base.configurations.performance import PerformanceMetrics
+from base.configurations.retry import RetryPolicy
+from base.session.credential_pool import CredentialPool
+from base.driver.driver_pool import DRIVER_POOL
 path_to_default_config = (os.path.dirname(os.path.realpath(__file__)) + "/../configs/booking_config.ini")
-DEFAULT_CONFIG = configparser.ConfigParser()
-DEFAULT_CONFIG.read(path_to_default_config)
+DEFAULT_CONFIG = None
+
+
+def get_default_config():
+    """Return parsed default config. Config file is read on first call (not at import time)."""
+    global DEFAULT_CONFIG
+    if DEFAULT_CONFIG is None:
+        DEFAULT_CONFIG = configparser.ConfigParser()
+        DEFAULT_CONFIG.read(path_to_default_config)
+    return DEFAULT_CONFIG
 
 
 class SeleniumSession:
@@ -14,19 +29,113 @@ class SeleniumSession:
         """
         logger.info("Initializing selenium session...")
         self.logger = logger
+        self.credentials_lease = None
+        self.retry_policy = RetryPolicy()
+        self.step_timings = []
+        self.locator_context = LocatorContext(self)
+        self.interstitials = InterstitialWatchdog(self)
+        self.performance = PerformanceMetrics(self)
+        self.network_capture = None
+        config = get_default_config()
 
-        # open browser
-        self.driver = Driver(browser, self.logger).driver
-
-        # set credentials
+        # set credentials (lease distinct account from credentials pool, if pool is configured)
         if not credentials:
-            self.credentials = (DEFAULT_CONFIG.get(config_section, "USERNAME"),
-                                DEFAULT_CONFIG.get(config_section, "PASSWORD"))
+            credentials_pool = config.get(config_section, "CREDENTIALS_POOL", fallback=None)
+            if credentials_pool:
+                self.credentials_lease = CredentialPool.from_config(config, credentials_pool,
+                                                                    self.logger).lease()
+                self.credentials = self.credentials_lease.credentials
+            else:
+                self.credentials = (config.get(config_section, "USERNAME"),
+                                    config.get(config_section, "PASSWORD"))
         else:
             self.credentials = credentials
 
+        # open browser
+        try:
+            # browser is taken from pool of pre-spawned drivers, if runner started one (see base.run)
+            self.driver_manager = DRIVER_POOL.acquire(browser, self.logger)
+            self.driver = self.driver_manager.driver
+            self.network_capture = self.driver_manager.start_network_capture()
+        except Exception:
+            self.release_credentials()
+            raise
+
         # set URL
         if not url:
-            self.url = DEFAULT_CONFIG.get(config_section, "URL")
+            self.url = config.get(config_section, "URL")
         else:
             self.url = url
+
+    def release_credentials(self):
+        """Return leased account to credentials pool."""
+        if self.credentials_lease:
+            self.credentials_lease.release()
+            self.credentials_lease = None
+
+    def safe_point(self, keep_page=False):
+        """Recycle driver if its memory crossed threshold of memory governor.
+        Call only where no page object of the session is in use (between tests or page objects):
+        browser state (storage, other tabs) is lost on recycle. Return True if driver was recycled.
+        :param keep_page (bool) - if True - opened page and its cookies (login) are restored in the new browser
+        """
+        if not self.driver_manager.needs_recycle:
+            return False
+        url = cookies = None
+        if keep_page:
+            url = self.driver.current_url
+            cookies = self.driver.get_cookies()
+        self.stop_network_capture()
+        self.driver_manager.recycle()
+        self.driver = self.driver_manager.driver
+        self.network_capture = self.driver_manager.start_network_capture()
+        self.locator_context.reset()
+        self.interstitials.reset()
+        if url and urlsplit(url).scheme in ('http', 'https'):
+            self.restore_page(url, cookies)
+        return True
+
+    def restore_page(self, url, cookies):
+        """Open url with cookies of its domain in recycled browser."""
+        # cookie can be added only on page of its domain
+        self.driver.get('{0.scheme}://{0.netloc}/'.format(urlsplit(url)))
+        for cookie in cookies:
+            cookie = dict(cookie)
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            cookie.pop('sameSite', None)
+            self.driver.add_cookie(cookie)
+        self.driver.get(url)
+
+    def mark_step(self, name):
+        """Mark start of page object step (network requests are summarized per step)."""
+        if self.network_capture:
+            self.network_capture.mark_step(name)
+
+    def stop_network_capture(self):
+        if self.network_capture:
+            self.network_capture.stop()
+            self.network_capture = None
+
+    def close(self):
+        """Quit browser and release resources held by session."""
+        artifacts = {}
+        if self.retry_policy.retry_counts:
+            self.logger.info("Retried steps by locator: {}".format(dict(self.retry_policy.retry_counts)))
+        if self.interstitials.dismissed:
+            self.logger.info("Dismissed interstitials: {}".format(dict(self.interstitials.dismissed)))
+        if self.performance.records:
+            artifacts['performance'] = self.performance.export()
+            self.logger.info("Performance metrics are written to: {}".format(artifacts['performance']))
+        try:
+            if self.network_capture:
+                artifacts['har'] = self.network_capture.har_path
+            self.stop_network_capture()
+            self.driver_manager.quit()
+            if self.driver_manager.governor:
+                artifacts['memory'] = results_path('memory', '{}.csv'.format(current_test_name()))
+                self.driver_manager.governor.export(artifacts['memory'])
+        finally:
+            self.release_credentials()
+            report_session(self.step_timings, self.retry_policy.retry_counts, artifacts,
+                           self.interstitials.dismissed)
@@ -0,0 +1,186 @@
+"""Multi-tab execution module.
+
+Runs several independent flows in separate tabs of one browser, instead of one browser process
+per flow. Flow is a generator function, that takes tab session and yields between its steps:
+
+    def check_home_page(session):
+        page = HomePage(session)
+        yield
+        page.action.click(page.booking_home_logo)
+        yield
+        ...
+
+    scheduler = TabScheduler(self.session)
+    scheduler.add(check_home_page)
+    scheduler.add(check_home_page)
+    results = scheduler.run()
+
+Scheduler switches window handles between steps of different flows. Every flow gets its own
+TabSession, so page objects and elements, created in one tab, are never resolved in another.
+Suitable for read-only flows: all tabs share cookies and storage of the browser.
+"""
+import time
+import types
+
+from base.configurations.exception import FlowFailedException
+from base.configurations.context import LocatorContext
+
+MAX_TABS = 5
+
+
+class TabDriver:
+    """Proxy of selenium web driver, bound to one browser tab.
+    Every command is executed after switching host browser to the tab (if it is not active already).
+    """
+
+    def __init__(self, host, handle):
+        """
+        :param host (TabHost) - shared state of the browser, which hosts tabs
+        :param handle (str) - window handle of the tab
+        """
+        self.host = host
+        self.handle = handle
+
+    def activate(self):
+        """Switch host browser to the tab."""
+        if self.host.active_handle != self.handle:
+            self.host.driver.switch_to.window(self.handle)
+            self.host.active_handle = self.handle
+
+    def __getattr__(self, name):
+        self.activate()
+        return getattr(self.host.driver, name)
+
+
+class TabHost:
+    """Describes browser, which hosts tabs of several flows."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.active_handle = driver.current_window_handle
+
+    def open_tab(self):
+        """Open new blank tab and return its window handle."""
+        known_handles = set(self.driver.window_handles)
+        self.driver.execute_script("window.open('about:blank', '_blank');")
+        new_handles = [handle for handle in self.driver.window_handles if handle not in known_handles]
+        if not new_handles:
+            raise FlowFailedException("Failed to open new browser tab")
+        return new_handles[0]
+
+    def close_tab(self, handle):
+        if self.active_handle != handle:
+            self.driver.switch_to.window(handle)
+        self.driver.close()
+        self.active_handle = None
+
+
+class TabSession:
+    """Session of a single tab. Has its own driver proxy, all other attributes are taken from
+    the session of the host browser (url, credentials, logger etc.)."""
+
+    def __init__(self, session, host, handle):
+        self.host_session = session
+        self.driver = TabDriver(host, handle)
+        self.handle = handle
+        # frames are switched per tab, so every tab tracks its own frame chain
+        self.locator_context = LocatorContext(self)
+
+    def __getattr__(self, name):
+        return getattr(self.host_session, name)
+
+
+class FlowResult:
+    """Result of flow, executed by TabScheduler."""
+
+    def __init__(self, name):
+        self.name = name
+        self.status = 'pending'
+        self.error = None
+        self.steps = 0
+        self.duration = 0.0
+
+    def __repr__(self):
+        return "FlowResult(name='{}', status='{}', steps={}, duration={:.2f})".format(
+            self.name, self.status, self.steps, self.duration)
+
+
+class TabScheduler:
+    """Round-robin scheduler of flows over tabs of one browser."""
+
+    def __init__(self, session, max_tabs=MAX_TABS):
+        """
+        :param session (SeleniumSession) - session of the host browser
+        :param max_tabs (int) - max number of flows (tabs), executed concurrently
+        """
+        self.session = session
+        self.logger = session.logger
+        self.max_tabs = max_tabs
+        self.host = TabHost(session.driver)
+        self.pending = []
+
+    def add(self, flow, *args, name=None, **kwargs):
+        """Add flow to the schedule.
+        :param flow - generator function (or plain function for single step flow), that takes
+                      tab session as first argument
+        :param name (str) - name of the flow in results. Function name is used by default.
+        """
+        self.pending.append((name or flow.__name__, flow, args, kwargs))
+
+    def run(self):
+        """Execute all added flows. Return list of FlowResult (in order flows were added)."""
+        results = []
+        active = []
+        host_handle = self.host.active_handle
+        free_handles = [host_handle]   # window of the host session is reused by the first flow
+
+        while self.pending or active:
+            while self.pending and len(active) < self.max_tabs:
+                name, flow, args, kwargs = self.pending.pop(0)
+                handle = free_handles.pop() if free_handles else self.host.open_tab()
+                result = FlowResult(name)
+                results.append(result)
+                self.logger.info("Starting flow '{}' in tab '{}'".format(name, handle))
+                active.append([result, TabSession(self.session, self.host, handle), (flow, args, kwargs)])
+
+            for state in list(active):
+                if not self._step(state):
+                    active.remove(state)
+                    # finished tab is reused by the next pending flow
+                    free_handles.append(state[1].handle)
+
+        for handle in free_handles:
+            if handle != host_handle:
+                self.host.close_tab(handle)
+        self.session.driver.switch_to.window(host_handle)
+        self.host.active_handle = host_handle
+
+        self.logger.info("Tab scheduler finished flows: {}".format(results))
+        return results
+
+    def _step(self, state):
+        """Execute next step of the flow. Return False if flow is finished."""
+        result, tab_session, step = state
+        tab_session.driver.activate()
+        start = time.time()
+        try:
+            if isinstance(step, tuple):
+                flow, args, kwargs = step
+                step = flow(tab_session, *args, **kwargs)
+                if not isinstance(step, types.GeneratorType):
+                    result.status = 'passed'
+                    return False
+                state[2] = step
+            next(step)
+            result.steps += 1
+            return True
+        except StopIteration:
+            result.status = 'passed'
+            return False
+        except Exception as e:
+            self.logger.error("Flow '{}' failed in tab '{}': {}".format(result.name, tab_session.handle, str(e)))
+            result.status = 'failed'
+            result.error = e
+            return False
+        finally:
+            result.duration += time.time() - start
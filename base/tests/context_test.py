@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+
+pytest.importorskip('selenium')
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from base.configurations.context import LocatorContext, shadow
+from base.configurations.element import Element
+
+
+class FakeShadowRoot:
+
+    def __init__(self, generation, driver):
+        self.generation = generation
+        self.driver = driver
+
+    def find_elements(self, by, value):
+        if self.generation != self.driver.generation:
+            raise StaleElementReferenceException('shadow root is detached')
+        return ['{} in root {}'.format(value, self.generation)]
+
+
+class FakeDriver:
+    """Page with one shadow host, re-rendered when generation is increased."""
+
+    def __init__(self):
+        self.generation = 0
+        self.host_lookups = 0
+
+    def implicitly_wait(self, timeout):
+        pass
+
+    def find_elements(self, by, value):
+        self.host_lookups += 1
+        return ['host {}'.format(self.generation)]
+
+    def execute_script(self, script, *args):
+        return FakeShadowRoot(self.generation, self)
+
+    @property
+    def switch_to(self):
+        return self
+
+    def default_content(self):
+        pass
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.driver = FakeDriver()
+        self.logger = logging.getLogger(__name__)
+        self.locator_context = LocatorContext(self)
+
+
+class TestLocatorContext:
+
+    def test_cached_shadow_root_is_reused(self):
+        session = FakeSession()
+        element = Element(session, ("CSS_SELECTOR", "input"), context=(shadow(("CSS_SELECTOR", "card-form")),))
+        assert element() == 'input in root 0'
+        assert element() == 'input in root 0'
+        assert session.driver.host_lookups == 1
+
+    def test_stale_shadow_root_is_resolved_again(self):
+        session = FakeSession()
+        element = Element(session, ("CSS_SELECTOR", "input"), context=(shadow(("CSS_SELECTOR", "card-form")),))
+        element()
+        session.driver.generation += 1
+        assert element() == 'input in root 1'
+        assert element() == 'input in root 1'
+        assert session.driver.host_lookups == 2
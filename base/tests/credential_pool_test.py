@@ -0,0 +1,36 @@
+import configparser
+import logging
+
+import pytest
+
+pytest.importorskip('selenium')
+
+from base.configurations.exception import CredentialsPoolException
+from base.session.credential_pool import CredentialPool
+
+LOGGER = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return CredentialPool('test', [('first', 'one'), ('second', 'two')], LOGGER, lock_dir=str(tmp_path))
+
+
+class TestCredentialPool:
+
+    def test_sessions_lease_distinct_accounts(self, pool):
+        first, second = pool.lease(timeout=0), pool.lease(timeout=0)
+        assert {first.credentials, second.credentials} == {('first', 'one'), ('second', 'two')}
+        with pytest.raises(CredentialsPoolException):
+            pool.lease(timeout=0, poll_frequency=0.01)
+        first.release()
+        assert pool.lease(timeout=0).credentials == first.credentials
+        second.release()
+
+    def test_accounts_are_read_from_config_section(self, tmp_path):
+        config = configparser.ConfigParser()
+        config.read_string('[POOL]\nACCOUNTS = first@ukr.net:pass:word\n    # disabled:account\n    second@ukr.net:2\n')
+        pool = CredentialPool.from_config(config, 'POOL', LOGGER)
+        assert pool.accounts == [('first@ukr.net', 'pass:word'), ('second@ukr.net', '2')]
+        with pytest.raises(CredentialsPoolException):
+            CredentialPool.from_config(config, str(tmp_path / 'missing.txt'), LOGGER)
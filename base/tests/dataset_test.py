@@ -0,0 +1,122 @@
+import json
+import logging
+
+import pytest
+
+from base.configurations import results
+from base.configurations.dataset import Dataset, DatasetRun
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.visited = []
+        self.quit_called = False
+
+    def get(self, url):
+        if self.quit_called:
+            raise RuntimeError('driver was quit')
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeSession:
+    """Session, whose browser is recycled at safe points listed in recycle_at (by number of call)."""
+
+    def __init__(self, recycle_at=()):
+        self.driver = FakeDriver()
+        self.logger = LOGGER
+        self.drivers = [self.driver]
+        self.recycle_at = set(recycle_at)
+        self.safe_points = 0
+
+    def safe_point(self, keep_page=False):
+        self.safe_points += 1
+        if self.safe_points not in self.recycle_at:
+            return False
+        self.driver.quit()
+        self.driver = FakeDriver()
+        self.drivers.append(self.driver)
+        return True
+
+
+@pytest.fixture(autouse=True)
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(results, 'RESULTS_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('name,url\n' + ''.join('row{0},http://site/{0}\n'.format(number) for number in range(7)),
+                    encoding='utf-8')
+    return str(path)
+
+
+class TestDataset:
+
+    def test_shards_split_rows_by_row_number(self, dataset_path):
+        shards = [[number for number, row in Dataset(dataset_path, shard, 3)] for shard in range(3)]
+        assert shards == [[0, 3, 6], [1, 4], [2, 5]]
+
+    def test_jsonl_rows(self, tmp_path):
+        path = tmp_path / 'rows.jsonl'
+        path.write_text('{"name": "a"}\n\n{"name": "b"}\n', encoding='utf-8')
+        assert [row for _, row in Dataset(str(path))] == [{'name': 'a'}, {'name': 'b'}]
+
+    def test_shard_out_of_range(self, dataset_path):
+        with pytest.raises(ValueError):
+            Dataset(dataset_path, shard=2, shards=2)
+
+
+class TestDatasetRun:
+
+    def test_run_is_resumed_from_progress(self, dataset_path):
+        executed = []
+        first = DatasetRun(FakeSession(), Dataset(dataset_path), 'resume', limit=3) \
+            .run(lambda row: executed.append(row['name']))
+        assert first['executed'] == 3 and executed == ['row0', 'row1', 'row2']
+
+        summary = DatasetRun(FakeSession(), Dataset(dataset_path), 'resume') \
+            .run(lambda row: executed.append(row['name']))
+        assert executed == ['row{}'.format(number) for number in range(7)]
+        assert (summary['rows'], summary['executed'], summary['passed']) == (7, 4, 7)
+
+    def test_failed_rows_are_summarized_and_setup_repeated(self, dataset_path, results_dir):
+        setups = []
+
+        def action(row):
+            if row['name'] == 'row1':
+                raise ValueError('bad row')
+
+        summary = DatasetRun(FakeSession(), Dataset(dataset_path), 'failures', setup=lambda: setups.append(1)) \
+            .run(action)
+        assert summary['failed'] == 1 and summary['failures'][0]['row'] == 1
+        assert len(setups) == 2
+        with open(str(results_dir / 'datasets' / 'failures.0.json')) as summary_file:
+            assert json.load(summary_file)['passed'] == 6
+        assert not (results_dir / 'datasets' / 'failures.0.jsonl').exists()
+
+    def test_pages_use_new_driver_after_recycle(self, dataset_path):
+        pytest.importorskip('selenium')
+        from base.configurations.base_page import BasePage
+
+        class RowPage(BasePage):
+            def open(self, url):
+                self.driver.get(url)
+
+        session = FakeSession(recycle_at={4})
+        page = RowPage(session)     # the first safe point
+        summary = DatasetRun(session, Dataset(dataset_path), 'recycle', setup=lambda: page.driver.get('setup')) \
+            .run(lambda row: page.open(row['url']))
+
+        assert summary['failed'] == 0
+        old_driver, new_driver = session.drivers
+        assert old_driver.visited == ['setup', 'http://site/0', 'http://site/1']
+        assert new_driver.visited[0] == 'setup' and len(new_driver.visited) == 6
+        assert page.action.driver is new_driver and page.waits.driver is new_driver
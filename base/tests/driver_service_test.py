@@ -0,0 +1,122 @@
+import logging
+import threading
+
+import pytest
+
+from base.driver import driver_service
+from base.driver.driver_service import ServicePool
+
+LOGGER = logging.getLogger(__name__)
+
+
+class StubService(driver_service.DriverService):
+    """Driver service without process: health and liveness are set by the test."""
+
+    instances = []
+    gate = threading.Event()    # start of service blocks, until gate is set
+
+    def __init__(self, browser, path_to_driver, logger):
+        super().__init__(browser, path_to_driver, logger)
+        self.alive = False
+        self.healthy = False
+        self.starts = 0
+        self.stops = 0
+        self.fail_start = False
+        self.starting = threading.Event()
+        StubService.instances.append(self)
+
+    @property
+    def is_alive(self):
+        return self.alive
+
+    def is_healthy(self):
+        return self.alive and self.healthy
+
+    def start(self):
+        self.starting.set()
+        StubService.gate.wait()
+        self.starts += 1
+        if self.fail_start:
+            raise RuntimeError('service did not start')
+        self.alive = self.healthy = True
+        return 0.1
+
+    def stop(self):
+        self.stops += 1
+        self.alive = False
+
+
+@pytest.fixture(autouse=True)
+def pool(monkeypatch):
+    StubService.instances = []
+    StubService.gate.set()
+    monkeypatch.setattr(driver_service, 'DriverService', StubService)
+    pool = ServicePool()
+    pool.exit_handler_registered = True
+    return pool
+
+
+class TestServicePool:
+
+    def test_running_service_is_shared(self, pool):
+        first = pool.acquire('chrome', 'chromedriver', LOGGER)
+        second = pool.acquire('chrome', 'chromedriver', LOGGER)
+        assert first is second and first.sessions == 2 and first.starts == 1
+        assert pool.stats['service_spawns'] == [0.1]
+
+    def test_service_is_spawned_outside_of_pool_lock(self, pool):
+        StubService.gate.clear()
+        acquired = []
+
+        def acquire():
+            acquired.append(pool.acquire('chrome', 'chromedriver', LOGGER))
+
+        threads = [threading.Thread(target=acquire) for _ in range(2)]
+        threads[0].start()
+        while not StubService.instances:
+            threads[0].join(0.01)
+        service = StubService.instances[0]
+        assert service.starting.wait(5)
+        # pool is not locked while service starts: another session takes the same service and waits for it
+        assert pool.lock.acquire(timeout=1)
+        pool.lock.release()
+        threads[1].start()
+        StubService.gate.set()
+        for thread in threads:
+            thread.join(5)
+        assert acquired == [service, service] and service.starts == 1 and len(StubService.instances) == 1
+
+    def test_dead_service_is_restarted_once(self, pool):
+        service = pool.acquire('chrome', 'chromedriver', LOGGER)
+        pool.release(service)
+        service.alive = False
+        assert pool.acquire('chrome', 'chromedriver', LOGGER) is service
+        assert pool.acquire('chrome', 'chromedriver', LOGGER) is service
+        assert service.starts == 2 and pool.stats['restarts'] == 1
+
+    def test_busy_service_is_skipped_and_never_stopped(self, pool):
+        busy = pool.acquire('chrome', 'chromedriver', LOGGER)
+        busy.healthy = False
+        service = pool.acquire('chrome', 'chromedriver', LOGGER)
+        assert service is not busy and service.starts == 1
+        assert busy.stops == 0 and busy.sessions == 1
+        assert pool.services['chrome'] == [busy, service]
+
+    def test_failed_service_is_removed_from_pool(self, pool, monkeypatch):
+        original_init = StubService.__init__
+
+        def failing_init(self, *args):
+            original_init(self, *args)
+            self.fail_start = True
+
+        monkeypatch.setattr(StubService, '__init__', failing_init)
+        with pytest.raises(RuntimeError):
+            pool.acquire('chrome', 'chromedriver', LOGGER)
+        assert pool.services['chrome'] == [] and StubService.instances[0].sessions == 0
+
+    def test_firefox_service_hosts_one_session(self, pool):
+        first = pool.acquire('firefox', 'geckodriver', LOGGER)
+        second = pool.acquire('firefox', 'geckodriver', LOGGER)
+        assert first is not second
+        pool.release(first)
+        assert pool.acquire('firefox', 'geckodriver', LOGGER) is first
@@ -0,0 +1,101 @@
+import logging
+import os
+
+import pytest
+
+from base.configurations import flow, results
+from base.configurations.flow import CheckpointedFlow
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.current_url = 'http://site/start'
+        self.cookies = [{'name': 'auth', 'value': 'secret', 'domain': 'site'}]
+        self.commands = []
+
+    def get(self, url):
+        self.commands.append(('get', url))
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def delete_all_cookies(self):
+        self.commands.append(('delete_all_cookies',))
+
+    def add_cookie(self, cookie):
+        self.commands.append(('add_cookie', cookie['name']))
+
+    def execute_script(self, script, *args):
+        return {'local': {}, 'session': {}}
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.driver = FakeDriver()
+        self.logger = LOGGER
+        self.step_timings = []
+
+
+@pytest.fixture(autouse=True)
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(results, 'RESULTS_DIR', str(tmp_path))
+    monkeypatch.setattr(flow, 'COOKIES_DIR', str(tmp_path / 'cookies'))
+    return tmp_path
+
+
+def failing_once():
+    calls = []
+
+    def action():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('flaky step')
+    return action
+
+
+class TestCheckpointedFlow:
+
+    def test_cookies_are_not_written_to_checkpoint(self, results_dir):
+        session = FakeSession()
+        checkpointed = CheckpointedFlow(session, 'cookies').step('login', lambda: None, checkpoint=True)
+        checkpointed.save_checkpoint(0)
+        with open(checkpointed.checkpoint_path) as checkpoint_file:
+            assert 'secret' not in checkpoint_file.read()
+        assert os.stat(checkpointed.cookies_path).st_mode & 0o077 == 0
+        assert checkpointed.load_checkpoint()['cookies'] == session.driver.cookies
+
+    def test_rerun_resumes_from_checkpoint_of_previous_run(self):
+        CheckpointedFlow(FakeSession(), 'rerun').step('login', lambda: None, checkpoint=True) \
+            .step('edit', lambda: None).save_checkpoint(0)
+        session, executed = FakeSession(), []
+        CheckpointedFlow(session, 'rerun') \
+            .step('login', lambda: executed.append('login'), checkpoint=True) \
+            .step('edit', lambda: executed.append('edit')) \
+            .run()
+        assert executed == ['edit'] and ('add_cookie', 'auth') in session.driver.commands
+
+    def test_checkpoint_without_cookies_is_ignored(self):
+        checkpointed = CheckpointedFlow(FakeSession(), 'other').step('login', lambda: None, checkpoint=True)
+        checkpointed.save_checkpoint(0)
+        os.remove(checkpointed.cookies_path)
+        assert checkpointed.load_checkpoint() is None
+        assert not os.path.exists(checkpointed.checkpoint_path)
+
+    def test_resume_uses_driver_of_recycled_browser(self):
+        session = FakeSession()
+        recycled = FakeDriver()
+
+        def recycle():
+            session.driver = recycled
+
+        CheckpointedFlow(session, 'resume') \
+            .step('login', recycle, checkpoint=True) \
+            .step('edit', failing_once()) \
+            .run()
+        assert ('add_cookie', 'auth') in recycled.commands
+        assert [timing['status'] for timing in session.step_timings] == ['passed', 'failed', 'passed']
@@ -0,0 +1,77 @@
+import logging
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('lxml')
+pytest.importorskip('cssselect')
+pytest.importorskip('selenium')
+
+from base.configurations.base_page import BasePage
+from base.configurations.exception import ElementNotFoundExcepiton, PageNotLoadedException
+from base.configurations.http_interactions import HttpInteractions
+from base.runner.fixture_server import FixtureServer
+from base.session.http_session import HttpSession
+
+LOGGER = logging.getLogger(__name__)
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <title> Fixture page </title>
+    <meta name="description" content="Offline Fixture">
+</head>
+<body>
+    <div id="content"><a class="sign-in" href="/login">Sign in</a></div>
+    <div style="display: none"><span id="hidden">hidden</span></div>
+</body>
+</html>
+"""
+
+
+class StaticPage(BasePage):
+    browserless = True
+
+
+@pytest.fixture
+def session(tmp_path):
+    (tmp_path / 'index.html').write_text(PAGE, encoding='utf-8')
+    with FixtureServer(str(tmp_path)) as server:
+        session = HttpSession('BOOKING CONFIG', LOGGER, url=server.url, credentials=('user', 'password'))
+        yield session
+        session.close()
+
+
+class TestHttpSession:
+
+    def test_elements_are_found_in_fetched_page(self, session):
+        with pytest.raises(PageNotLoadedException):
+            session.find(("CSS_SELECTOR", "#content"))
+        session.get(session.url + 'index.html')
+        assert session.title == 'Fixture page'
+        assert session.find(("XPATH", "//a[@class='sign-in']")).get('href') == '/login'
+        assert len(session.find(("CSS_SELECTOR", "div"), multiple=True)) == 2
+        with pytest.raises(ElementNotFoundExcepiton):
+            session.find(("CSS_SELECTOR", "#missing"))
+
+    def test_missing_page_is_not_loaded(self, session):
+        with pytest.raises(PageNotLoadedException):
+            session.get(session.url + 'missing.html')
+
+
+class TestHttpInteractions:
+
+    def test_read_only_interactions(self, session):
+        session.get(session.url + 'index.html')
+        action = HttpInteractions(session)
+        assert action.get_title() == 'Fixture page'
+        assert action.get_meta_content('description') == 'offline fixture'
+        assert action.get_text(("CSS_SELECTOR", "a.sign-in")) == 'Sign in'
+        assert action.is_elements_present(("CSS_SELECTOR", "#content"))
+        assert action.is_element_displayed(("CSS_SELECTOR", "#content"))
+        assert not action.is_element_displayed(("CSS_SELECTOR", "#hidden"))
+        assert not action.is_element_displayed(("CSS_SELECTOR", "#missing"))
+
+    def test_browserless_page_object_uses_http_interactions(self, session):
+        page = StaticPage(session)
+        assert isinstance(page.action, HttpInteractions) and page.waits is None
@@ -0,0 +1,100 @@
+import pytest
+
+from base.runner.impact import ImpactRecorder, parse_diff, select_tests
+
+DEPENDENCY_MAP = {
+    'projects/booking/tests/demo_training_test.py::TestDemo::test_setting_page': {
+        'modules': ['projects/booking/pages/setting_page.py', 'projects/booking/tests/demo_training_test.py'],
+        'pages': ['SettingPage'], 'locators': ['.nickname input', '#profile'], 'interactions': ['click']},
+    'projects/booking/tests/other_test.py::test_home': {
+        'modules': ['projects/booking/pages/home_page.py', 'projects/booking/tests/other_test.py'],
+        'pages': ['HomePage'], 'locators': ['#profile', '.search'], 'interactions': ['send_keys']},
+}
+ALL_TESTS = sorted(DEPENDENCY_MAP)
+
+DIFF = '''diff --git a/projects/booking/pages/home_page.py b/projects/booking/pages/home_page.py
+index 1111111..2222222 100644
+--- a/projects/booking/pages/home_page.py
++++ b/projects/booking/pages/home_page.py
+@@ -10 +10 @@ class HomePage(BasePage):
+-    def search(self): return Element(self.session, ("CSS_SELECTOR", ".search"))
++    def search(self): return Element(self.session, ("CSS_SELECTOR", ".search-form"))
+@@ -20,0 +21,2 @@ class HomePage(BasePage):
++    # comment
++    pass
+diff --git a/projects/booking/data/old.csv b/projects/booking/data/old.csv
+deleted file mode 100644
+index 3333333..0000000
+--- a/projects/booking/data/old.csv
++++ /dev/null
+@@ -1,2 +0,0 @@
+-name
+-row
+'''
+
+
+def change(*lines):
+    return {'added': [(number, text) for number, text in enumerate(lines, 1)], 'removed': []}
+
+
+class TestParseDiff:
+
+    def test_added_and_removed_lines_with_new_line_numbers(self):
+        changes = parse_diff(DIFF)
+        assert changes['projects/booking/pages/home_page.py'] == {
+            'added': [(10, '    def search(self): return Element(self.session, ("CSS_SELECTOR", ".search-form"))'),
+                      (21, '    # comment'), (22, '    pass')],
+            'removed': [(10, '    def search(self): return Element(self.session, ("CSS_SELECTOR", ".search"))')]}
+
+    def test_removed_file_is_collected_under_old_path(self):
+        assert parse_diff(DIFF)['projects/booking/data/old.csv']['removed'] == [(0, 'name'), (0, 'row')]
+
+
+class TestSelectTests:
+
+    def test_changed_locator_selects_tests_using_it(self):
+        changes = {'projects/booking/pages/home_page.py': change(
+            'def search(self): return Element(self.session, ("CSS_SELECTOR", ".search"))')}
+        assert select_tests(DEPENDENCY_MAP, changes) == ['projects/booking/tests/other_test.py::test_home']
+
+    def test_other_page_object_change_selects_tests_using_module(self):
+        changes = {'projects/booking/pages/setting_page.py': change('self.action.click(self.save_button)')}
+        assert select_tests(DEPENDENCY_MAP, changes) == [
+            'projects/booking/tests/demo_training_test.py::TestDemo::test_setting_page']
+
+    def test_changed_test_module_is_selected_as_whole(self):
+        changes = {'projects/booking/tests/demo_training_test.py': change('assert True')}
+        assert select_tests(DEPENDENCY_MAP, changes) == ['projects/booking/tests/demo_training_test.py']
+
+    def test_comment_only_change_selects_nothing(self):
+        assert select_tests(DEPENDENCY_MAP, {'base/run.py': change('# comment', '')}) == []
+
+    @pytest.mark.parametrize('path', ['base/configurations/waits.py', 'projects/booking/interstitials.py',
+                                      'projects/booking/load_flows.py', 'projects/booking/fixtures/fixture.js',
+                                      'projects/booking/data/personal_info.csv'])
+    def test_framework_and_unrecognized_project_changes_select_all_tests(self, path):
+        assert select_tests(DEPENDENCY_MAP, {path: change('value = 1')}) == ALL_TESTS
+
+
+class TestImpactRecorder:
+
+    def test_locators_are_recorded_when_element_is_created(self):
+        pytest.importorskip('selenium')
+        from base.configurations.base_page import BasePage
+        from base.configurations.context import shadow
+        from base.configurations.element import Element
+        from base.configurations.interactions import Interactions
+
+        recorder = ImpactRecorder()
+        originals = [(BasePage, '__init__', BasePage.__init__), (Element, '__init__', Element.__init__)] + \
+            [(Interactions, name, method) for name, method in vars(Interactions).items()
+             if callable(method) and not name.startswith('_')]
+        try:
+            recorder.install()
+            recorder.current_test = 'test'
+            Element(type('Session', (), {'driver': None, 'logger': None})(), ("CSS_SELECTOR", "input"),
+                    context=(shadow(("CSS_SELECTOR", "card-form")),))
+        finally:
+            for owner, name, method in originals:
+                setattr(owner, name, method)
+        assert recorder.dependencies['test']['locators'] == {'input', 'card-form'}
@@ -0,0 +1,99 @@
+import json
+import logging
+import shutil
+import subprocess
+
+import pytest
+
+pytest.importorskip('selenium')
+
+from base.configurations import interactions
+from base.configurations.exception import CustomException
+from base.configurations.interactions import Interactions, ROWS_SCRIPT, SCROLL_STEP_SCRIPT, STREAM_SCRIPT
+
+LOGGER = logging.getLogger(__name__)
+ITEM = ("CSS_SELECTOR", ".hotel")
+
+
+class FakeDriver:
+    """Infinite-scroll list: every stream script call returns the next batch of not yet streamed rows."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.stream_calls = 0
+        self.scrolls = 0
+
+    def execute_script(self, script, *args):
+        if script == STREAM_SCRIPT:
+            self.stream_calls += 1
+            return [dict(item) for item in self.batches.pop(0)] if self.batches else []
+        if script == SCROLL_STEP_SCRIPT:
+            self.scrolls += 1
+        return None
+
+
+class FakeSession:
+
+    def __init__(self, batches):
+        self.driver = FakeDriver(batches)
+        self.logger = LOGGER
+
+
+@pytest.fixture(autouse=True)
+def no_poll_sleep(monkeypatch):
+    monkeypatch.setattr(interactions, 'SCROLL_POLL_FREQUENCY', 0)
+
+
+def stream(batches, **kwargs):
+    session = FakeSession(batches)
+    return list(Interactions(session).stream_items(ITEM, **kwargs)), session.driver
+
+
+class TestStreamItems:
+
+    def test_rerendered_items_are_deduplicated_by_key(self):
+        items, _ = stream([[{'name': 'a', '__key': '1'}, {'name': 'b', '__key': None}],
+                           [{'name': 'a again', '__key': '1'}, {'name': 'c', '__key': None}]],
+                          field_map={'name': None}, key='data-id', idle_timeout=0)
+        assert items == [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+
+    def test_stops_at_limit(self):
+        items, driver = stream([[{'name': 'a'}, {'name': 'b'}], [{'name': 'c'}]], field_map={'name': None},
+                               limit=2)
+        assert [item['name'] for item in items] == ['a', 'b']
+        assert driver.stream_calls == 1 and driver.scrolls == 0
+
+    def test_stops_when_no_new_items_appear(self):
+        items, driver = stream([[{'name': 'a'}], [], [{'name': 'late'}]], field_map={'name': None},
+                               idle_timeout=0)
+        assert items == [{'name': 'a'}]
+        assert driver.stream_calls == 2
+
+    def test_stops_at_timeout(self):
+        items, driver = stream([[{'name': 'a'}]], field_map={'name': None}, timeout=0)
+        assert items == [] and driver.stream_calls == 0
+
+    def test_key_requires_field_map(self):
+        with pytest.raises(CustomException):
+            stream([], key='data-id')
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='node is required to run item scripts')
+class TestFindRows:
+
+    def test_xpath_is_evaluated_in_search_root(self):
+        # minimal DOM: XPath evaluation records its context node
+        script = """
+var XPathResult = {ORDERED_NODE_SNAPSHOT_TYPE: 7}, contexts = [];
+function evaluate(locator, context) {
+    contexts.push(context.name);
+    return {snapshotLength: 1, snapshotItem: function () { return context.name + ' row'; }};
+}
+var document = {name: 'document', ownerDocument: null, evaluate: evaluate};
+var shadowRoot = {name: 'shadow root', ownerDocument: document};
+%s
+console.log(JSON.stringify([findRows(shadowRoot, 'XPATH', './/li'), findRows(document, 'XPATH', '//li'), contexts]));
+""" % ROWS_SCRIPT
+        output = subprocess.run(['node', '-e', script], stdout=subprocess.PIPE, check=True,
+                                universal_newlines=True).stdout
+        assert json.loads(output) == [['shadow root row'], ['document row'], ['shadow root', 'document']]
@@ -0,0 +1,100 @@
+import json
+import logging
+
+import pytest
+
+from base.configurations import results
+from base.driver.network_capture import HarWriter, NetworkCapture, timing_phases
+
+LOGGER = logging.getLogger(__name__)
+
+TIMING = {'requestTime': 100.0, 'dnsStart': 1.0, 'dnsEnd': 3.0, 'connectStart': 3.0, 'connectEnd': 10.0,
+          'sslStart': 5.0, 'sslEnd': 10.0, 'sendStart': 10.0, 'sendEnd': 10.5, 'receiveHeadersEnd': 40.5}
+
+
+@pytest.fixture(autouse=True)
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(results, 'RESULTS_DIR', str(tmp_path))
+    return tmp_path
+
+
+def event(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def request(request_id, url, wall_time, timestamp):
+    return event('Network.requestWillBeSent', requestId=request_id, wallTime=wall_time, timestamp=timestamp,
+                 request={'method': 'GET', 'url': url, 'headers': {'Accept': '*/*'}})
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.messages = []
+
+    def get_log(self, log_type):
+        messages, self.messages = self.messages, []
+        return messages
+
+
+class TestTimingPhases:
+
+    def test_resource_timing_is_split_into_har_phases(self):
+        assert timing_phases(TIMING, finished_timestamp=100.0605) == {
+            'blocked': 1.0, 'dns': 2.0, 'connect': 7.0, 'ssl': 5.0, 'send': 0.5, 'wait': 30.0, 'receive': 20.0}
+
+    def test_reused_connection_has_no_dns_and_connect(self):
+        timing = dict(TIMING, dnsStart=-1, dnsEnd=-1, connectStart=-1, connectEnd=-1, sslStart=-1, sslEnd=-1)
+        phases = timing_phases(timing)
+        assert (phases['blocked'], phases['dns'], phases['connect'], phases['ssl'], phases['receive']) == \
+            (10.0, -1, -1, -1, 0)
+
+    def test_response_without_timing(self):
+        assert timing_phases(None)['wait'] == 0 and timing_phases({})['dns'] == -1
+
+
+class TestHarWriter:
+
+    def test_entries_and_pages_form_valid_har(self, tmp_path):
+        writer = HarWriter(str(tmp_path / 'capture.har'))
+        writer.write_entry({'pageref': 'page_0', 'time': 1})
+        writer.write_entry({'pageref': 'page_1', 'time': 2})
+        writer.close([{'id': 'page_0'}, {'id': 'page_1'}])
+        writer.close([])
+        with open(str(tmp_path / 'capture.har')) as har_file:
+            har = json.load(har_file)['log']
+        assert [entry['time'] for entry in har['entries']] == [1, 2]
+        assert [page['id'] for page in har['pages']] == ['page_0', 'page_1']
+
+
+class TestNetworkCapture:
+
+    def test_requests_are_attributed_to_steps_with_unique_pages(self):
+        driver = FakeDriver()
+        capture = NetworkCapture(driver, LOGGER, name='capture')
+        for name, started in (('LoginPage', 10.0), ('SettingPage', 20.0), ('LoginPage', 30.0)):
+            capture.mark_step(name)
+            capture.steps[-1].started = started
+        driver.messages = [
+            request('1', 'http://site/login', 11.0, 1.0),
+            event('Network.responseReceived', requestId='1', response={'status': 200, 'timing': TIMING}),
+            event('Network.loadingFinished', requestId='1', timestamp=1.5, encodedDataLength=100),
+            request('2', 'http://site/old', 31.0, 2.0),
+            event('Network.requestWillBeSent', requestId='2', wallTime=31.1, timestamp=2.1,
+                  request={'method': 'GET', 'url': 'http://site/new'},
+                  redirectResponse={'status': 302, 'encodedDataLength': 10}),
+            event('Network.loadingFailed', requestId='2', timestamp=2.2, errorText='net::ERR_ABORTED'),
+            event('Network.loadingFinished', requestId='unknown', timestamp=3.0),
+        ]
+        summary = capture.stop()
+
+        with open(capture.har_path) as har_file:
+            har = json.load(har_file)['log']
+        assert [page['id'] for page in har['pages']] == ['page_0', 'page_1', 'page_2', 'page_3']
+        assert [page['title'] for page in har['pages']] == ['session start', 'LoginPage', 'SettingPage', 'LoginPage']
+        assert [(entry['pageref'], entry['request']['url'], entry['response']['status']) for entry in har['entries']] \
+            == [('page_1', 'http://site/login', 200), ('page_3', 'http://site/old', 302),
+                ('page_3', 'http://site/new', 0)]
+        assert har['entries'][0]['time'] == 500.0 and har['entries'][2]['response']['statusText'] == 'net::ERR_ABORTED'
+        assert [(step['page'], step['requests'], step['bytes']) for step in summary] == \
+            [('page_1', 1, 100), ('page_3', 2, 10)]
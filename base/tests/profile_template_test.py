@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+
+import pytest
+
+from base.driver import driver_config
+from base.driver.profile_template import ProfileTemplate, TEMPLATE_FILE, get_template
+
+LOGGER = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def template(tmp_path):
+    directory = tmp_path / 'profiles' / 'chrome'
+    cache = directory / 'Default' / 'Cache' / 'Cache_Data'
+    cache.mkdir(parents=True)
+    (directory / TEMPLATE_FILE).write_text(json.dumps({'browser': 'chrome', 'built_at': 0, 'urls': []}))
+    (directory / 'Default' / 'Preferences').write_text('{"first_run": false}')
+    (directory / 'SingletonLock').write_text('host-1234')
+    os.symlink(str(directory / 'Default' / 'Preferences'), str(directory / 'Default' / 'Link'))
+    (cache / 'f_00000a').write_bytes(b'cached response')
+    (cache / 'index').write_bytes(b'cache index')
+    template = ProfileTemplate('Chrome', str(directory), LOGGER)
+    for path in template.cache_entries(template.directory):
+        os.chmod(path, 0o444)
+    yield template
+    template.remove()
+
+
+@pytest.fixture
+def clone(template):
+    clone = template.clone()
+    yield clone
+    template.remove_clone(clone)
+
+
+def files(directory):
+    return sorted(os.path.relpath(os.path.join(root, name), directory)
+                  for root, _, names in os.walk(directory) for name in names)
+
+
+class TestClone:
+
+    def test_clone_has_profile_without_locks_and_metadata(self, template, clone):
+        assert files(clone) == [os.path.join('Default', 'Cache', 'Cache_Data', 'f_00000a'),
+                                os.path.join('Default', 'Cache', 'Cache_Data', 'index'),
+                                os.path.join('Default', 'Preferences')]
+        with open(os.path.join(clone, 'Default', 'Preferences')) as preferences:
+            assert preferences.read() == '{"first_run": false}'
+        assert sum(template.clone_stats.values()) == 3
+
+    def test_only_cache_entries_are_shared_with_template(self, template, clone):
+        if template.clone_stats['reflink']:
+            pytest.skip('file system clones files with copy-on-write')
+
+        def inode(directory, *parts):
+            return os.stat(os.path.join(directory, *parts)).st_ino
+        entry = ('Default', 'Cache', 'Cache_Data', 'f_00000a')
+        assert inode(clone, *entry) == inode(template.directory, *entry)
+        assert inode(clone, 'Default', 'Preferences') != inode(template.directory, 'Default', 'Preferences')
+        assert template.clone_stats == {'reflink': 0, 'hardlink': 1, 'copy': 2}
+
+    def test_changes_of_clone_do_not_reach_template(self, template, clone):
+        with open(os.path.join(clone, 'Default', 'Preferences'), 'w') as preferences:
+            preferences.write('{}')
+        with open(os.path.join(template.directory, 'Default', 'Preferences')) as preferences:
+            assert preferences.read() == '{"first_run": false}'
+
+    def test_clone_is_removed(self, template):
+        clone = template.clone()
+        template.remove_clone(clone)
+        assert not os.path.exists(clone)
+
+
+class TestGetTemplate:
+
+    def test_template_is_used_only_if_enabled_and_built(self, template, monkeypatch, tmp_path):
+        settings = dict(driver_config.PROFILE_TEMPLATE, enabled=False, directory=template.directory, warm_urls=[])
+        monkeypatch.setattr(driver_config, 'PROFILE_TEMPLATE', settings)
+        assert get_template('chrome', LOGGER) is None
+        settings['enabled'] = True
+        assert get_template('chrome', LOGGER).directory == template.directory
+        settings['directory'] = str(tmp_path / 'not built')
+        assert get_template('chrome', LOGGER) is None
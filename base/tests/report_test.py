@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from base.configurations import results
+from base.runner import report
+from base.runner.result_stream import run_directory
+
+
+@pytest.fixture(autouse=True)
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(results, 'RESULTS_DIR', str(tmp_path / 'results'))
+    return tmp_path
+
+
+def record(test, status='passed', duration=1.0, worker='gw0', **fields):
+    record = {'run_id': 'run', 'worker': worker, 'test': test, 'status': status, 'duration': duration,
+              'finished': 0, 'message': None, 'step_timings': [], 'retry_counts': {}, 'artifacts': {},
+              'interstitials': {}}
+    record.update(fields)
+    return record
+
+
+def write_stream(run_id, worker, records):
+    with open(results.results_path('runs', run_id, '{}.jsonl'.format(worker)), 'w') as stream_file:
+        for item in records:
+            stream_file.write(json.dumps(item) + '\n')
+        stream_file.write('\n')
+
+
+class TestMerge:
+
+    def test_summary_combines_worker_streams(self):
+        write_stream('run', 'gw0', [record('t.py::a', retry_counts={'#ok': 2}, interstitials={'modal': 1}),
+                                    record('t.py::b', 'failed', 2.5, message='AssertionError')])
+        write_stream('run', 'gw1', [record('t.py::c', 'skipped', 0.5, worker='gw1', interstitials={'modal': 2})])
+        summary = report.summarize('run')
+        assert (summary['tests'], summary['passed'], summary['failed'], summary['skipped']) == (3, 1, 1, 1)
+        assert summary['duration'] == 4.0 and summary['retries'] == 2
+        assert summary['interstitials'] == {'modal': 3}
+        assert summary['workers'] == {'gw0': {'tests': 2, 'duration': 3.5}, 'gw1': {'tests': 1, 'duration': 0.5}}
+
+    def test_reports_contain_every_record(self):
+        write_stream('run', 'gw0', [record('t.py::a'), record('t.py::b', 'failed', message='boom\nAssertionError')])
+        summary = report.merge('run', print_summary=False)
+        with open(os.path.join(run_directory('run'), 'report.json')) as json_file:
+            merged = json.load(json_file)
+        assert [item['test'] for item in merged['records']] == ['t.py::a', 't.py::b']
+        assert merged['summary'] == summary
+        with open(os.path.join(run_directory('run'), 'junit.xml')) as junit_file:
+            junit = junit_file.read()
+        assert 'tests="2" failures="1"' in junit and 'message="AssertionError"' in junit
+
+    def test_trends_are_merged_once_per_run(self):
+        write_stream('first', 'gw0', [record('t.py::a', duration=2.0)])
+        write_stream('second', 'gw0', [record('t.py::a', 'failed', 4.0)])
+        report.merge('first', print_summary=False)
+        report.merge('second', print_summary=False)
+        assert report.update_trends('second') == {}
+        with open(results.results_path('trends.json')) as trends_file:
+            trend = json.load(trends_file)['tests']['t.py::a']
+        assert (trend['runs'], trend['passed'], trend['history']) == (2, 1, ['P', 'F'])
+        assert (trend['previous_duration'], trend['last_duration'], trend['total_duration']) == (2.0, 4.0, 6.0)
+
+    def test_run_without_streams_is_not_merged(self):
+        assert report.merge('missing', print_summary=False) is None
+        assert report.main(['--run', 'missing']) == 1
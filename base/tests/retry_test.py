@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+from selenium.common.exceptions import ElementClickInterceptedException, NoSuchElementException, \
+    StaleElementReferenceException
+
+from base.configurations.retry import RetryPolicy
+
+
+class TestRetryPolicy:
+
+    def test_only_transient_exceptions_are_retried(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.should_retry(ElementClickInterceptedException(), 0)
+        assert policy.should_retry(ElementClickInterceptedException(), 1)
+        assert not policy.should_retry(ElementClickInterceptedException(), 2)
+        assert not policy.should_retry(NoSuchElementException(), 0)
+
+    def test_stale_element_is_retried_only_if_it_can_be_found_again(self):
+        policy = RetryPolicy()
+        assert policy.should_retry(StaleElementReferenceException(), 0)
+        assert not policy.should_retry(StaleElementReferenceException(), 0, reresolvable=False)
+        assert policy.should_retry(ElementClickInterceptedException(), 0, reresolvable=False)
+
+    def test_backoff_is_doubled_and_capped(self):
+        policy = RetryPolicy(backoff=0.1, max_backoff=0.3)
+        assert [policy.delay(attempt) for attempt in range(4)] == [0.1, 0.2, 0.3, 0.3]
+
+    def test_retries_are_counted_per_locator(self):
+        policy = RetryPolicy()
+        policy.record('#save')
+        policy.record('#save')
+        policy.record('#cancel')
+        assert policy.retry_counts == {'#save': 2, '#cancel': 1}
@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+from base.configurations.exception import RouteNotFoundException
+from base.configurations.routes import ROUTE_TABLE, get_route, route
+
+
+@pytest.fixture(autouse=True)
+def route_table():
+    saved = dict(ROUTE_TABLE)
+    yield
+    ROUTE_TABLE.clear()
+    ROUTE_TABLE.update(saved)
+
+
+@route('hotel/{country}/{hotel_id}.html', sentinel=('CSS_SELECTOR', '#hotel'))
+class HotelPage:
+    pass
+
+
+class HotelGalleryPage(HotelPage):
+    pass
+
+
+class TestRoutes:
+
+    def test_route_is_inherited_from_registered_parent(self):
+        assert get_route(HotelGalleryPage) is get_route(HotelPage)
+        with pytest.raises(RouteNotFoundException):
+            get_route(object)
+
+    def test_url_is_built_relative_to_session_url(self):
+        url = get_route(HotelPage).build_url('https://www.booking.com/', country='ua', hotel_id='lviv')
+        assert url == 'https://www.booking.com/hotel/ua/lviv.html'
+        with pytest.raises(RouteNotFoundException):
+            get_route(HotelPage).build_url('https://www.booking.com/', country='ua')
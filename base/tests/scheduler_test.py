@@ -0,0 +1,96 @@
+import pytest
+
+from base.configurations import results
+from base.runner import scheduler
+from base.runner.scheduler import CollectionError, DurationHistory, Scheduler, collect_tests, plan
+
+
+@pytest.fixture(autouse=True)
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(results, 'RESULTS_DIR', str(tmp_path / 'results'))
+    return tmp_path
+
+
+def history(durations):
+    history = DurationHistory()
+    history.durations = dict(durations)
+    return history
+
+
+class TestDurationHistory:
+
+    def test_unknown_test_gets_median_duration(self):
+        assert history({'a': 1.0, 'b': 5.0, 'c': 9.0}).predict('new') == 5.0
+        assert history({}).predict('new') == scheduler.DEFAULT_DURATION
+
+    def test_update_is_smoothed_and_saved(self):
+        durations = history({'a': 10.0})
+        durations.update('a', 20.0)
+        durations.update('b', 3.0)
+        durations.save()
+        assert DurationHistory().durations == {'a': 15.0, 'b': 3.0}
+
+
+class TestPlan:
+
+    def test_longest_tests_first_to_least_loaded_worker(self):
+        workers = plan(['a', 'b', 'c', 'd', 'e'], history({'a': 10, 'b': 8, 'c': 6, 'd': 4, 'e': 1}), 2)
+        assert [list(worker.queue) for worker in workers] == [['a', 'd', 'e'], ['b', 'c']]
+        assert [worker.predicted_load for worker in workers] == [15, 14]
+
+    def test_worker_queues_are_longest_first(self):
+        durations = {'t{}'.format(number): number % 7 + 1.0 for number in range(20)}
+        for worker in plan(list(durations), history(durations), 3):
+            predicted = [durations[test] for test in worker.queue]
+            assert predicted == sorted(predicted, reverse=True)
+
+    def test_workers_are_balanced_within_the_longest_test(self):
+        durations = {'t{}'.format(number): float(number % 9 + 1) for number in range(40)}
+        workers = plan(list(durations), history(durations), 4)
+        loads = [worker.predicted_load for worker in workers]
+        assert sum(loads) == sum(durations.values())
+        assert max(loads) - min(loads) <= max(durations.values())
+        assert sorted(test for worker in workers for test in worker.queue) == sorted(durations)
+
+    def test_unknown_tests_are_planned_with_median_duration(self):
+        workers = plan(['known', 'new'], history({'known': 4.0, 'a': 2.0, 'b': 3.0}), 2)
+        assert [list(worker.queue) for worker in workers] == [['known'], ['new']]
+        assert [worker.predicted_load for worker in workers] == [4.0, 3.0]
+
+    def test_more_workers_than_tests(self):
+        workers = plan(['a'], history({'a': 1.0}), 3)
+        assert [len(worker.queue) for worker in workers] == [1, 0, 0]
+
+    def test_idle_worker_steals_shortest_test_of_most_loaded_worker(self):
+        run = Scheduler(['a', 'b', 'c', 'd'], 2, history=history({'a': 10, 'b': 9, 'c': 2, 'd': 1}))
+        first, second = run.workers
+        assert list(first.queue) == ['a', 'd'] and list(second.queue) == ['b', 'c']
+        second.queue.clear()
+        assert run.next_test(second) == 'd'
+        assert second.stolen == 1 and list(first.queue) == ['a']
+        assert run.next_test(first) == 'a'
+        assert run.next_test(first) is None and run.next_test(second) is None
+
+    def test_run_without_tests_fails(self):
+        assert Scheduler([], 2, history=history({})).run() == 1
+
+
+class TestCollectTests:
+
+    def test_collected_node_ids(self, tmp_path, monkeypatch):
+        (tmp_path / 'test_ok.py').write_text('def test_a():\n    pass\n')
+        monkeypatch.chdir(tmp_path)
+        assert collect_tests(['test_ok.py', '-p', 'no:cacheprovider']) == ['test_ok.py::test_a']
+
+    def test_module_with_syntax_error_fails_collection(self, tmp_path, monkeypatch):
+        (tmp_path / 'test_ok.py').write_text('def test_a():\n    pass\n')
+        (tmp_path / 'test_broken.py').write_text('def test_b(:\n')
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(CollectionError, match='failed'):
+            collect_tests(['.', '-p', 'no:cacheprovider'])
+
+    def test_no_tests_fails_collection(self, tmp_path, monkeypatch):
+        (tmp_path / 'test_ok.py').write_text('def test_a():\n    pass\n')
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(CollectionError, match='found no tests'):
+            collect_tests(['test_ok.py', '-k', 'nothing', '-p', 'no:cacheprovider'])
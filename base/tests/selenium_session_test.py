@@ -0,0 +1,95 @@
+import logging
+
+import pytest
+
+pytest.importorskip('selenium')
+
+from base.configurations.base_page import BasePage
+from base.configurations.context import LocatorContext
+from base.configurations.interstitials import InterstitialWatchdog
+from base.configurations.retry import RetryPolicy
+from base.session.selenium_session import SeleniumSession
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FakeDriver:
+
+    def __init__(self, url='about:blank', cookies=()):
+        self.current_url = url
+        self.cookies = list(cookies)
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def implicitly_wait(self, timeout):
+        pass
+
+
+class FakeDriverManager:
+    """Driver, whose memory governor flagged it for recycling."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.needs_recycle = True
+        self.recycled = 0
+        self.governor = None
+
+    def recycle(self):
+        self.recycled += 1
+        self.needs_recycle = False
+        self.driver = FakeDriver()
+
+    def start_network_capture(self):
+        return None
+
+
+def session(driver):
+    session = SeleniumSession.__new__(SeleniumSession)
+    session.logger = LOGGER
+    session.driver_manager = FakeDriverManager(driver)
+    session.driver = driver
+    session.network_capture = None
+    session.retry_policy = RetryPolicy()
+    session.step_timings = []
+    session.locator_context = LocatorContext(session)
+    session.interstitials = InterstitialWatchdog(session)
+    return session
+
+
+class TestSafePoint:
+
+    def test_flagged_driver_is_recycled_once(self):
+        old_driver = FakeDriver()
+        test_session = session(old_driver)
+        assert test_session.safe_point()
+        assert test_session.driver is test_session.driver_manager.driver is not old_driver
+        assert not test_session.safe_point()
+        assert test_session.driver_manager.recycled == 1
+
+    def test_page_object_is_safe_point_and_keeps_opened_page(self):
+        cookie = {'name': 'auth', 'value': 'token', 'expiry': 1.5, 'sameSite': 'Lax'}
+        test_session = session(FakeDriver('https://www.booking.com/mysettings.html', [cookie]))
+        page = BasePage(test_session)
+        assert test_session.driver_manager.recycled == 1
+        assert page.driver is test_session.driver
+        assert page.driver.visited == ['https://www.booking.com/', 'https://www.booking.com/mysettings.html']
+        assert page.driver.cookies == [{'name': 'auth', 'value': 'token', 'expiry': 1}]
+
+
+class TestMemoryGovernor:
+
+    def test_explicit_zero_is_not_replaced_by_config(self):
+        pytest.importorskip('psutil')
+        from base.driver.memory_governor import MemoryGovernor
+
+        governor = MemoryGovernor(None, LOGGER, threshold_mb=0, sample_interval=0)
+        assert (governor.threshold_mb, governor.sample_interval) == (0, 0)
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+from base.configurations.exception import ReplayMismatchException
+from base.driver.transport import NEW_SESSION, RecordingConnection, ReplayConnection, recording_path
+
+
+class FakeConnection:
+    """Remote connection of a browser, that answers with number of executed command."""
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, command, params):
+        self.executed.append(command)
+        return {'status': 0, 'value': len(self.executed)}
+
+
+class FakeDriver:
+    session_id = 'session-1'
+    capabilities = {'browserName': 'chrome'}
+    w3c = True
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = recording_path(str(tmp_path / 'recordings'), 'test_login')
+    connection = RecordingConnection(FakeConnection(), path, FakeDriver())
+    connection.execute('get', {'url': 'http://site/'})
+    connection.execute('findElement', {'using': 'css selector', 'value': '#login'})
+    connection.execute('quit', {})
+    return path
+
+
+class TestRecordingPath:
+
+    def test_recycled_browser_gets_next_segment(self):
+        assert recording_path('recordings', 'test_login').endswith('test_login.jsonl.gz')
+        assert recording_path('recordings', 'test_login', 2).endswith('test_login.2.jsonl.gz')
+
+
+class TestReplayConnection:
+
+    def test_recorded_session_round_trips(self, recording):
+        replay = ReplayConnection(recording)
+        assert replay.execute(NEW_SESSION, {})['value'] == {'sessionId': 'session-1',
+                                                            'capabilities': {'browserName': 'chrome'}}
+        assert replay.execute('get', {'url': 'http://site/'}) == {'status': 0, 'value': 1}
+        assert replay.execute('findElement', {'value': '#login', 'using': 'css selector'})['value'] == 2
+        assert replay.at_quit
+        assert replay.execute('quit', {})['value'] == 3
+        assert not replay.records and replay.executed == 3
+
+    def test_command_different_from_recording_raises(self, recording):
+        replay = ReplayConnection(recording)
+        replay.execute('get', {'url': 'http://site/'})
+        with pytest.raises(ReplayMismatchException, match=r'command #2 differs from recording') as error:
+            replay.execute('findElement', {'using': 'css selector', 'value': '#logout'})
+        assert '-    "value": "#login"' in str(error.value) and '+    "value": "#logout"' in str(error.value)
+
+    def test_command_after_recording_end_raises(self, recording):
+        replay = ReplayConnection(recording)
+        for command, params in (('get', {'url': 'http://site/'}),
+                                ('findElement', {'using': 'css selector', 'value': '#login'}), ('quit', {})):
+            replay.execute(command, params)
+        with pytest.raises(ReplayMismatchException, match='was not recorded'):
+            replay.execute('getTitle', {})
@@ -1,7 +1,7 @@
-import time
 from base.configurations.base_page import BasePage
 from base.configurations.element import Element
 from base.configurations.exception import FlowFailedException
+from base.configurations.interactions import DROPDOWN_LOAD_TIMEOUT
 
 
 class Calendar(BasePage):
@@ -15,17 +15,26 @@ class Calendar(BasePage):
 
     def click_next_month(self):
         """click next month button"""
-        self.action.click(self.calendar_next)
-        time.sleep(3)
+        with self.waits.wait_for_triggered_requests(timeout=DROPDOWN_LOAD_TIMEOUT, raise_exception=False):
+            self.action.click(self.calendar_next)
 
     def click_previous_month(self):
-        """click next month button"""
-        self.action.click(self.calendar_previous)
-        time.sleep(3)
+        """click previous month button"""
+        with self.waits.wait_for_triggered_requests(timeout=DROPDOWN_LOAD_TIMEOUT, raise_exception=False):
+            self.action.click(self.calendar_previous)
 
     def select_date(self, year, month, day):
         self.select_date_from_calendar(year, month, day)
 
+    def get_active_dates(self):
+        """Return dates of visible months as list of dicts: {'date': '2020-07-01', 'day': '1', 'class': '...'}"""
+        return self.action.extract(self.calendar_active_date,
+                                   {'date': (None, 'data-date'), 'day': None, 'class': (None, 'class')})
+
+    def get_available_dates(self):
+        """Return list of dates (e.g. '2020-07-01'), that can be selected in calendar."""
+        return [date['date'] for date in self.get_active_dates() if 'disabled' not in (date['class'] or '')]
+
 
     # utils________________________________________________________
 
@@ -0,0 +1,52 @@
+// Behaviour of booking.com fixture pages: two-step sign-in, welcome modal and account menu.
+// Login state is kept in localStorage, so it survives navigation between fixture pages.
+
+function range(from, to) {
+    var values = [];
+    for (var value = from; value <= to; value++) { values.push(value); }
+    return values;
+}
+
+function fillOptions(id, texts) {
+    var select = document.getElementById(id);
+    texts.forEach(function (text, index) { select.add(new Option(text, String(index + 1))); });
+}
+
+function showEmailStep() {
+    document.getElementById('sign-in').innerHTML =
+        '<div class="transition"><input id="username" type="email">' +
+        '<button type="submit" onclick="showPasswordStep()">Continue with email</button></div>';
+}
+
+function showPasswordStep() {
+    // password step replaces email step, so it has the only submit button on the page
+    document.getElementById('sign-in').innerHTML =
+        '<div class="transition"><input id="password" type="password">' +
+        '<button type="submit" onclick="signIn()">Sign in</button></div>';
+}
+
+function signIn() {
+    localStorage.setItem('fixture-user', 'signed-in');
+    document.getElementById('sign-in').innerHTML = '';
+    renderAccount();
+    showWelcomeModal();
+}
+
+function showWelcomeModal() {
+    var modal = document.createElement('div');
+    modal.className = 'modal-mask';
+    modal.innerHTML = '<div class="modal-mask-content">Welcome! <button class="modal-mask-closeBtn">Close</button></div>';
+    modal.querySelector('button').addEventListener('click', function () { modal.remove(); });
+    document.body.appendChild(modal);
+}
+
+function renderAccount() {
+    if (!localStorage.getItem('fixture-user')) { return; }
+    var register = document.querySelector('.account_register_option');
+    if (register) { register.remove(); }
+    document.getElementById('current_account').innerHTML =
+        '<span id="profile-menu-trigger--content">My account</span>' +
+        '<div id="profile-menu"><a href="myaccount.html">Dashboard</a> <a href="mysettings.html">Settings</a></div>';
+}
+
+renderAccount();
@@ -0,0 +1,6 @@
+"""Interstitials of booking, that are dismissed by watchdog of session (see base.configurations.interstitials)."""
+from base.configurations.interstitials import interstitial
+
+interstitial('welcome modal', ("CSS_SELECTOR", ".modal-mask-closeBtn"))
+interstitial('cookie consent', ("CSS_SELECTOR", "#onetrust-accept-btn-handler"))
+interstitial('sign-in prompt', ("CSS_SELECTOR", 'button[aria-label="Dismiss sign-in info."]'))
@@ -0,0 +1,33 @@
+"""Booking user journeys for load mode (see base.runner.load).
+
+    python -m base.runner.load projects.booking.load_flows:edit_personal_info --users 5 --ramp-up 10 --duration 60
+"""
+from projects.booking.pages.login_page import LoginPage
+from projects.booking.pages.setting_page import SettingPage
+
+
+def login(session, step):
+    """open login page -> sign in with email and password -> close welcome pop up"""
+    page = LoginPage(session)
+    with step('open login page'):
+        page.navigate_to_login_page()
+    with step('enter email'):
+        page.click_enter_in_account()
+        page.fill_in_email(page.email_for_login)
+        page.click_next_button()
+    with step('submit password'):
+        page.fill_in_password(page.password_for_login)
+        page.submit_login()
+    with step('close welcome pop up'):
+        page.handle_welcome_pop_up()
+        page.navigate_to_home_page_from_content()
+
+
+def edit_personal_info(session, step):
+    """login -> open settings page -> edit personal info"""
+    login(session, step)
+    page = SettingPage(session, make_login=False, navigate=False)
+    with step('open settings'):
+        page.navigate_to_settings()
+    with step('edit personal info'):
+        page.edit_personal_info("Load User", "3", "April", "2000")
@@ -0,0 +1 @@
+from projects.booking import interstitials  # registers interstitials of booking pages
@@ -0,0 +1,33 @@
+from base.configurations.base_page import BasePage
+from base.configurations.element import Element
+from base.configurations.routes import route
+
+
+@route("", sentinel=("CSS_SELECTOR", "#bodyconstraint-inner"))
+class HomePage(BasePage):
+    """Describes Home page. Content is server-rendered, so page can be checked without browser."""
+
+    browserless = True
+
+    def __init__(self, session, navigate=True):
+        super().__init__(session)
+        if navigate:
+            self.goto(HomePage)
+
+    # page utils________________________________________________________
+
+    def get_title(self):
+        return self.action.get_title()
+
+    def get_description(self):
+        return self.action.get_meta_content('description')
+
+    def is_sign_in_link_present(self):
+        return self.action.is_elements_present(self.sign_in_link)
+
+    # page locators________________________________________________________
+
+    @property
+    def main_form_container(self): return Element(self.session, ("CSS_SELECTOR", "#bodyconstraint-inner"))
+    @property
+    def sign_in_link(self): return Element(self.session, ("XPATH", "//a[contains(@href, 'sign-in') or contains(@href, 'login')]"))
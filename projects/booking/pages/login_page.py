@@ -21,14 +21,20 @@ class LoginPage(BasePage):
         self.driver.get(self.session.url)
         if not self.action.is_elements_present(self.main_form_container, timeout=login_page_init_time):
             raise LoginPageNotLoadedException('Login page was not loaded. Waited for {} seconds '.format(login_page_init_time))
+        self.collect_performance('LoginPage', self.session.url)
 
     def click_enter_in_account(self):
         self.waits.wait_for_web_element_visible(self.enter_in_account_btn)
         self.action.click(self.enter_in_account_btn)
 
+    def fill_login_form(self, email, password):
+        """fill in email and password of login form with one script call"""
+        self.waits.wait_for_web_element_visible(self.email_input)
+        self.action.fill_form({self.email_input: email, self.password_input: password})
+
     def fill_in_email(self, text_to_send):
         self.waits.wait_for_web_element_visible(self.email_input)
-        self.action.send_keys(self.email_input, text_to_send)
+        self.action.fill_form({self.email_input: text_to_send})
 
     def click_next_button(self):
         self.waits.wait_for_web_element_visible(self.next_button)
@@ -36,7 +42,7 @@ class LoginPage(BasePage):
 
     def fill_in_password(self, text_to_send):
         self.waits.wait_for_web_element_visible(self.password_input)
-        self.action.send_keys(self.password_input, text_to_send)
+        self.action.fill_form({self.password_input: text_to_send})
 
     def submit_login(self, wait_for_home_page=True, wait_time=60):
         self.waits.wait_for_web_element_visible(self.submit_login_button)
@@ -48,18 +54,27 @@ class LoginPage(BasePage):
 
     # page utils________________________________________________________
 
-    def handle_welcome_pop_up(self):
-        """ close "Добро пожаловать... как вас зовут ..." """
-        if self.action.is_element_displayed(self.close_welcome_modal_button):
+    def handle_welcome_pop_up(self, appear_timeout=5):
+        """ close "Добро пожаловать... как вас зовут ..." (registered interstitial: in chrome it is usually
+        dismissed by watchdog the moment it appears; modal, that appears late or in browser without
+        observer (firefox, record/replay), is waited for and closed here) """
+        interstitials = getattr(self.session, 'interstitials', None)
+        if interstitials:
+            interstitials.check(force=True)
+        if self.action.is_element_displayed(self.close_welcome_modal_button, timeout=appear_timeout):
             self.action.click(self.close_welcome_modal_button)
             self.waits.wait_for_web_element_not_visible(self.close_welcome_modal_button)
 
     def login_to_booking(self):
         self.navigate_to_login_page()
         self.click_enter_in_account()
-        self.fill_in_email(self.email_for_login)
-        self.click_next_button()
-        self.fill_in_password(self.password_for_login)
+        if self.action.is_elements_present(self.password_input, timeout=0):
+            # single-step login form: email and password are on the page together
+            self.fill_login_form(self.email_for_login, self.password_for_login)
+        else:
+            self.fill_in_email(self.email_for_login)
+            self.click_next_button()
+            self.fill_in_password(self.password_for_login)
         self.submit_login()
         self.handle_welcome_pop_up()
         self.navigate_to_home_page_from_content()
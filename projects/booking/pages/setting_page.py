@@ -3,10 +3,13 @@ from base.configurations.base_page import BasePage
 from base.configurations.element import Element
 from base.configurations.exception import LoginPageNotLoadedException, \
     HomePageNotLoadedException
+from base.configurations.routes import route
+from base.configurations.flow import CheckpointedFlow
 from projects.booking.pages.login_page import LoginPage
 
 
 
+@route("mysettings.html", sentinel=("CSS_SELECTOR", "input#nickname"))
 class SettingPage(LoginPage):
     """Describes Settings Page Element. And common methods for all page objects"""
     def __init__(self, session, make_login=True, navigate=True):
@@ -14,36 +17,42 @@ class SettingPage(LoginPage):
         if navigate:
             self.navigate_to_login_page()
 
-    def navigate_to_login_page(self, login_page_init_time=60):
-        self.logger.info('navigating to login page by address: {}'.format(self.session.url))
-        self.driver.get(self.session.url)
-        if not self.action.is_elements_present(self.main_form_container, timeout=login_page_init_time):
-            raise LoginPageNotLoadedException(
-                'Login page was not loaded. Waited for {} seconds '.format(login_page_init_time))
-
     def navigate_to_settings(self):
-        #open settings page
-        self.logger.info('navigating to settings page by selector: {}'.format(self.navigate_to_account_menu()))
+        #open settings page by direct link
+        self.goto(SettingPage)
+
+    def navigate_to_settings_from_menu(self):
+        #open settings page through account menu (use only in tests of the menu itself)
+        self.logger.info('navigating to settings page by selector: {}'.format(self.navigate_to_settings_page.locator))
         self.action.click(self.navigate_to_account_menu)
         self.action.click(self.navigate_to_settings_page)
 
+    def open_settings(self):
+        """login (if session is not logged in yet) -> open settings page"""
+        self.navigate_to_login_page()
+        if not self.action.is_elements_present(self.my_profile_button, timeout=5):
+            self.login_to_booking()
+        self.navigate_to_settings()
+
     def edit_personal_info(self, nickname="", bday="", bmonth="", byear="", country=""):
-        self.logger.info('edit nickname input by selector: {}'.format(self.nickname_input))
+        self.logger.info('edit personal info, nickname input by selector: {}'.format(self.nickname_input))
         self.waits.wait_for_web_element_visible(self.nickname_input)
-        self.action.send_keys(self.nickname_input, text_to_send=nickname)
+        fields = {self.nickname_input: nickname, self.bday_drop_down: bday}
+        # birth month, year and country are changed only if they are given
+        for drop_down, text_to_select in ((self.bmonth_drop_down, bmonth), (self.byear_drop_down, byear),
+                                          (self.country_drop_down, country)):
+            if text_to_select:
+                fields[drop_down] = text_to_select
+        self.action.fill_form(fields)
 
-        self.action.select_from_drop_down_by_text(
-            list_of_options_from_dropdown=self.bday_drop_down,
-        text_to_select=bday)
-        # self.action.select_from_drop_down_by_text(
-        #     list_of_options_from_dropdown=self.bmonth_drop_down,
-        # text_to_select=bmonth)
-        # self.action.select_from_drop_down_by_text(
-        #     list_of_options_from_dropdown=self.byear_drop_down,
-        # text_to_select=byear)
-        # self.action.select_from_drop_down_by_text(
-        #     list_of_options_from_dropdown=self.country_drop_down,
-        # text_to_select=country)
+    def edit_personal_info_flow(self, nickname="", bday="", bmonth="", byear="", country=""):
+        """login -> navigate to settings -> edit personal info. On failure of the last steps
+        flow is resumed from the last checkpoint (logged in / settings page opened)."""
+        CheckpointedFlow(self.session, 'edit_personal_info') \
+            .step('login', self.login_to_booking, checkpoint=True) \
+            .step('navigate to settings', self.navigate_to_settings, checkpoint=True) \
+            .step('edit personal info', lambda: self.edit_personal_info(nickname, bday, bmonth, byear, country)) \
+            .run()
 
 
 
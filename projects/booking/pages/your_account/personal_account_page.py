@@ -1,9 +1,11 @@
 from base.configurations.element import Element
 from base.configurations.exception import LoginPageNotLoadedException
+from base.configurations.routes import route
 from projects.booking.pages.login_page import LoginPage
 from projects.booking.components.calendar import Calendar
 
 
+@route("myaccount.html", sentinel=("CSS_SELECTOR", ".profile-area__content-container"), timeout=20)
 class PersonalAccountPage(LoginPage):
     """Describes Home page ->  Personal account page."""
     def __init__(self, session, make_login=True, navigate=True):
@@ -21,6 +23,10 @@ class PersonalAccountPage(LoginPage):
     # page utils________________________________________________________
     def navigate_to_personal_accounts_page(self):
         self.logger.info("navigating to Personal accounts page")
+        self.goto(PersonalAccountPage)
+
+    def navigate_to_personal_accounts_page_from_menu(self):
+        self.logger.info("navigating to Personal accounts page through profile menu")
         self.navigate_to_home_page_from_content()
         self.waits.wait_for_web_element_visible(self.open_user_account_button)
         self.action.click(self.open_user_account_button)
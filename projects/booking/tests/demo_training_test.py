@@ -1,11 +1,20 @@
+import os
+
+import pytest
+
 from base.configurations.base_test import BaseTest
+from base.configurations.dataset import Dataset, DatasetRun
 from projects.booking.pages.your_account.personal_account_page import PersonalAccountPage
 from projects.booking.pages.setting_page import SettingPage
+from projects.booking.pages.home_page import HomePage
 from base.configurations.interactions import Interactions as actions
 from base.configurations.element import Element
 
 # should launch with pytest
 
+PERSONAL_INFO_DATASET = os.path.join(os.path.dirname(__file__), '..', 'data', 'personal_info.csv')
+DATASET_SHARDS = int(os.environ.get('DATASET_SHARDS', 2))
+
 class TestDemo(BaseTest):
 
     # def test_login_page(self):
@@ -27,4 +36,26 @@ class TestDemo(BaseTest):
         setting.navigate_to_settings()
         setting.edit_personal_info("DeFault Name", "3", "April", "2000", "USA")
 
+    def test_setting_page_checkpointed_flow(self):
+        self.init_session()
+        setting = SettingPage(session=self.session, make_login=False, navigate=False)
+        setting.edit_personal_info_flow("DeFault Name", "3", "April", "2000", "USA")
+        self.cleanup_session()
+
+    def test_home_page_static_content(self):
+        self.init_http_session()
+        home = HomePage(session=self.session)
+        assert 'booking.com' in home.get_title().lower()
+        assert home.is_sign_in_link_present()
+        self.cleanup_session()
+
+    @pytest.mark.parametrize('shard', range(DATASET_SHARDS))
+    def test_setting_page_dataset(self, shard):
+        self.init_session()
+        setting = SettingPage(session=self.session, make_login=False, navigate=False)
+        summary = DatasetRun(self.session, Dataset(PERSONAL_INFO_DATASET, shard=shard, shards=DATASET_SHARDS),
+                             'personal_info', setup=setting.open_settings) \
+            .run(lambda row: setting.edit_personal_info(**row))
+        self.cleanup_session()
+        assert not summary['failed'], summary['failures']
 